@@ -1,54 +1,328 @@
 # backend/agents/__init__.py
 
 import asyncio
-from agents import Runner
+import contextlib
+import contextvars
+import os
+import queue
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from agents import AgentUpdatedStreamEvent, RawResponsesStreamEvent, RunItemStreamEvent, Runner
+from openai.types.responses import ResponseTextDeltaEvent
 from .triage_agent import triage_agent
-from .tools import set_tool_context
+from .lms_agent import lms_agent
+from .predictive_agent import predictive_agent
+from .planner_agent import planner_agent
+from .tools import set_tool_context, reset_tool_context
+from .llm import get_run_config
+from . import fast_path, intent_router
+from .conversation import get_conversation_store
+from .response_cache import get_response_cache, load_data_version
+from .semantic_cache import get_semantic_cache
+from backend.database.async_db import run_read
+
+# Set LMS_FAST_PATH=0 to send plain lookups through the agents too
+USE_FAST_PATH = os.environ.get("LMS_FAST_PATH", "1") != "0"
+# Set LMS_INTENT_ROUTER=0 to always start at the triage agent
+USE_INTENT_ROUTER = os.environ.get("LMS_INTENT_ROUTER", "1") != "0"
+
+ERROR_MESSAGE = "⚠️ Something went wrong while processing your request."
+
+_SPECIALISTS = {
+    intent_router.LMS: lms_agent,
+    intent_router.PREDICTION: predictive_agent,
+    intent_router.PLANNER: planner_agent,
+}
+
+if USE_INTENT_ROUTER:
+    # Import scikit-learn and train in the background, not on the first query
+    threading.Thread(target=intent_router.warm_up, daemon=True).start()
+
+def select_agent(user_query: str, history: Optional[List[Dict[str, str]]] = None):
+    """Specialist for clear first turns (skips the triage LLM hop), else triage.
+
+    The router only sees the new message, so a follow-up like "and for
+    calculus?" would be routed on its own words; with history the triage
+    agent reads the whole conversation instead.
+    """
+    if USE_INTENT_ROUTER and not history:
+        decision = intent_router.route(user_query)
+        if decision is not None:
+            return _SPECIALISTS[decision.agent]
+    return triage_agent
+
+
+async def _answer_without_llm(
+    user_query: str,
+    student_id: int,
+    db_path: Optional[str],
+    use_cache: bool = True
+) -> Tuple[Optional[str], Optional[int], Optional[tuple]]:
+    """(answer, data version, cache key); answer is None when the agents are needed"""
+    # Plain lookups ("quiz 1 in calculus") are answered from templates
+    if USE_FAST_PATH:
+        direct = await fast_path.answer(user_query, student_id, db_path)
+        if direct is not None:
+            return direct, None, None
+    if not use_cache:
+        return None, None, None
+
+    # Same student, same question, same grades → same answer
+    cache = get_response_cache()
+    semantic = get_semantic_cache()
+    cache_key = None
+    version = None
+    if cache.enabled or semantic.enabled:
+        version = await run_read(load_data_version, student_id, db_path=db_path)
+    if version is not None and cache.enabled:
+        cache_key = cache.key(db_path, student_id, user_query, version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, version, cache_key
+    if version is not None and semantic.enabled:
+        # Paraphrase of an earlier question (classifier work, so off the loop)
+        similar = await asyncio.to_thread(semantic.lookup, db_path, student_id, version, user_query)
+        if similar is not None:
+            if cache_key is not None:
+                cache.put(cache_key, similar["answer"])
+            return similar["answer"], version, cache_key
+    return None, version, cache_key
+
+
+async def _remember(
+    user_query: str,
+    student_id: int,
+    db_path: Optional[str],
+    version: Optional[int],
+    cache_key: Optional[tuple],
+    output: str
+):
+    if not output:
+        return
+    if cache_key is not None:
+        get_response_cache().put(cache_key, output)
+    semantic = get_semantic_cache()
+    if version is not None and semantic.enabled:
+        await asyncio.to_thread(semantic.add, db_path, student_id, version, user_query, output)
+
+
+def _agent_input(user_query: str, history: List[Dict[str, str]]):
+    """Plain string for a first turn, else earlier turns plus the new question"""
+    if not history:
+        return user_query
+    return [*history, {"role": "user", "content": user_query}]
 
 
 async def run_agent_query(
     user_query: str,
     student_id: int,
-    db_connection
+    db_path: Optional[str] = None,
+    session_id: Optional[str] = None
 ) -> str:
+    """Answer one question; pass session_id to keep conversation memory across turns"""
+    # Context is per task, so concurrent queries don't see each other's student
+    token = set_tool_context(student_id, db_path)
+    conversation = get_conversation_store()
     try:
-        # Set global context for tools
-        set_tool_context(student_id, db_connection)
+        # Follow-ups depend on earlier turns, so only first turns use the answer caches
+        history = conversation.history(student_id, session_id)
+        answer, version, cache_key = await _answer_without_llm(
+            user_query, student_id, db_path, use_cache=not history
+        )
+        if answer is not None:
+            conversation.record(student_id, session_id, user_query, answer)
+            return answer
+
+        # Routing may run the classifier; keep it off the event loop
+        agent = await asyncio.to_thread(select_agent, user_query, history)
 
         # Run agent (NO tools argument)
         result = await Runner.run(
-            triage_agent,
-            user_query
+            agent,
+            _agent_input(user_query, history),
+            run_config=get_run_config()
         )
 
-        return (
+        output = (
             result.final_output
             if hasattr(result, "final_output")
             else str(result)
         )
+        await _remember(user_query, student_id, db_path, version, cache_key, output)
+        conversation.record(student_id, session_id, user_query, output)
+        return output
 
     except Exception as e:
         import traceback
         print("❌ AGENT ERROR:", str(e))
         print(traceback.format_exc())
-        return "⚠️ Something went wrong while processing your request."
+        return ERROR_MESSAGE
 
+    finally:
+        reset_tool_context(token)
 
-def run_agent_query_sync(
+
+def _stream_event(event) -> Optional[Dict[str, Any]]:
+    """UI event for an SDK stream event, None for the ones the UIs ignore"""
+    if isinstance(event, RawResponsesStreamEvent):
+        if isinstance(event.data, ResponseTextDeltaEvent) and event.data.delta:
+            return {"type": "text", "delta": event.data.delta}
+    elif isinstance(event, AgentUpdatedStreamEvent):
+        return {"type": "agent", "name": event.new_agent.name}
+    elif isinstance(event, RunItemStreamEvent):
+        if event.name == "tool_called":
+            return {"type": "tool_call", "name": getattr(event.item.raw_item, "name", "tool")}
+        if event.name == "tool_output":
+            return {"type": "tool_output"}
+    return None
+
+
+async def _stream_turn(
     user_query: str,
     student_id: int,
-    db_connection
-) -> str:
+    db_path: Optional[str],
+    session_id: Optional[str],
+    emit
+):
+    """Body of stream_agent_query; runs in its own task and context"""
+    # Set before run_streamed so the SDK's background task inherits it
+    token = set_tool_context(student_id, db_path)
+    conversation = get_conversation_store()
+    result = None
+    output = ""
     try:
-        return asyncio.run(
-            run_agent_query(user_query, student_id, db_connection)
+        history = conversation.history(student_id, session_id)
+        answer, version, cache_key = await _answer_without_llm(
+            user_query, student_id, db_path, use_cache=not history
         )
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        if answer is not None:
+            output = answer
+            conversation.record(student_id, session_id, user_query, answer)
+            emit({"type": "text", "delta": answer})
+        else:
+            agent = await asyncio.to_thread(select_agent, user_query, history)
+            result = Runner.run_streamed(agent, _agent_input(user_query, history), run_config=get_run_config())
+            async for event in result.stream_events():
+                ui_event = _stream_event(event)
+                if ui_event is None:
+                    continue
+                if ui_event["type"] == "text":
+                    output += ui_event["delta"]
+                emit(ui_event)
+            output = str(result.final_output) if result.final_output is not None else output
+            await _remember(user_query, student_id, db_path, version, cache_key, output)
+            conversation.record(student_id, session_id, user_query, output)
+
+    except Exception as e:
+        import traceback
+        print("❌ AGENT ERROR:", str(e))
+        print(traceback.format_exc())
+        error = ERROR_MESSAGE if not output else "\n\n" + ERROR_MESSAGE
+        output += error
+        emit({"type": "text", "delta": error})
+
+    finally:
+        if result is not None and not result.is_complete:
+            result.cancel()  # consumer stopped early
+        reset_tool_context(token)
+
+    emit({"type": "done", "output": output})
+
+
+async def stream_agent_query(
+    user_query: str,
+    student_id: int,
+    db_path: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Streaming run_agent_query.
+
+    Yields {"type": "text", "delta"} as tokens arrive, progress events
+    {"type": "agent", "name"}, {"type": "tool_call", "name"} and
+    {"type": "tool_output"}, and finally {"type": "done", "output"}.
+    Fast-path and cached answers arrive as a single text event.
+    session_id works as in run_agent_query.
+
+    The turn runs in its own task with a copied context, so the tool
+    context never leaks into the caller between yields, and a generator
+    finalized without aclose() (from another context) only has to
+    cancel that task.
+    """
+    events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+    async def produce():
+        try:
+            await _stream_turn(user_query, student_id, db_path, session_id, events.put_nowait)
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.create_task(produce(), context=contextvars.copy_context())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+    finally:
+        task.cancel()
+
+
+def response_cache_stats() -> dict:
+    """Hit/miss counters of the exact and semantic response caches"""
+    return {**get_response_cache().stats(), "semantic": get_semantic_cache().stats()}
+
+
+# One long-lived loop for every sync caller
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop on a daemon thread shared by every sync caller.
+
+    A fresh loop per call would get a fresh pooled LLM client each time
+    (pooled connections cannot cross loops), so keep-alive would never
+    be reused and every client would leak its sockets until GC.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="lms-agent-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_agent_query_sync(
+    user_query: str,
+    student_id: int,
+    db_path: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> str:
+    """Blocking run_agent_query on the shared background loop"""
+    future = asyncio.run_coroutine_threadsafe(
+        run_agent_query(user_query, student_id, db_path, session_id), _background_loop()
+    )
+    return future.result()
+
+
+def stream_agent_query_sync(
+    user_query: str,
+    student_id: int,
+    db_path: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Blocking iterator over stream_agent_query events (for Streamlit)"""
+    events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+    async def pump():
         try:
-            return loop.run_until_complete(
-                run_agent_query(user_query, student_id, db_connection)
-            )
+            async with contextlib.aclosing(stream_agent_query(user_query, student_id, db_path, session_id)) as stream:
+                async for event in stream:
+                    events.put(event)
         finally:
-            loop.close()
+            events.put(None)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while (event := events.get()) is not None:
+            yield event
+    finally:
+        # Consumer stopped early: cancelling closes the stream and the model call
+        future.cancel()
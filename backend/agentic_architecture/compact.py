@@ -0,0 +1,95 @@
+# backend/agentic_architecture/compact.py
+
+"""Compact tool outputs for the model.
+
+The get_course_data payload repeats "marks_obtained"/"max_marks"/
+"percentage" for every item, carries unrounded marks, fixed maxima
+(quiz 10, assignment 20, midterm 20, current 50) and percentages the
+model can derive. Everything is serialized into the prompt on every
+tool call. The compact shapes below keep the same facts with short
+stable keys and columnar rows. The fixed maxima are described once, in
+the tool descriptions (COURSE_DATA_SCHEMA / ALL_COURSES_SCHEMA).
+
+Only what goes to the model changes; the fast path keeps using the
+full payloads. Set LMS_COMPACT_TOOLS=0 to send full payloads instead.
+"""
+
+from typing import Any, Dict, List, Optional
+
+COURSE_DATA_SCHEMA = (
+    "Compact output: q/a = quizzes/assignments as {max: marks per item, marks: [...]} "
+    "(names: [...] only when items are not numbered 1..n; max: [...] when it varies); "
+    "att = [classes attended, total classes]; tot = totals {q out of 10, a out of 20, "
+    "m (midterm) out of 20, cur out of 50}. Percentage = marks / max * 100."
+)
+
+ALL_COURSES_SCHEMA = (
+    "Compact output: one row per course under rows, columns named in cols. "
+    "q/a/m/cur = quiz, assignment, midterm and current totals out of 10/20/20/50; "
+    "att/att_of = classes attended/total; q_avg/a_avg = average item percentage, "
+    "q_cons/a_cons = consistency (0-100), wavg = weighted average %. null = not recorded."
+)
+
+ALL_COURSES_COLUMNS = [
+    "course", "q", "a", "m", "cur", "att", "att_of",
+    "q_avg", "q_cons", "a_avg", "a_cons", "wavg",
+]
+
+def _num(value: Optional[float]) -> Optional[float]:
+    """Round to 2 decimals; whole numbers as int (2.0 → 2)"""
+    if value is None:
+        return None
+    value = round(float(value), 2)
+    return int(value) if value.is_integer() else value
+
+def _items(items: List[Dict[str, Any]], label: str) -> Dict[str, Any]:
+    encoded = {}
+    maxima = [_num(item["max_marks"]) for item in items]
+    encoded["max"] = maxima[0] if len(set(maxima)) == 1 else maxima
+    encoded["marks"] = [_num(item["marks_obtained"]) for item in items]
+    names = [item["name"] for item in items]
+    if names != [f"{label} {i}" for i in range(1, len(items) + 1)]:
+        encoded["names"] = names
+    return encoded
+
+def compact_course_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """get_course_data payload in the COURSE_DATA_SCHEMA shape (errors unchanged)"""
+    if "error" in data:
+        return data
+    totals = data["totals"]
+    encoded = {"course": data["course_name"]}
+    if data["quizzes"]:
+        encoded["q"] = _items(data["quizzes"], "Quiz")
+    if data["assignments"]:
+        encoded["a"] = _items(data["assignments"], "Assignment")
+    if data["attendance"]:
+        encoded["att"] = [data["attendance"]["classes_attended"], data["attendance"]["total_classes"]]
+    tot = {"q": _num(totals["quiz_total"]), "a": _num(totals["assignment_total"])}
+    if "midterm_total" in totals:
+        tot["m"] = _num(totals["midterm_total"])
+    tot["cur"] = _num(totals["current_total"])
+    encoded["tot"] = tot
+    return encoded
+
+def compact_all_courses(data: Dict[str, Any]) -> Dict[str, Any]:
+    """get_all_courses_data payload as an ALL_COURSES_SCHEMA table"""
+    if "error" in data:
+        return data
+    rows = []
+    for course in data["courses"]:
+        totals, performance = course["totals"], course["performance"]
+        rows.append([
+            course["course_name"],
+            _num(totals["quiz_total"]),
+            _num(totals["assignment_total"]),
+            _num(totals.get("midterm_total")),
+            _num(totals["current_total"]),
+            performance.get("attendance_attended"),
+            performance.get("attendance_total"),
+            _num(performance.get("quiz_average")),
+            _num(performance.get("quiz_consistency")),
+            _num(performance.get("assignment_average")),
+            _num(performance.get("assignment_consistency")),
+            _num(performance.get("weighted_average")),
+        ])
+    return {"cols": ALL_COURSES_COLUMNS, "rows": rows}
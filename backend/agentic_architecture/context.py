@@ -1,14 +1,28 @@
 # backend/agents/context.py
 
-"""Global context for tools to access student_id and db_connection"""
+"""Per-run context for tools to access student_id and db_path.
 
-_current_context = {}
+Stored in a ContextVar rather than a module global: every asyncio task
+(and every task the Runner spawns for tool calls) sees the value that was
+current when it was created, so concurrent chats never see each other's
+student_id.
+"""
 
-def set_context(student_id: int, db_connection):
-    """Set global context before running agents"""
-    _current_context['student_id'] = student_id
-    _current_context['db_connection'] = db_connection
+from contextvars import ContextVar, Token
+from typing import Optional, Tuple
+
+_current_context: ContextVar[Optional[Tuple[int, Optional[str]]]] = ContextVar(
+    "lms_tool_context", default=None
+)
+
+def set_context(student_id: int, db_path: Optional[str] = None) -> Token:
+    """Set context for the current run; pass the token to reset_context when done"""
+    return _current_context.set((student_id, db_path))
+
+def reset_context(token: Token):
+    """Restore the context that was current before set_context"""
+    _current_context.reset(token)
 
 def get_context():
     """Get current context"""
-    return _current_context.get('student_id'), _current_context.get('db_connection')
\ No newline at end of file
+    return _current_context.get() or (None, None)
@@ -0,0 +1,147 @@
+# backend/agentic_architecture/conversation.py
+
+"""Bounded per-session conversation memory for follow-up questions.
+
+Each (student_id, session_id) keeps:
+
+- the last MAX_TURNS turns verbatim (answers clipped to MAX_ANSWER_CHARS)
+- a rolling summary of older turns, one line per turn, folded locally
+  (question plus the opening of the answer, markdown stripped) so it
+  costs no extra LLM call; capped at MAX_SUMMARY_CHARS by dropping the
+  oldest lines
+
+history() turns this into Agents SDK input items: the summary as a
+system message, then the verbatim turns. The agent therefore sees a
+fixed-size context instead of the whole transcript. At most
+MAX_SESSIONS sessions are kept, least recently used first out, and idle
+sessions expire after SESSION_TTL seconds.
+
+Sizing via LMS_CONVERSATION_TURNS, LMS_CONVERSATION_SESSIONS and
+LMS_CONVERSATION_TTL.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+MAX_TURNS = int(os.environ.get("LMS_CONVERSATION_TURNS", "4"))
+MAX_SESSIONS = int(os.environ.get("LMS_CONVERSATION_SESSIONS", "1000"))
+SESSION_TTL = float(os.environ.get("LMS_CONVERSATION_TTL", "7200"))
+MAX_ANSWER_CHARS = 1500
+MAX_SUMMARY_CHARS = 1200
+SUMMARY_QUESTION_CHARS = 120
+SUMMARY_ANSWER_CHARS = 160
+
+def _plain(text: str) -> str:
+    """Markdown, emojis and table rules stripped, whitespace collapsed"""
+    text = re.sub(r"[#*_`>|]+|-{3,}", " ", text)
+    text = re.sub(r"[^\w\s.,:;%/()+\-?!'\"]", " ", text)
+    return " ".join(text.split())
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+def summarize_turn(question: str, answer: str) -> str:
+    """One summary line for a turn leaving the verbatim window"""
+    return f"- Asked: {_clip(_plain(question), SUMMARY_QUESTION_CHARS)} → {_clip(_plain(answer), SUMMARY_ANSWER_CHARS)}"
+
+class ConversationMemory:
+    """Last turns verbatim plus a rolling summary of the rest"""
+
+    def __init__(self, max_turns: int = MAX_TURNS):
+        self.turns: Deque[Tuple[str, str]] = deque()
+        self.max_turns = max_turns
+        self.summary_lines: Deque[str] = deque()
+        self.summary_chars = 0
+        self.last_used = time.monotonic()
+
+    def add(self, question: str, answer: str):
+        self.turns.append((question, _clip(answer, MAX_ANSWER_CHARS)))
+        while len(self.turns) > self.max_turns:
+            self._fold(*self.turns.popleft())
+        self.last_used = time.monotonic()
+
+    def _fold(self, question: str, answer: str):
+        line = summarize_turn(question, answer)
+        self.summary_lines.append(line)
+        self.summary_chars += len(line) + 1
+        while self.summary_chars > MAX_SUMMARY_CHARS and len(self.summary_lines) > 1:
+            self.summary_chars -= len(self.summary_lines.popleft()) + 1
+
+    @property
+    def summary(self) -> str:
+        return "\n".join(self.summary_lines)
+
+    def history(self) -> List[Dict[str, str]]:
+        """SDK input items for this conversation so far (without the new question)"""
+        items = []
+        if self.summary_lines:
+            items.append({
+                "role": "system",
+                "content": "Summary of earlier turns in this conversation (oldest first):\n" + self.summary,
+            })
+        for question, answer in self.turns:
+            items.append({"role": "user", "content": question})
+            items.append({"role": "assistant", "content": answer})
+        return items
+
+class ConversationStore:
+    """Thread-safe LRU of ConversationMemory per (student_id, session_id)"""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl: float = SESSION_TTL, max_turns: int = MAX_TURNS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self._sessions: "OrderedDict[Tuple[int, str], ConversationMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: Tuple[int, str]) -> Optional[ConversationMemory]:
+        memory = self._sessions.get(key)
+        if memory is not None and memory.last_used + self.ttl < time.monotonic():
+            del self._sessions[key]
+            return None
+        return memory
+
+    def history(self, student_id: int, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """Input items for the session ([] for a new or expired session)"""
+        if session_id is None:
+            return []
+        with self._lock:
+            memory = self._get((student_id, session_id))
+            return memory.history() if memory is not None else []
+
+    def record(self, student_id: int, session_id: Optional[str], question: str, answer: str):
+        """Append a finished turn to the session"""
+        if session_id is None or self.max_sessions <= 0 or not answer:
+            return
+        key = (student_id, session_id)
+        with self._lock:
+            memory = self._get(key)
+            if memory is None:
+                memory = self._sessions[key] = ConversationMemory(self.max_turns)
+            memory.add(question, answer)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def clear(self, student_id: int, session_id: str):
+        with self._lock:
+            self._sessions.pop((student_id, session_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "max_turns": self.max_turns,
+                "ttl_seconds": self.ttl,
+            }
+
+_store = ConversationStore()
+
+def get_conversation_store() -> ConversationStore:
+    """The process-wide conversation store used by run_agent_query"""
+    return _store
@@ -0,0 +1,281 @@
+# backend/agentic_architecture/course_index.py
+
+"""In-memory course catalogue for resolving course names typed by students.
+
+Tools used to look courses up with ``WHERE course_name = ?``, so "calc",
+"physics " or "Programing" came back "not found" and the LLM retried with
+another spelling (a full model round-trip each time). The index loads the
+``courses`` table once per process, refreshes it periodically, and resolves
+names in this order:
+
+1. exact match after normalization (case, punctuation, filler words)
+2. aliases: built-in abbreviations, acronyms ("FE") and unique word prefixes ("calc")
+3. abbreviated words ("lin alg")
+4. trigram similarity against names and aliases, unless two courses score alike
+
+Coroutines call ``resolve_async``: reloads go through the database thread
+pool, so the event loop never waits on sqlite. Synchronous ``resolve``
+blocks only for the very first load; later reloads are queued on the
+pool and lookups keep using the previous catalogue until they land.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.database.async_db import run_read, submit_read
+from backend.database.connection import get_read_connection
+
+# Common abbreviations students use; applied only when the target exists
+COURSE_ALIASES = {
+    "calc": "Calculus",
+    "math": "Calculus",
+    "maths": "Calculus",
+    "english": "Functional English",
+    "eng": "Functional English",
+    "phy": "Physics",
+    "pf": "Programming",
+    "programming fundamentals": "Programming",
+    "coding": "Programming",
+    "ds": "Data Structures",
+    "dsa": "Data Structures",
+    "os": "Operating Systems",
+    "la": "Linear Algebra",
+    "econ": "Economics",
+}
+
+_FILLER_WORDS = {"the", "my", "course", "class", "subject", "in", "of", "for"}
+_MIN_PREFIX = 3
+FUZZY_THRESHOLD = 0.3
+FUZZY_MARGIN = 0.05
+REFRESH_INTERVAL = 60.0
+MISS_REFRESH_INTERVAL = 5.0
+_RESOLVE_CACHE_SIZE = 2048
+
+def normalize_course_name(name: str) -> str:
+    """Lowercase, drop punctuation and filler words, collapse whitespace"""
+    name = name.lower().replace("&", " and ")
+    words = re.sub(r"[^a-z0-9]+", " ", name).split()
+    kept = [w for w in words if w not in _FILLER_WORDS]
+    return " ".join(kept or words)
+
+def _load_rows(conn) -> Tuple[Tuple[int, str], ...]:
+    return tuple(conn.execute("SELECT course_id, course_name FROM courses ORDER BY course_id").fetchall())
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CourseIndex:
+    """Process-wide course name → (course_id, course_name) resolver"""
+
+    def __init__(self, db_path: Optional[str] = None, refresh_interval: float = REFRESH_INTERVAL):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._rows: Tuple[Tuple[int, str], ...] = ()
+        self._loaded_at = 0.0
+        self._loaded = False
+        self._reloading = False
+        self._keys: Dict[str, Tuple[int, str]] = {}
+        self._name_words: List[Tuple[List[str], Tuple[int, str]]] = []
+        self._key_trigrams: Dict[str, Set[str]] = {}
+        self._trigram_postings: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, Optional[Tuple[int, str]]] = {}
+
+    # ---------- loading ----------
+
+    def _stale(self, force: bool = False) -> bool:
+        return force or time.monotonic() - self._loaded_at >= self.refresh_interval
+
+    def _apply(self, rows):
+        with self._lock:
+            if rows != self._rows or not self._loaded:
+                self._build(rows)
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, force: bool = False):
+        """Reload the catalogue if it is older than refresh_interval (or force)
+
+        Only the first load waits for the query; later reloads run on the
+        database pool while lookups use the catalogue already loaded.
+        """
+        if not self._stale(force):
+            return
+        if not self._loaded:
+            self._apply(_load_rows(get_read_connection(self.db_path)))
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        submit_read(_load_rows, db_path=self.db_path).add_done_callback(self._reloaded)
+
+    def _reloaded(self, future):
+        try:
+            if future.exception() is None:
+                self._apply(future.result())
+        finally:
+            self._reloading = False
+
+    async def refresh_async(self, force: bool = False):
+        """refresh() for coroutines: the query runs on the database pool"""
+        if self._stale(force):
+            self._apply(await run_read(_load_rows, db_path=self.db_path))
+
+    def invalidate(self):
+        """Force a reload on the next lookup (call after writing to courses)"""
+        self._loaded_at = 0.0
+
+    def _build(self, rows):
+        keys: Dict[str, Tuple[int, str]] = {}
+        ambiguous: Set[str] = set()
+
+        def add(key, course, exact=False):
+            if not key:
+                return
+            if exact:
+                keys[key] = course
+                ambiguous.discard(key)
+            elif key in keys and keys[key] != course:
+                ambiguous.add(key)
+            elif key not in ambiguous:
+                keys.setdefault(key, course)
+
+        by_name = {name: (cid, name) for cid, name in rows if name}
+        for course in by_name.values():
+            normalized = normalize_course_name(course[1])
+            words = normalized.split()
+            if len(words) > 1:
+                add("".join(w[0] for w in words), course)
+            for word in words:
+                for end in range(_MIN_PREFIX, len(word) + 1):
+                    add(word[:end], course)
+        for alias, target in COURSE_ALIASES.items():
+            if target in by_name:
+                add(normalize_course_name(alias), by_name[target], exact=True)
+        # Full names always win over aliases and prefixes
+        for course in by_name.values():
+            add(normalize_course_name(course[1]), course, exact=True)
+
+        for key in ambiguous:
+            keys.pop(key, None)
+
+        # Fuzzy matching only over full names and explicit aliases, not prefixes
+        fuzzy_keys = {normalize_course_name(name) for name in by_name}
+        fuzzy_keys |= {normalize_course_name(a) for a, t in COURSE_ALIASES.items() if t in by_name}
+        key_trigrams = {key: _trigrams(key) for key in fuzzy_keys if key in keys}
+        postings: Dict[str, Set[str]] = {}
+        for key, grams in key_trigrams.items():
+            for gram in grams:
+                postings.setdefault(gram, set()).add(key)
+
+        self._keys = keys
+        self._name_words = [(normalize_course_name(c[1]).split(), c) for c in by_name.values()]
+        self._key_trigrams = key_trigrams
+        self._trigram_postings = postings
+        self._cache = {}
+        self._rows = rows
+
+    # ---------- lookups ----------
+
+    def resolve(self, course_name: Optional[str], fuzzy: bool = True) -> Optional[Tuple[int, str]]:
+        """(course_id, canonical course_name) for what the student typed, or None
+
+        ``fuzzy=False`` skips trigram matching (steps 1-3 only), for callers
+        parsing free text where a loose match would be a wrong answer.
+        """
+        if not course_name:
+            return None
+        self.refresh()
+        result = self._resolve_loaded(course_name, fuzzy)
+        if result is None and self._miss_refresh_due():
+            # Maybe a course was added since the last load; later lookups will see it
+            self.refresh(force=True)
+        return result
+
+    async def resolve_async(self, course_name: Optional[str], fuzzy: bool = True) -> Optional[Tuple[int, str]]:
+        """resolve() without sqlite on the event loop; a miss waits for a fresh catalogue"""
+        if not course_name:
+            return None
+        await self.refresh_async()
+        result = self._resolve_loaded(course_name, fuzzy)
+        if result is None and self._miss_refresh_due():
+            await self.refresh_async(force=True)
+            result = self._resolve_loaded(course_name, fuzzy)
+        return result
+
+    def _miss_refresh_due(self) -> bool:
+        return time.monotonic() - self._loaded_at >= MISS_REFRESH_INTERVAL
+
+    def _resolve_loaded(self, course_name: str, fuzzy: bool) -> Optional[Tuple[int, str]]:
+        normalized = normalize_course_name(course_name)
+        key = normalized if fuzzy else "\0" + normalized
+        cache = self._cache
+        if key in cache:
+            return cache[key]
+
+        result = self._lookup(normalized, fuzzy)
+        if len(cache) >= _RESOLVE_CACHE_SIZE:
+            cache.clear()
+        cache[key] = result
+        return result
+
+    def _lookup(self, normalized: str, fuzzy: bool = True) -> Optional[Tuple[int, str]]:
+        if normalized in self._keys:
+            return self._keys[normalized]
+
+        words = normalized.split()
+        if len(words) > 1:
+            matches = {
+                course for name_words, course in self._name_words
+                if all(any(nw.startswith(w) for nw in name_words) for w in words)
+            }
+            if len(matches) == 1:
+                return matches.pop()
+
+        if not fuzzy:
+            return None
+
+        grams = _trigrams(normalized)
+        overlap: Dict[str, int] = {}
+        for gram in grams:
+            for key in self._trigram_postings.get(gram, ()):
+                overlap[key] = overlap.get(key, 0) + 1
+
+        # Best Jaccard score per course (a course may have several keys)
+        scores: Dict[Tuple[int, str], float] = {}
+        for key, shared in overlap.items():
+            score = shared / (len(grams) + len(self._key_trigrams[key]) - shared)
+            course = self._keys[key]
+            if score > scores.get(course, 0.0):
+                scores[course] = score
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < FUZZY_THRESHOLD:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < FUZZY_MARGIN:
+            return None  # ambiguous, e.g. "algebra" with two algebra courses
+        return ranked[0][0]
+
+    def course_names(self) -> List[str]:
+        """All course names in the catalogue"""
+        self.refresh()
+        return [name for _, name in self._rows]
+
+_indexes: Dict[Optional[str], CourseIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_course_index(db_path: Optional[str] = None) -> CourseIndex:
+    """Shared CourseIndex for a database (one per process)"""
+    index = _indexes.get(db_path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(db_path, CourseIndex(db_path))
+    return index
+
+def resolve_course(course_name: Optional[str], db_path: Optional[str] = None) -> Optional[Tuple[int, str]]:
+    """Resolve a course name with the shared index"""
+    return get_course_index(db_path).resolve(course_name)
@@ -0,0 +1,176 @@
+# backend/agentic_architecture/fast_path.py
+
+"""Template answers for pure data lookups, with no LLM call.
+
+Covers the SPECIFIC QUERY HANDLING cases in lms_agent.py, in either word
+order ("quiz 1 in calculus", "calculus quiz 1"):
+
+- a single quiz or assignment by number
+- all quizzes / all assignments in a course
+- attendance in a course
+- midterm in a course
+
+The course must resolve through the course index without fuzzy
+matching. Anything else (questions, comparisons, several courses,
+unknown courses) returns None and goes to the agents as before. The answers use the LMS agent's house
+style: emojis, markdown, the attendance warning below 75%, the
+congratulations above 80%, and a closing note.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from .course_index import get_course_index
+from .tools import _get_course_data_async
+
+ATTENDANCE_REQUIRED = 75.0
+
+_PREFIX = (
+    r"^(?:(?:please\s+)?(?:show|give|tell|list|get|check)(?:\s+me)?\s+|"
+    r"what(?:'s|s| is| are| was| were)\s+|how much did i (?:get|score) (?:in|on)\s+)?"
+    r"(?:all\s+(?:of\s+)?)?(?:(?:my|the)\s+)?"
+)
+_ITEM = r"(?P<kind>quiz(?:zes|es)?|assignments?|attendance|mid\s?-?terms?(?:\s+exam)?)"
+_NUMBER = r"(?:\s*(?:no\.?|number|#)?\s*(?P<number>\d+))?"
+_SUFFIX = r"(?:\s+(?:marks?|scores?|details|results?|percentage|record))?"
+_COURSE = r"(?P<course>[a-z][a-z0-9 &\-]*?)"
+_END = r"\s*(?:please)?\s*[?.!]*$"
+
+_PATTERNS = [
+    re.compile(_PREFIX + _ITEM + _NUMBER + _SUFFIX + r"\s+(?:in|for|of)\s+" + _COURSE + _END, re.I),
+    re.compile(_PREFIX + _COURSE + r"\s+" + _ITEM + _NUMBER + _SUFFIX + _END, re.I),
+]
+
+def parse_lookup(query: str, db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """{"kind", "number", "course_name"} for a plain lookup, else None"""
+    text = " ".join(query.strip().split())
+    for pattern in _PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        course = get_course_index(db_path).resolve(match.group("course"), fuzzy=False)
+        if course is None:
+            return None
+
+        kind = match.group("kind").lower()
+        kind = ("quiz" if kind.startswith("quiz") else
+                "assignment" if kind.startswith("assignment") else
+                "attendance" if kind == "attendance" else "midterm")
+        number = match.group("number")
+        if number is not None and kind not in ("quiz", "assignment"):
+            return None
+        return {"kind": kind, "number": int(number) if number else None, "course_name": course[1]}
+    return None
+
+# ============================================
+# TEMPLATES
+# ============================================
+
+def _fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+def _closing(percentage: float) -> str:
+    if percentage > 80:
+        return "🎉 Excellent work — congratulations, keep it up!"
+    if percentage < 60:
+        return "💡 This needs attention before the final. Ask me for a study plan if you'd like one."
+    return "✅ Solid result — steady practice will push it higher."
+
+def _find_item(items: List[Dict[str, Any]], number: int) -> Optional[Dict[str, Any]]:
+    """Item named "<Kind> <number>", else the number-th item"""
+    for item in items:
+        if re.search(rf"\b{number}\b", item["name"]):
+            return item
+    return items[number - 1] if 0 < number <= len(items) else None
+
+def _single_item(data: Dict[str, Any], kind: str, number: int) -> str:
+    items = data["quizzes" if kind == "quiz" else "assignments"]
+    label = kind.capitalize()
+    item = _find_item(items, number)
+    if item is None:
+        recorded = ", ".join(i["name"] for i in items) or "none yet"
+        return (f"### 📝 {data['course_name']} — {label} {number}\n\n"
+                f"⚠️ No {label} {number} is recorded for {data['course_name']}. Recorded: {recorded}.")
+    return (
+        f"### 📝 {data['course_name']} — {item['name']}\n\n"
+        f"- **Marks:** {_fmt(item['marks_obtained'])} / {_fmt(item['max_marks'])}\n"
+        f"- **Percentage:** {item['percentage']}%\n\n"
+        f"{_closing(item['percentage'])}"
+    )
+
+def _all_items(data: Dict[str, Any], kind: str) -> str:
+    key = "quizzes" if kind == "quiz" else "assignments"
+    items = data[key]
+    title = "Quizzes" if kind == "quiz" else "Assignments"
+    if not items:
+        return f"### 📝 {data['course_name']} — {title}\n\n⚠️ No {key} recorded yet."
+
+    totals = data["totals"]
+    total, maximum = totals[f"{kind}_total"], totals[f"{kind}_max"]
+    percentage = totals[f"{kind}_percentage"]
+    rows = "\n".join(
+        f"| {i['name']} | {_fmt(i['marks_obtained'])} / {_fmt(i['max_marks'])} | {i['percentage']}% |"
+        for i in items
+    )
+    return (
+        f"### 📝 {data['course_name']} — {title}\n\n"
+        f"| {kind.capitalize()} | Marks | Percentage |\n|---|---|---|\n{rows}\n"
+        f"| **Total** | **{_fmt(total)} / {_fmt(maximum)}** | **{percentage}%** |\n\n"
+        f"{_closing(percentage)}"
+    )
+
+def _attendance(data: Dict[str, Any]) -> str:
+    attendance = data["attendance"]
+    if not attendance:
+        return f"### 📊 {data['course_name']} — Attendance\n\n⚠️ No attendance recorded yet."
+
+    attended, total = attendance["classes_attended"], attendance["total_classes"]
+    percentage = attendance["percentage"]
+    text = (
+        f"### 📊 {data['course_name']} — Attendance\n\n"
+        f"- **Classes attended:** {attended} / {total}\n"
+        f"- **Percentage:** {percentage}%\n\n"
+    )
+    if percentage < ATTENDANCE_REQUIRED:
+        # (attended + n) / (total + n) >= 0.75  →  n >= 3 * total - 4 * attended
+        needed = max(0, 3 * total - 4 * attended)
+        text += (f"⚠️ **Warning:** below the {ATTENDANCE_REQUIRED:.0f}% requirement. "
+                 f"Attend the next {needed} classes in a row to get back to {ATTENDANCE_REQUIRED:.0f}%.")
+    elif percentage > 80:
+        text += "🎉 Great attendance — congratulations, keep showing up!"
+    else:
+        text += "✅ You meet the 75% requirement — keep it steady."
+    return text
+
+def _midterm(data: Dict[str, Any]) -> str:
+    midterm = data["midterm"]
+    if not midterm:
+        return f"### 📝 {data['course_name']} — Midterm\n\n⚠️ No midterm marks recorded yet."
+    return (
+        f"### 📝 {data['course_name']} — Midterm\n\n"
+        f"- **Marks:** {_fmt(midterm['marks_obtained'])} / {_fmt(midterm['max_marks'])}\n"
+        f"- **Percentage:** {midterm['percentage']}%\n\n"
+        f"{_closing(midterm['percentage'])}"
+    )
+
+def render(lookup: Dict[str, Any], data: Dict[str, Any]) -> str:
+    """Markdown answer for a parsed lookup from its get_course_data payload"""
+    kind = lookup["kind"]
+    if kind == "attendance":
+        return _attendance(data)
+    if kind == "midterm":
+        return _midterm(data)
+    if lookup["number"] is not None:
+        return _single_item(data, kind, lookup["number"])
+    return _all_items(data, kind)
+
+async def answer(query: str, student_id: int, db_path: Optional[str] = None) -> Optional[str]:
+    """Direct answer for a plain lookup, or None to use the agents"""
+    await get_course_index(db_path).refresh_async()  # keeps parse_lookup's sqlite reload off the loop
+    lookup = parse_lookup(query, db_path)
+    if lookup is None:
+        return None
+    data = await _get_course_data_async(lookup["course_name"], student_id, db_path)
+    if "error" in data:
+        return None
+    return render(lookup, data)
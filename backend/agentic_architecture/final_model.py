@@ -0,0 +1,338 @@
+# backend/agentic_architecture/final_model.py
+
+"""Final-exam regression trained on past cohorts.
+
+``marks.final`` holds the final exam (out of 50) for students who already
+sat it. The offline training job fits one least-squares model per course
+on the features below, read from student_course_summary, plus one pooled
+model (course_id 0) for courses with too little history. Coefficients are
+stored in final_exam_models (migration 4), with the RMSE of k-fold
+held-out predictions as each model's typical error.
+
+Serving keeps every model in an in-memory ``FinalModels`` cache: one
+coefficient row per course, stacked into a matrix. Scoring a cohort is a
+single ``X @ w`` and one student is a dot product, so neither touches the
+database beyond reading features. Coroutines call ``refresh_async`` first
+so coefficient reloads run on the database thread pool; synchronous
+callers block only for the first load, later reloads happen in the
+background while the loaded coefficients keep serving.
+
+Usage:
+    python backend/agentic_architecture/final_model.py --train [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.async_db import run_read, submit_read
+from backend.database.connection import DB_PATH, connect, get_read_connection
+
+FEATURES = ("quiz_pct", "assignment_pct", "midterm_pct", "attendance_pct")
+FINAL_MAX = 50.0
+POOLED_COURSE_ID = 0
+MIN_SAMPLES = 8
+RIDGE = 1e-3
+CV_FOLDS = 5
+REFRESH_INTERVAL = 60.0
+
+# Feature percentages straight from the trigger-maintained summary table
+_FEATURE_COLUMNS = """
+    s.student_id, s.course_id,
+    100.0 * s.quiz_total / NULLIF(s.quiz_max, 0),
+    100.0 * s.assignment_total / NULLIF(s.assignment_max, 0),
+    100.0 * s.midterm / 20,
+    100.0 * s.classes_attended / NULLIF(s.total_classes, 0)
+"""
+
+_TRAINING_QUERY = f"""
+    SELECT {_FEATURE_COLUMNS}, m.final
+    FROM student_course_summary s
+    JOIN marks m ON m.student_id = s.student_id AND m.course_id = s.course_id
+    WHERE m.final IS NOT NULL
+    ORDER BY s.course_id, s.student_id
+"""
+
+_FEATURES_QUERY = f"""
+    SELECT {_FEATURE_COLUMNS}
+    FROM student_course_summary s
+    WHERE s.enrolled = 1 {{where}}
+    ORDER BY s.course_id, s.student_id
+"""
+
+# ============================================
+# FEATURES
+# ============================================
+
+def load_features(db_connection, student_id: Optional[int] = None,
+                  course_id: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(student_ids, course_ids, X) for enrolled students; X has NaN for missing features"""
+    clauses, params = [], {}
+    if student_id is not None:
+        clauses.append("AND s.student_id = :student_id")
+        params["student_id"] = student_id
+    if course_id is not None:
+        clauses.append("AND s.course_id = :course_id")
+        params["course_id"] = course_id
+
+    rows = db_connection.execute(_FEATURES_QUERY.format(where=" ".join(clauses)), params).fetchall()
+    data = np.array(rows, dtype=float).reshape(len(rows), 2 + len(FEATURES))
+    return data[:, 0].astype(int), data[:, 1].astype(int), data[:, 2:]
+
+def _design(X: np.ndarray, means: np.ndarray) -> np.ndarray:
+    """Impute missing features with the training means and prepend an intercept"""
+    X = np.where(np.isnan(X), means, X)
+    return np.hstack([np.ones((X.shape[0], 1)), X])
+
+# ============================================
+# TRAINING (offline job)
+# ============================================
+
+def _solve(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Ridge-stabilized least squares; returns (coefficients, feature_means)"""
+    # Columns with no values at all impute to 0
+    means = np.nanmean(np.where(np.isnan(X).all(axis=0), 0.0, X), axis=0)
+    A = _design(X, means)
+
+    # Small ridge term (intercept unpenalized) keeps tiny or collinear cohorts solvable
+    penalty = np.sqrt(RIDGE * len(y)) * np.eye(A.shape[1])[1:]
+    coefficients, *_ = np.linalg.lstsq(
+        np.vstack([A, penalty]),
+        np.concatenate([y, np.zeros(penalty.shape[0])]),
+        rcond=None
+    )
+    return coefficients, means
+
+def _cross_validated_rmse(X: np.ndarray, y: np.ndarray, folds: int = CV_FOLDS) -> float:
+    """RMSE of predictions for students held out of the fit (k-fold, leave-one-out when tiny)"""
+    folds = min(folds, len(y))
+    assignment = np.random.default_rng(0).permutation(len(y)) % folds
+    residuals = np.empty(len(y))
+    for fold in range(folds):
+        held_out = assignment == fold
+        coefficients, means = _solve(X[~held_out], y[~held_out])
+        residuals[held_out] = _design(X[held_out], means) @ coefficients - y[held_out]
+    return float(np.sqrt(np.mean(residuals ** 2)))
+
+def _fit(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """(coefficients, feature_means, rmse) fitted on every student.
+
+    The RMSE is shown to students as the typical error of a prediction,
+    so it comes from held-out students: the in-sample residuals of a fit
+    understate the error on someone the model has not seen.
+    """
+    coefficients, means = _solve(X, y)
+    return coefficients, means, _cross_validated_rmse(X, y)
+
+def train(db_path: Optional[str] = None, min_samples: int = MIN_SAMPLES) -> Dict[int, Dict[str, float]]:
+    """Fit per-course and pooled models from students with a final mark and store them"""
+    db_path = db_path or DB_PATH
+    conn = connect(db_path)
+    conn.isolation_level = None  # explicit BEGIN IMMEDIATE below
+    try:
+        rows = conn.execute(_TRAINING_QUERY).fetchall()
+        if not rows:
+            return {}
+
+        data = np.array(rows, dtype=float)
+        course_ids = data[:, 1].astype(int)
+        X, y = data[:, 2:-1], data[:, -1]
+
+        cohorts = {POOLED_COURSE_ID: np.ones(len(y), dtype=bool)}
+        for course_id in np.unique(course_ids):
+            cohorts[int(course_id)] = course_ids == course_id
+
+        trained_at = datetime.now(timezone.utc).isoformat()
+        models = {}
+        for course_id, mask in cohorts.items():
+            if mask.sum() < min_samples:
+                continue
+            coefficients, means, rmse = _fit(X[mask], y[mask])
+            models[course_id] = {
+                "coefficients": coefficients,
+                "feature_means": means,
+                "n_samples": int(mask.sum()),
+                "rmse": rmse,
+            }
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM final_exam_models")
+            conn.executemany(
+                """INSERT INTO final_exam_models
+                   (course_id, features, coefficients, feature_means, n_samples, rmse, trained_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (course_id, json.dumps(FEATURES), json.dumps(m["coefficients"].tolist()),
+                     json.dumps(m["feature_means"].tolist()), m["n_samples"], m["rmse"], trained_at)
+                    for course_id, m in models.items()
+                ]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    return {cid: {"n_samples": m["n_samples"], "rmse": round(m["rmse"], 3)} for cid, m in models.items()}
+
+# ============================================
+# SERVING (in-memory coefficient cache)
+# ============================================
+
+def _load_model_rows(conn, known_version=None):
+    """(version, rows) of final_exam_models; rows is None if unchanged since known_version"""
+    try:
+        version = conn.execute("SELECT MAX(trained_at), COUNT(*) FROM final_exam_models").fetchone()
+        if version == known_version:
+            return version, None
+        rows = conn.execute(
+            """SELECT course_id, coefficients, feature_means, n_samples, rmse
+               FROM final_exam_models ORDER BY course_id"""
+        ).fetchall()
+        return version, rows
+    except sqlite3.OperationalError:
+        # Not migrated yet: serve no models
+        return None, []
+
+class FinalModels:
+    """Stacked per-course coefficients (one row of ``weights``/``means`` per trained course)"""
+
+    def __init__(self, db_path: Optional[str] = None, refresh_interval: float = REFRESH_INTERVAL):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._loaded = False
+        self._reloading = False
+        self._version = None
+        self._row: Dict[int, int] = {}
+        self.weights = np.zeros((0, len(FEATURES) + 1))
+        self.means = np.zeros((0, len(FEATURES)))
+        self.info: List[Dict[str, float]] = []
+
+    def _stale(self, force: bool = False) -> bool:
+        return force or time.monotonic() - self._loaded_at >= self.refresh_interval
+
+    def _apply(self, loaded):
+        version, rows = loaded
+        with self._lock:
+            if rows is not None:
+                self._build(rows)
+                self._version = version
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, force: bool = False):
+        """Reload coefficients if the table was retrained since the last load"""
+        if not self._stale(force):
+            return
+        if not self._loaded:
+            self._apply(_load_model_rows(get_read_connection(self.db_path), self._version))
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        submit_read(_load_model_rows, self._version, db_path=self.db_path).add_done_callback(self._reloaded)
+
+    def _reloaded(self, future):
+        try:
+            if future.exception() is None:
+                self._apply(future.result())
+        finally:
+            self._reloading = False
+
+    async def refresh_async(self, force: bool = False):
+        """refresh() for coroutines: the query runs on the database pool"""
+        if self._stale(force):
+            self._apply(await run_read(_load_model_rows, self._version, db_path=self.db_path))
+
+    def _build(self, rows):
+        weights = np.array([json.loads(r[1]) for r in rows], dtype=float).reshape(len(rows), len(FEATURES) + 1)
+        means = np.array([json.loads(r[2]) for r in rows], dtype=float).reshape(len(rows), len(FEATURES))
+        info = [{"n_samples": r[3], "rmse": round(r[4], 2) if r[4] is not None else None} for r in rows]
+        # Swap everything at once; a background reload may land mid-request
+        self.weights, self.means, self.info = weights, means, info
+        self._row = {course_id: i for i, (course_id, *_) in enumerate(rows)}
+
+    def _index(self, course_id: int) -> Optional[int]:
+        """Row for the course's own model, else the pooled model, else None"""
+        self.refresh()
+        index = self._row.get(course_id)
+        return index if index is not None else self._row.get(POOLED_COURSE_ID)
+
+    def has_model(self, course_id: int) -> bool:
+        return self._index(course_id) is not None
+
+    def model_info(self, course_id: int) -> Optional[Dict[str, float]]:
+        """n_samples/rmse of the model that would score this course, and whether it is pooled"""
+        index = self._index(course_id)
+        if index is None:
+            return None
+        return {**self.info[index], "pooled": course_id not in self._row}
+
+    def score_cohort(self, course_id: int, X: np.ndarray) -> Optional[np.ndarray]:
+        """Predicted finals (out of 50) for every row of X in one course: one matrix multiply"""
+        index = self._index(course_id)
+        if index is None:
+            return None
+        return np.clip(_design(X, self.means[index]) @ self.weights[index], 0, FINAL_MAX)
+
+    def score(self, course_ids: Sequence[int], X: np.ndarray) -> np.ndarray:
+        """Predicted finals for rows from mixed courses; NaN where no model applies"""
+        indices = [self._index(int(c)) for c in course_ids]
+        known = np.array([i is not None for i in indices], dtype=bool)
+        result = np.full(len(indices), np.nan)
+        if known.any():
+            rows = np.array([i for i in indices if i is not None])
+            Xk = X[known]
+            Xk = np.where(np.isnan(Xk), self.means[rows], Xk)
+            A = np.hstack([np.ones((Xk.shape[0], 1)), Xk])
+            result[known] = np.clip(np.einsum("ij,ij->i", A, self.weights[rows]), 0, FINAL_MAX)
+        return result
+
+_models: Dict[Optional[str], FinalModels] = {}
+_models_lock = threading.Lock()
+
+def get_final_models(db_path: Optional[str] = None) -> FinalModels:
+    """Shared FinalModels cache for a database (one per process)"""
+    models = _models.get(db_path)
+    if models is None:
+        with _models_lock:
+            models = _models.setdefault(db_path, FinalModels(db_path))
+    return models
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the final-exam regression from past cohorts")
+    parser.add_argument("--db", default=DB_PATH, help="path to the SQLite database")
+    parser.add_argument("--train", action="store_true", help="fit and store coefficients")
+    parser.add_argument("--min-samples", type=int, default=MIN_SAMPLES)
+    args = parser.parse_args(argv)
+
+    if not args.train:
+        parser.print_help()
+        return
+
+    models = train(args.db, args.min_samples)
+    if not models:
+        print("No students with a final mark (or too few per course); nothing trained")
+        return
+    for course_id, stats in sorted(models.items()):
+        label = "pooled" if course_id == POOLED_COURSE_ID else f"course {course_id}"
+        print(f"✅ {label}: {stats['n_samples']} students, RMSE {stats['rmse']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend/agentic_architecture/grade_targets.py
+
+""""What do I need on the final?" solver.
+
+Each course totals 100 marks: 50 from coursework (``current_total``) and
+50 from the final exam. The final marks needed for a grade are its band
+threshold minus ``current_total``:
+
+- needed <= 0       → "secured" (the grade is reached even with a 0 final)
+- needed > 50       → "impossible"
+- otherwise         → required marks out of 50
+
+Computed for every course and band at once (courses × bands array).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+FINAL_MAX = 50.0
+
+# Minimum total (out of 100) for each letter grade, best first
+GRADE_BANDS = (
+    ("A", 85.0),
+    ("A-", 80.0),
+    ("B+", 75.0),
+    ("B", 71.0),
+    ("B-", 68.0),
+    ("C+", 64.0),
+    ("C", 61.0),
+    ("C-", 58.0),
+    ("D+", 54.0),
+    ("D", 50.0),
+)
+
+def grade_names() -> List[str]:
+    return [grade for grade, _ in GRADE_BANDS]
+
+def normalize_grade(grade: str) -> Optional[str]:
+    """Canonical band name for user input like "b plus" or " a- ", or None"""
+    key = grade.strip().upper().replace(" ", "").replace("PLUS", "+").replace("MINUS", "-")
+    return key if key in grade_names() else None
+
+def required_finals(courses: Sequence[Dict[str, Any]], target_grade: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Final marks needed per grade band for each {"course_name", "current_total"}"""
+    bands = [(g, t) for g, t in GRADE_BANDS if target_grade is None or g == target_grade]
+    if not courses:
+        return []
+
+    totals = np.array([course["current_total"] for course in courses], dtype=float)
+    thresholds = np.array([t for _, t in bands])
+    needed = thresholds[None, :] - totals[:, None]
+    secured = needed <= 0
+    impossible = needed > FINAL_MAX
+
+    # Best grade reachable with a full final (first band within reach)
+    reachable = totals[:, None] + FINAL_MAX >= np.array([t for _, t in GRADE_BANDS])[None, :]
+    best = np.where(reachable.any(axis=1), reachable.argmax(axis=1), -1)
+
+    results = []
+    for i, course in enumerate(courses):
+        result = {
+            "course_name": course["course_name"],
+            "current_total": round(float(totals[i]), 2),
+            "best_possible_grade": GRADE_BANDS[best[i]][0] if best[i] >= 0 else "F",
+            "required_final": {
+                grade: round(float(needed[i, j]), 2)
+                for j, (grade, _) in enumerate(bands)
+                if not secured[i, j] and not impossible[i, j]
+            },
+            "secured": [grade for j, (grade, _) in enumerate(bands) if secured[i, j]],
+            "impossible": [grade for j, (grade, _) in enumerate(bands) if impossible[i, j]],
+        }
+        results.append(result)
+
+    return results
@@ -0,0 +1,208 @@
+# backend/agentic_architecture/intent_router.py
+
+"""Local intent router in front of the triage agent.
+
+The triage agent spends a full LLM call to choose between the LMS,
+Prediction and Planner agents, and its ROUTING LOGIC is keyword-based.
+``route()`` makes that choice locally:
+
+1. keyword rules: intent words (predict/plan...) first, then data words
+   (quiz/attendance...), accepted only when exactly one route matches
+2. otherwise a TF-IDF (word + character n-grams) logistic regression
+   trained on EXAMPLE_QUERIES, accepted above CONFIDENCE_THRESHOLD
+
+Greetings, vague or mixed messages return None and go to triage as
+before. The model trains in ~50 ms (plus the scikit-learn import) on
+first use or warm_up(). Without scikit-learn only the rules are used.
+"""
+
+import re
+import threading
+from typing import NamedTuple, Optional
+
+LMS = "lms"
+PREDICTION = "prediction"
+PLANNER = "planner"
+TRIAGE = "triage"  # label for queries the triage agent should handle
+
+CONFIDENCE_THRESHOLD = 0.6
+
+_GREETING = re.compile(r"^\s*(hi|hello|hey|salam|assalam\w*|thanks|thank you|good (morning|evening|afternoon))\b", re.I)
+
+_INTENT_RULES = {
+    PREDICTION: re.compile(
+        r"\b(predict\w*|forecast\w*|expect\w*|projected|projection|estimate\w*|will i (pass|fail|get)|"
+        r"chances?|likely|need (on|in) (the |my )?final|(final|end ?term) (exam )?(score|marks?|grade|result)|"
+        r"what grade|can i (still )?get an?\b)",
+        re.I
+    ),
+    PLANNER: re.compile(
+        r"\b(plan\w*|schedul\w*|timetable|rescue|revis\w*|prepar\w*|how (should|do|can) i (study|improve|prepare)|"
+        r"study (tips|hours|routine|strategy)|hours (a|per) (day|week)|catch up|improve|tips|strateg\w*)",
+        re.I
+    ),
+}
+
+_DATA_RULE = re.compile(
+    r"\b(quiz\w*|assignments?|attendance|absen\w*|present|classes (attended|missed)|marks?|scores?|"
+    r"midterm|mid ?term|results?|grades? (so far|in)|how many classes|total|percentage)\b",
+    re.I
+)
+
+# Labeled training set (also the examples the triage prompt lists)
+EXAMPLE_QUERIES = [
+    # LMS Agent: retrieve stored data
+    ("What are my quiz marks in Calculus?", LMS),
+    ("How did I do in Assignment 3?", LMS),
+    ("Show my attendance in Physics", LMS),
+    ("what did i get in quiz 2 programming", LMS),
+    ("How many classes have I missed in English?", LMS),
+    ("my midterm score in physics", LMS),
+    ("List all my assignment scores", LMS),
+    ("What is my current total in Calculus?", LMS),
+    ("show me my marks", LMS),
+    ("attendance percentage for all courses", LMS),
+    ("did I submit the programming assignment", LMS),
+    ("What's my percentage in Functional English so far?", LMS),
+    ("how am i doing in calculus", LMS),
+    ("Give me an overview of all my courses", LMS),
+    ("what are my results", LMS),
+    ("quiz 1 physics marks", LMS),
+    ("How much did I score on the midterm?", LMS),
+    ("Am I short on attendance anywhere?", LMS),
+    ("show my gradebook", LMS),
+    ("which course has my lowest quiz average", LMS),
+    # Prediction Agent: forecasts and targets
+    ("Predict my final score in Physics", PREDICTION),
+    ("What grade can I expect in Functional English?", PREDICTION),
+    ("What do I need on the final to get a B+?", PREDICTION),
+    ("Will I pass Calculus?", PREDICTION),
+    ("what are my chances of getting an A in programming", PREDICTION),
+    ("estimate my final exam marks", PREDICTION),
+    ("How much will I get in the final?", PREDICTION),
+    ("forecast my grades for all courses", PREDICTION),
+    ("can I still get an A in physics", PREDICTION),
+    ("what final score do i need to pass english", PREDICTION),
+    ("predict my performance this semester", PREDICTION),
+    ("am i likely to fail calculus", PREDICTION),
+    ("expected final marks in every subject", PREDICTION),
+    ("what will my overall grade be", PREDICTION),
+    ("how many marks do I need in the final exam for a B", PREDICTION),
+    ("projected result for programming", PREDICTION),
+    # Planner Agent: plans, schedules, strategies
+    ("Create a study plan for Programming", PLANNER),
+    ("I need a rescue plan for Calculus", PLANNER),
+    ("Make me a weekly study schedule", PLANNER),
+    ("how should i study for the physics final", PLANNER),
+    ("give me a timetable for the next 4 weeks", PLANNER),
+    ("How do I improve my attendance and quiz scores?", PLANNER),
+    ("help me prepare for finals", PLANNER),
+    ("I only have 2 hours a day, plan my revision", PLANNER),
+    ("study tips for english", PLANNER),
+    ("how can I catch up in calculus", PLANNER),
+    ("which course should I focus on first", PLANNER),
+    ("organize my study time across subjects", PLANNER),
+    ("I'm failing programming, what should I do", PLANNER),
+    ("best strategy to revise for exams", PLANNER),
+    ("how many hours should I study each course", PLANNER),
+    ("make a revision plan", PLANNER),
+    # Triage: greetings, capabilities, unclear
+    ("hi", TRIAGE),
+    ("hello there", TRIAGE),
+    ("what can you do?", TRIAGE),
+    ("thanks!", TRIAGE),
+    ("who are you", TRIAGE),
+    ("help", TRIAGE),
+    ("good morning", TRIAGE),
+    ("ok", TRIAGE),
+    ("tell me a joke", TRIAGE),
+    ("what is the capital of France", TRIAGE),
+]
+
+class Route(NamedTuple):
+    agent: str           # LMS / PREDICTION / PLANNER
+    confidence: float
+    source: str          # "rules" or "model"
+
+def _rule_route(query: str) -> Optional[str]:
+    """Single unambiguous keyword route, TRIAGE for greetings, else None"""
+    if _GREETING.match(query) and len(query.split()) <= 4:
+        return TRIAGE
+    intents = [route for route, pattern in _INTENT_RULES.items() if pattern.search(query)]
+    if len(intents) == 1:
+        return intents[0]
+    if not intents and _DATA_RULE.search(query):
+        return LMS
+    return None
+
+class IntentRouter:
+    """Rules plus a lazily trained TF-IDF/logistic regression classifier"""
+
+    def __init__(self, examples=EXAMPLE_QUERIES, threshold: float = CONFIDENCE_THRESHOLD):
+        self.examples = examples
+        self.threshold = threshold
+        self._model = None
+        self._trained = False
+        self._lock = threading.Lock()
+
+    def _build_model(self):
+        try:
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.pipeline import make_pipeline, make_union
+            from sklearn.feature_extraction.text import TfidfVectorizer
+        except ImportError:
+            return None
+
+        model = make_pipeline(
+            make_union(
+                TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+                TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True),
+            ),
+            LogisticRegression(C=10.0, max_iter=1000),
+        )
+        texts, labels = zip(*self.examples)
+        model.fit(texts, labels)
+        return model
+
+    @property
+    def model(self):
+        if not self._trained:
+            with self._lock:
+                if not self._trained:
+                    self._model = self._build_model()
+                    self._trained = True
+        return self._model
+
+    def classify(self, query: str) -> Route:
+        """Best guess with confidence, including TRIAGE (never None)"""
+        ruled = _rule_route(query)
+        if ruled is not None:
+            return Route(ruled, 1.0, "rules")
+        if self.model is None:
+            return Route(TRIAGE, 0.0, "rules")
+        probabilities = self.model.predict_proba([query])[0]
+        best = probabilities.argmax()
+        return Route(str(self.model.classes_[best]), float(probabilities[best]), "model")
+
+    def route(self, query: str) -> Optional[Route]:
+        """Specialist route for confident, clear queries; None means use triage"""
+        if not query or not query.strip():
+            return None
+        decision = self.classify(query)
+        if decision.agent == TRIAGE or decision.confidence < self.threshold:
+            return None
+        return decision
+
+_router = IntentRouter()
+
+def route(query: str) -> Optional[Route]:
+    """Route with the shared router (see IntentRouter.route)"""
+    return _router.route(query)
+
+def classify(query: str) -> Route:
+    """Best guess with the shared router, including TRIAGE (see IntentRouter.classify)"""
+    return _router.classify(query)
+
+def warm_up():
+    """Train the shared model now instead of on the first query"""
+    _router.model
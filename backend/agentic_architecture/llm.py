@@ -1,27 +1,276 @@
+"""Shared LLM client layer for every agent.
+
+One place builds the OpenAI-compatible client (Gemini by default) that
+all agents use, through the Agents SDK ``ModelProvider`` hook:
+
+- keep-alive connection pooling: one ``httpx.AsyncClient`` per event
+  loop (pooled connections cannot cross loops); the sync wrappers the
+  dashboard uses all run on one long-lived loop, so it gets one client
+- per-call deadline: LLM_TIMEOUT seconds covers every attempt and
+  backoff for one model call
+- jittered exponential backoff on 429/5xx and connection errors,
+  honouring Retry-After (the SDK's own retries are turned off so the
+  two do not multiply)
+- a process-wide cap of LLM_MAX_CONCURRENCY in-flight model calls,
+  shared across event loops and held until a streamed response closes
+
+Configuration (environment or .env): LLM_BASE_URL, LLM_API_KEY (falls
+back to GEMINI_API_KEY), LLM_MODEL, LLM_TIMEOUT, LLM_CONNECT_TIMEOUT,
+LLM_MAX_RETRIES, LLM_MAX_CONCURRENCY, LLM_MAX_CONNECTIONS. Point
+LLM_BASE_URL at a local OpenAI-compatible stub to test without network.
+"""
+
+import asyncio
 import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Optional
+
+import httpx
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
+from agents import ModelProvider, OpenAIChatCompletionsModel, RunConfig
 
 load_dotenv()
 
-class GeminiLLM:
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise RuntimeError("GEMINI_API_KEY missing")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_TRACING = os.getenv("LLM_TRACING", "0") == "1"
 
-        self.client = AsyncOpenAI(
-            api_key=api_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+def _api_key() -> str:
+    api_key = os.getenv("LLM_API_KEY") or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY missing (or set LLM_API_KEY)")
+    return api_key
+
+# ============================================
+# CONCURRENCY LIMIT (shared across event loops)
+# ============================================
+
+class CallLimiter:
+    """Semaphore usable from any event loop in any thread"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters = deque()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                    granted = False
+                except ValueError:
+                    granted = True  # slot was handed over just before cancelling
+            if granted:
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                # Hand the slot straight to the next waiter (in_flight unchanged)
+                loop.call_soon_threadsafe(_wake, future)
+                return
+            self.in_flight -= 1
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+_limiter = CallLimiter(LLM_MAX_CONCURRENCY)
+
+# ============================================
+# RESILIENT TRANSPORT
+# ============================================
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the concurrency slot back when closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Deadline, jittered retries and the global concurrency cap around a pooled transport"""
 
-        # ✅ Correct Gemini model
-        self.model_name = "gemini-2.5-flash"
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: CallLimiter = _limiter,
+                 deadline: float = LLM_TIMEOUT, max_retries: int = LLM_MAX_RETRIES):
+        self._transport = transport
+        self._limiter = limiter
+        self._deadline = deadline
+        self._max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        deadline = time.monotonic() + self._deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise httpx.TimeoutException("LLM call deadline exceeded", request=request)
+            request.extensions["timeout"] = {
+                "connect": min(LLM_CONNECT_TIMEOUT, remaining),
+                "read": remaining,
+                "write": remaining,
+                "pool": remaining,
+            }
+
+            await self._limiter.acquire()
+            released = False
+
+            def release():
+                nonlocal released
+                if not released:
+                    released = True
+                    self._limiter.release()
+
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError):
+                release()
+                delay = _backoff_delay(attempt)
+                if attempt >= self._max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                release()
+                raise
+
+            if response.status_code in RETRY_STATUSES and attempt < self._max_retries:
+                delay = _backoff_delay(attempt, _retry_after(response))
+                # Retry only if the next attempt can start before the deadline;
+                # otherwise hand this error response to the caller
+                if time.monotonic() + delay < deadline:
+                    await response.aclose()
+                    release()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+            return httpx.Response(
+                status_code=response.status_code,
+                headers=response.headers,
+                stream=_ReleasingStream(response.stream, release),
+                extensions=response.extensions,
+            )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+def _backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, at least Retry-After when the server sent one"""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, retry_after) if retry_after is not None else delay
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return min(float(response.headers["retry-after"]), BACKOFF_CAP)
+    except (KeyError, ValueError):
+        return None
+
+# ============================================
+# CLIENT FACTORY (one pooled client per event loop)
+# ============================================
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+def _build_client() -> AsyncOpenAI:
+    transport = ResilientTransport(httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+    ))
+    http_client = httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+    return AsyncOpenAI(
+        base_url=LLM_BASE_URL,
+        api_key=_api_key(),
+        http_client=http_client,
+        max_retries=0,  # ResilientTransport retries
+        timeout=LLM_TIMEOUT,
+    )
+
+def get_openai_client() -> AsyncOpenAI:
+    """Pooled AsyncOpenAI client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(loop)
+            if client is None:
+                client = _clients[loop] = _build_client()
+    return client
+
+class SharedModelProvider(ModelProvider):
+    """Resolves agents' model names to chat-completions models on the shared client"""
+
+    def get_model(self, model_name: Optional[str]):
+        return OpenAIChatCompletionsModel(model=model_name or LLM_MODEL, openai_client=get_openai_client())
+
+_provider = SharedModelProvider()
+
+def get_run_config(**overrides) -> RunConfig:
+    """RunConfig routing every agent's model through the shared client"""
+    overrides.setdefault("tracing_disabled", not LLM_TRACING)
+    return RunConfig(model_provider=_provider, **overrides)
+
+def limiter_stats() -> dict:
+    return {"in_flight": _limiter.in_flight, "limit": _limiter.limit, "waiting": len(_limiter._waiters)}
+
+class GeminiLLM:
+    """Plain completion helper on the shared client"""
+
+    def __init__(self):
+        _api_key()
+        self.model_name = LLM_MODEL
 
     async def complete(self, prompt: str) -> str:
-        response = await self.client.responses.create(
+        response = await get_openai_client().chat.completions.create(
             model=self.model_name,
-            input=prompt
+            messages=[{"role": "user", "content": prompt}]
         )
 
-        return response.output_text
+        return response.choices[0].message.content
@@ -1,11 +1,12 @@
 # backend/agents/lms_agent.py
 
 from agents import Agent
-from .tools import get_course_data, get_performance_data, get_course_analysis
+from .llm import LLM_MODEL
+from .tools import get_course_data, get_performance_data, get_course_analysis, get_all_courses_data
 
 lms_agent = Agent(
     name="LMS Data Agent",
-    model="gemini-1.5-flash",
+    model=LLM_MODEL,
     instructions="""
     You are the LMS Data Retrieval Agent.
     
@@ -36,6 +37,8 @@ lms_agent = Agent(
     - "assignment 3 in physics": Show only assignment 3 details
     - "all quizzes in programming": Show all 4 quizzes
     - "attendance in functional english": Show attendance only
+    - "how am I doing overall" / "all my courses": Call get_all_courses_data ONCE
+      (never get_course_data once per course)
     
     FORMATTING:
     Use markdown with headers, bullet points, and emphasis.
@@ -46,5 +49,5 @@ lms_agent = Agent(
     
     # Tools/functions the agent can call
     # SIMPLE DIRECT FUNCTION REFERENCES
-    tools=[get_course_data, get_performance_data, get_course_analysis]
+    tools=[get_course_data, get_performance_data, get_course_analysis, get_all_courses_data]
 )
\ No newline at end of file
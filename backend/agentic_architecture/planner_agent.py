@@ -1,11 +1,12 @@
 # backend/agents/planner_agent.py
 
 from agents import Agent
-from .tools import get_course_analysis, get_course_data
+from .llm import LLM_MODEL
+from .tools import get_course_analysis, get_course_data, get_study_plan
 
 planner_agent = Agent(
     name="Planner Agent",
-    model="gemini-1.5-flash",
+    model=LLM_MODEL,
     instructions="""
     You are the Academic Planning Agent.
     
@@ -29,13 +30,23 @@ planner_agent = Agent(
     - Course priorities and risk levels
     - Student's available time (assume 3-4 hours daily)
     
+    SCHEDULES:
+    - For study plans, schedules and hour allocation call get_study_plan ONCE
+      (pass hours_per_day / weeks if the student states them, otherwise
+      the defaults of 3.5 hours over 5 weeks apply)
+    - It returns the weekly hours per course, a daily template and the
+      focus for each week. Present these as given; do NOT re-allocate
+      hours or write out every week and day yourself
+    - Mention any shortfall_hours (not enough time for a course's
+      recommendation) and buffer_hours_per_week
+    - Use get_course_analysis for the issues behind a single course
+    
     RESPONSE FORMAT:
     1. Course-wise prioritization with risk levels
-    2. Recommended weekly study hours per course
-    3. Specific focus areas for improvement
-    4. Weekly study schedule template
-    5. Study strategies and techniques
-    6. Progress tracking suggestions
+    2. The daily template as one compact table
+    3. Week-by-week focus in a few bullets
+    4. Specific focus areas for improvement
+    5. Study strategies and techniques (brief)
     
     STUDY STRATEGIES TO RECOMMEND:
     - Active recall and spaced repetition
@@ -53,5 +64,5 @@ planner_agent = Agent(
     handoff_description="Specialist agent for study planning, scheduling, and rescue plans",
     
     # SIMPLE DIRECT FUNCTION REFERENCES
-    tools=[get_course_analysis, get_course_data]
+    tools=[get_study_plan, get_course_analysis, get_course_data]
 )
\ No newline at end of file
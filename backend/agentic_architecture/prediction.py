@@ -0,0 +1,99 @@
+# backend/agentic_architecture/prediction.py
+
+"""Deterministic final-exam prediction for the Prediction Agent.
+
+Implements the METHODOLOGY the agent used to carry out in free text, as
+array arithmetic over every course at once:
+
+- weighted average of the available components: quizzes 20%,
+  assignments 30%, midterm 50% (missing components drop out and the
+  remaining weights are renormalized, as in get_performance_data)
+- consistency factor from quiz/assignment consistency, mapped onto
+  [PESSIMISTIC_FACTOR, 1.0]
+- attendance below the 75% requirement scales the realistic and
+  pessimistic scores by ATTENDANCE_PENALTY
+- optimistic = base × 1.15 (max 50), realistic = base × consistency
+  factor, pessimistic = base × 0.85, where base is the weighted average
+  applied to the 50-mark final
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+FINAL_MAX = 50.0
+COMPONENT_KEYS = ("quiz_average", "assignment_average", "midterm_score")
+COMPONENT_WEIGHTS = np.array([0.2, 0.3, 0.5])
+CONSISTENCY_KEYS = ("quiz_consistency", "assignment_consistency")
+OPTIMISTIC_FACTOR = 1.15
+PESSIMISTIC_FACTOR = 0.85
+ATTENDANCE_REQUIRED = 75.0
+ATTENDANCE_PENALTY = 0.95
+
+def _column(performance: List[Dict[str, Any]], keys) -> np.ndarray:
+    """(n_courses, len(keys)) float matrix with NaN for missing values"""
+    return np.array(
+        [[p.get(key, np.nan) for key in keys] for p in performance],
+        dtype=float
+    ).reshape(len(performance), len(keys))
+
+def predict_final_scores(performance: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Prediction ranges for each get_performance_data payload, vectorized across courses"""
+    if not performance:
+        return []
+
+    components = _column(performance, COMPONENT_KEYS)
+    present = ~np.isnan(components)
+    weights = COMPONENT_WEIGHTS * present
+    weight_sum = weights.sum(axis=1)
+    has_data = weight_sum > 0
+
+    weighted_average = np.where(
+        has_data,
+        np.nansum(components * weights, axis=1) / np.where(has_data, weight_sum, 1.0),
+        np.nan
+    )
+
+    # No consistency data (single quiz/assignment) counts as fully consistent
+    consistency = _mean_ignoring_nan(_column(performance, CONSISTENCY_KEYS), default=100.0)
+    consistency_factor = PESSIMISTIC_FACTOR + (1.0 - PESSIMISTIC_FACTOR) * np.clip(consistency, 0, 100) / 100
+
+    attendance = _column(performance, ("attendance_percentage",))[:, 0]
+    attendance_factor = np.where(attendance < ATTENDANCE_REQUIRED, ATTENDANCE_PENALTY, 1.0)
+
+    base = weighted_average / 100 * FINAL_MAX
+    optimistic = np.minimum(FINAL_MAX, base * OPTIMISTIC_FACTOR)
+    realistic = np.minimum(FINAL_MAX, base * consistency_factor * attendance_factor)
+    pessimistic = np.minimum(FINAL_MAX, base * PESSIMISTIC_FACTOR * attendance_factor)
+    completeness = present.sum(axis=1)
+
+    predictions = []
+    for i, payload in enumerate(performance):
+        if not has_data[i]:
+            predictions.append({
+                "course_name": payload.get("course_name"),
+                "error": "No quiz, assignment or midterm marks yet"
+            })
+            continue
+        predictions.append({
+            "course_name": payload.get("course_name"),
+            "weighted_average": round(float(weighted_average[i]), 2),
+            "consistency_factor": round(float(consistency_factor[i]), 3),
+            "attendance_factor": float(attendance_factor[i]),
+            "final_prediction": {
+                "optimistic": round(float(optimistic[i]), 2),
+                "realistic": round(float(realistic[i]), 2),
+                "pessimistic": round(float(pessimistic[i]), 2),
+                "max_marks": FINAL_MAX
+            },
+            "confidence": ("high", "low", "medium", "high")[int(completeness[i])]
+        })
+
+    return predictions
+
+def _mean_ignoring_nan(values: np.ndarray, default: float) -> np.ndarray:
+    """Row means over non-NaN entries; ``default`` for rows with none"""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=1)
+    totals = np.where(present, values, 0.0).sum(axis=1)
+    return np.where(counts > 0, totals / np.maximum(counts, 1), default)
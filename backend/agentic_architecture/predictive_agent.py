@@ -1,11 +1,12 @@
 # backend/agents/predictive_agent.py
 
 from agents import Agent
-from .tools import get_performance_data, get_course_analysis
+from .llm import LLM_MODEL
+from .tools import get_performance_data, get_course_analysis, get_all_courses_data, get_final_predictions, get_required_finals
 
 predictive_agent = Agent(
     name="Prediction Agent",
-    model="gemini-1.5-flash",
+    model=LLM_MODEL,
     instructions="""
     You are the Academic Prediction Agent.
     
@@ -17,22 +18,30 @@ predictive_agent = Agent(
     5. Give actionable recommendations for improvement
     
     METHODOLOGY:
-    1. Calculate weighted average: Quizzes (20%), Assignments (30%), Midterm (50%)
-    2. Adjust for consistency (performance stability over time)
-    3. Consider attendance impact (regular attendance improves performance)
-    4. Provide predictions out of 50 marks for final exam
+    1. For final exam predictions call get_final_predictions: pass the course
+       name for one course, or no argument for all courses in ONE call
+    2. Do NOT recompute the numbers - the tool already applies the weighted
+       average (Quizzes 20%, Assignments 30%, Midterm 50%), the consistency
+       factor and the attendance adjustment; only explain and phrase them
+    3. For "what do I need on the final for a B+/an A?" questions call
+       get_required_finals ONCE (with target_grade if one is named); it
+       flags grades already secured and grades that are impossible
+    4. Use get_performance_data / get_all_courses_data only when you need
+       the underlying quiz, assignment or attendance details
     
-    PREDICTION RANGES:
+    PREDICTION RANGES (computed by get_final_predictions, out of 50):
     - Optimistic: Current performance × 1.15 (max 50)
     - Realistic: Current performance × consistency factor
     - Pessimistic: Current performance × 0.85
+    - If a course has "model_prediction", it comes from a model trained on
+      past students' finals: present it as the most likely score, with its
+      rmse as the typical error
     
     RESPONSE FORMAT:
-    1. Start with current performance analysis
-    2. Show calculation methodology briefly
-    3. Present prediction ranges in clear table
-    4. Include actionable recommendations
-    5. End with motivational note
+    1. Start with a one-line current performance summary
+    2. Present the prediction ranges in a clear table
+    3. Include actionable recommendations
+    4. End with motivational note
     
     IMPORTANT NOTES:
     - Final exam is worth 50 marks out of 100 total
@@ -43,5 +52,5 @@ predictive_agent = Agent(
     handoff_description="Specialist agent for academic predictions and final exam forecasting",
     
     # SIMPLE DIRECT FUNCTION REFERENCES
-    tools=[get_performance_data, get_course_analysis]
+    tools=[get_final_predictions, get_required_finals, get_performance_data, get_course_analysis, get_all_courses_data]
 )
\ No newline at end of file
@@ -0,0 +1,111 @@
+# backend/agentic_architecture/response_cache.py
+
+"""LRU/TTL cache of final agent answers.
+
+Keyed on (db_path, student_id, normalized query, data version). The data
+version is the student's row in student_data_version (migration 5),
+bumped by triggers whenever their quizzes, assignments, marks or
+attendance change. A grade change therefore produces a new key instead
+of a stale hit, and old entries simply age out of the LRU. If the
+version cannot be read (database not migrated), nothing is cached.
+
+Sizing via LMS_RESPONSE_CACHE_SIZE (0 disables) and
+LMS_RESPONSE_CACHE_TTL (seconds).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_SIZE = int(os.environ.get("LMS_RESPONSE_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.environ.get("LMS_RESPONSE_CACHE_TTL", "900"))
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace, drop trailing punctuation"""
+    return re.sub(r"[\s?.!]+$", "", " ".join(query.lower().split()))
+
+def load_data_version(db_connection, student_id: int) -> Optional[int]:
+    """Current data version for a student (0 if never changed), None if unavailable"""
+    try:
+        row = db_connection.execute(
+            "SELECT version FROM student_data_version WHERE student_id = ?", (student_id,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else 0
+
+class ResponseCache:
+    """Thread-safe LRU with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(db_path: Optional[str], student_id: int, query: str, version: int) -> Tuple:
+        return (db_path, student_id, normalize_query(query), version)
+
+    def get(self, key: Tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple, value: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring (hit_rate over all lookups so far)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+_cache = ResponseCache()
+
+def get_response_cache() -> ResponseCache:
+    """The process-wide response cache used by run_agent_query"""
+    return _cache
@@ -0,0 +1,227 @@
+# backend/agentic_architecture/semantic_cache.py
+
+"""Paraphrase-tolerant answer cache ("predict my final in physics" vs
+"what will I get in the physics final").
+
+Each answered query is stored as a hashed character n-gram (3-5) term
+vector in one preallocated NumPy matrix, with its student, database,
+data version and answer. A lookup compares the new query only with rows
+for the same (db_path, student_id, data version). Both sides are
+weighted by IDF over everything cached so far and compared by cosine.
+The best row is served if:
+
+- similarity >= SIMILARITY_THRESHOLD, and
+- both queries mention the same courses, numbers, grades, assessment
+  kinds (quiz/assignment/midterm/final/attendance) and polarity words
+  (highest/lowest, best/worst, pass/fail, not). Char n-grams alone
+  would happily match "quiz marks in physics" to "assignment marks in
+  physics" or "will I pass" to "will I fail"; the intent router cannot
+  tell those apart either, and
+- the intent router puts both in the same class.
+
+A wrong cached answer is worse than a miss, so the threshold is high
+and any difference in those words is a miss.
+
+Entries expire after the response cache TTL. Memory is bounded:
+MAX_ENTRIES rows of DIM float32 values (8 MB by default), recycled
+least-recently-used first. No network or model download is involved.
+"""
+
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+import numpy as np
+
+from .course_index import get_course_index
+from .grade_targets import normalize_grade
+from .intent_router import classify
+from .response_cache import CACHE_TTL
+
+DIM = 2048
+MAX_ENTRIES = int(os.environ.get("LMS_SEMANTIC_CACHE_SIZE", "1024"))
+SIMILARITY_THRESHOLD = float(os.environ.get("LMS_SEMANTIC_CACHE_THRESHOLD", "0.6"))
+NGRAM_SIZES = (3, 4, 5)
+
+# Words that change the answer while barely changing the n-grams: (entity kind, value, pattern)
+_ENTITY_TERMS = [
+    ("assessment", "quiz", r"quiz\w*"),
+    ("assessment", "assignment", r"assignments?"),
+    ("assessment", "midterm", r"mid\s?-?terms?"),
+    ("assessment", "final", r"finals?|end\s?-?terms?"),
+    ("assessment", "attendance", r"attendance|attend\w*|absen\w*|classes"),
+    ("polarity", "highest", r"highest|higher|top|max(?:imum)?|most"),
+    ("polarity", "lowest", r"lowest|lower|bottom|min(?:imum)?|least"),
+    ("polarity", "best", r"best|better|strongest"),
+    ("polarity", "worst", r"worst|worse|weakest"),
+    ("polarity", "pass", r"pass(?:es|ed|ing)?"),
+    ("polarity", "fail", r"fail(?:s|ed|ing|ure)?"),
+    ("polarity", "not", r"not|\w+n't|never"),
+]
+_ENTITY_PATTERNS = [(kind, value, re.compile(rf"\b(?:{pattern})\b", re.I)) for kind, value, pattern in _ENTITY_TERMS]
+
+_STOP_WORDS = {"the", "a", "an", "my", "me", "i", "please", "can", "you", "is", "are", "what", "of", "in", "for", "to"}
+
+def _text(query: str) -> str:
+    words = re.sub(r"[^a-z0-9+\- ]+", " ", query.lower()).split()
+    return " ".join(w for w in words if w not in _STOP_WORDS) or " ".join(words)
+
+def term_vector(query: str) -> np.ndarray:
+    """Sublinear term frequencies of hashed char n-grams (word-boundary padded)"""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in _text(query).split():
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(max(1, len(padded) - n + 1)):
+                vector[zlib.crc32(padded[i:i + n].encode()) % DIM] += 1.0
+    np.log1p(vector, out=vector)
+    return vector
+
+def query_entities(query: str, db_path: Optional[str] = None) -> FrozenSet[Tuple[str, Any]]:
+    """Courses, numbers, grades, assessment kinds and polarity words in the query"""
+    entities = set()
+    index = get_course_index(db_path)
+    words = re.sub(r"[^A-Za-z0-9&+\- ]+", " ", query).split()
+    lowered = [w.lower() for w in words]
+    for size in (2, 1):
+        for i in range(len(lowered) - size + 1):
+            phrase = " ".join(lowered[i:i + size])
+            if size == 1 and len(phrase) < 2:
+                continue
+            course = index.resolve(phrase, fuzzy=False)
+            if course is not None:
+                entities.add(("course", course[0]))
+    for number in re.findall(r"\d+(?:\.\d+)?", query):
+        entities.add(("number", number))
+    for word in words:
+        # Single capital letters only ("an A"), so the article "a" is ignored
+        if re.fullmatch(r"[A-D]|[A-Da-d][+-]", word):
+            grade = normalize_grade(word)
+            if grade:
+                entities.add(("grade", grade))
+    for kind, value, pattern in _ENTITY_PATTERNS:
+        if pattern.search(query):
+            entities.add((kind, value))
+    return frozenset(entities)
+
+class SemanticCache:
+    """Fixed-size matrix of past queries with LRU recycling of rows"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, threshold: float = SIMILARITY_THRESHOLD, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max(max_entries, 0), DIM), dtype=np.float32)
+        self._present = np.zeros(DIM, dtype=np.float32)   # rows containing each n-gram (for IDF)
+        self._rows: Dict[int, Dict[str, Any]] = {}          # row -> metadata
+        self._by_scope: Dict[Tuple, set] = {}               # (db_path, student_id, version) -> rows
+        self._last_used = np.zeros(max(max_entries, 0), dtype=np.int64)
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _idf(self) -> np.ndarray:
+        n = len(self._rows)
+        return np.log((1 + n) / (1 + self._present)) + 1.0
+
+    def lookup(self, db_path: Optional[str], student_id: int, version: int, query: str) -> Optional[Dict[str, Any]]:
+        """{"answer", "similarity", "matched_query"} for a close enough past query, else None"""
+        scope = (db_path, student_id, version)
+        vector = term_vector(query)
+        with self._lock:
+            rows = list(self._by_scope.get(scope, ()))
+            if not rows:
+                self.misses += 1
+                return None
+            idf = self._idf()
+            candidates = self._vectors[rows] * idf
+            candidates /= np.linalg.norm(candidates, axis=1, keepdims=True) + 1e-9
+            weighted = vector * idf
+            weighted /= np.linalg.norm(weighted) + 1e-9
+            similarities = candidates @ weighted
+            order = np.argsort(-similarities)
+            ranked = [(rows[i], float(similarities[i])) for i in order if similarities[i] >= self.threshold]
+
+        if ranked:
+            entities = query_entities(query, db_path)
+            intent = classify(query).agent
+            for row, similarity in ranked:
+                with self._lock:
+                    meta = self._rows.get(row)
+                    if meta is None or meta["scope"] != scope:
+                        continue  # recycled meanwhile
+                    if meta["expires_at"] < time.monotonic():
+                        continue
+                if meta["entities"] == entities and meta["intent"] == intent:
+                    with self._lock:
+                        self._clock += 1
+                        self._last_used[row] = self._clock
+                        self.hits += 1
+                    return {"answer": meta["answer"], "similarity": round(similarity, 4), "matched_query": meta["query"]}
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def add(self, db_path: Optional[str], student_id: int, version: int, query: str, answer: str):
+        """Remember an answer (recycling the least recently used row when full)"""
+        if not self.enabled:
+            return
+        vector = term_vector(query)
+        meta = {
+            "scope": (db_path, student_id, version),
+            "query": query,
+            "answer": answer,
+            "entities": query_entities(query, db_path),
+            "intent": classify(query).agent,
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        with self._lock:
+            if len(self._rows) < self.max_entries:
+                row = len(self._rows)
+            else:
+                row = int(self._last_used.argmin())
+                self._remove(row)
+                self.evictions += 1
+            self._vectors[row] = vector
+            self._present += vector > 0
+            self._rows[row] = meta
+            self._by_scope.setdefault(meta["scope"], set()).add(row)
+            self._clock += 1
+            self._last_used[row] = self._clock
+
+    def _remove(self, row: int):
+        meta = self._rows.pop(row)
+        self._present -= self._vectors[row] > 0
+        rows = self._by_scope[meta["scope"]]
+        rows.discard(row)
+        if not rows:
+            del self._by_scope[meta["scope"]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+_cache = SemanticCache()
+
+def get_semantic_cache() -> SemanticCache:
+    """The process-wide semantic cache used by run_agent_query"""
+    return _cache
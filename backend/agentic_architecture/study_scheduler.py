@@ -0,0 +1,144 @@
+# backend/agentic_architecture/study_scheduler.py
+
+"""Study-hour allocator and timetable for the Planner Agent.
+
+Input is the per-course output of get_course_analysis (risk_level,
+priority, recommended_hours, issues). The student's weekly budget
+(hours per day × study days) is split into half-hour blocks and handed
+out greedily:
+
+1. every course gets one block, so nothing is dropped entirely
+2. each remaining block goes to the course with the highest marginal
+   value, priority weight × DECAY ** blocks_already_given, until that
+   course reaches its recommended_hours
+3. blocks left once every course is at its recommendation stay free as
+   buffer time rather than being forced into the plan
+
+The weekly allocation is then laid out as a daily template
+(round-robin, at most one session per course per day where possible)
+and a week-by-week focus schedule ending in revision.
+"""
+
+import heapq
+from typing import Any, Dict, List
+
+BLOCK_HOURS = 0.5
+DECAY = 0.85
+PRIORITY_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+def _weight(analysis: Dict[str, Any]) -> float:
+    """Priority weight, nudged up for each issue found"""
+    return PRIORITY_WEIGHTS.get(analysis.get("priority"), 1.0) * (1 + 0.1 * len(analysis.get("issues", [])))
+
+def allocate_hours(analyses: List[Dict[str, Any]], weekly_hours: float) -> Dict[str, Any]:
+    """Greedy split of weekly_hours across courses by risk and priority"""
+    budget = int(weekly_hours / BLOCK_HOURS)
+    caps = [max(1, int(a.get("recommended_hours", 0) / BLOCK_HOURS)) for a in analyses]
+    weights = [_weight(a) for a in analyses]
+    blocks = [0] * len(analyses)
+
+    # 1. one block each, highest priority first if the budget is tiny
+    for i in sorted(range(len(analyses)), key=lambda i: -weights[i]):
+        if budget == 0:
+            break
+        blocks[i] = 1
+        budget -= 1
+
+    # 2. greedy by marginal value (max-heap via negated values)
+    heap = [(-weights[i] * DECAY ** blocks[i], i) for i in range(len(analyses)) if 0 < blocks[i] < caps[i]]
+    heapq.heapify(heap)
+    while budget > 0 and heap:
+        _, i = heapq.heappop(heap)
+        blocks[i] += 1
+        budget -= 1
+        if blocks[i] < caps[i]:
+            heapq.heappush(heap, (-weights[i] * DECAY ** blocks[i], i))
+
+    courses = []
+    for analysis, given, cap in zip(analyses, blocks, caps):
+        entry = {
+            "course_name": analysis["course_name"],
+            "priority": analysis.get("priority", "low"),
+            "weekly_hours": given * BLOCK_HOURS,
+        }
+        if given < cap:
+            entry["shortfall_hours"] = (cap - given) * BLOCK_HOURS
+        courses.append(entry)
+
+    return {"courses": courses, "buffer_hours": budget * BLOCK_HOURS}
+
+def daily_template(courses: List[Dict[str, Any]], hours_per_day: float, study_days: int) -> Dict[str, List[List[Any]]]:
+    """Spread each course's weekly hours over the study days, interleaving subjects"""
+    days = [dict() for _ in range(study_days)]
+    load = [0.0] * study_days
+
+    # Biggest allocations first so they get the widest spread
+    for course in sorted(courses, key=lambda c: -c["weekly_hours"]):
+        remaining = course["weekly_hours"]
+        sessions = min(study_days, max(1, int(remaining / BLOCK_HOURS)))
+        per_session = round(remaining / sessions / BLOCK_HOURS) * BLOCK_HOURS or BLOCK_HOURS
+
+        # Least-loaded days first, so subjects interleave instead of stacking
+        for day in sorted(range(study_days), key=lambda d: load[d]):
+            if remaining <= 0:
+                break
+            hours = min(per_session, remaining, max(hours_per_day - load[day], 0))
+            if hours <= 0:
+                continue
+            days[day][course["course_name"]] = days[day].get(course["course_name"], 0) + hours
+            load[day] += hours
+            remaining -= hours
+
+        # Rounding leftovers one block at a time to the least-loaded day with room
+        while remaining > 0:
+            open_days = [d for d in range(study_days) if hours_per_day - load[d] >= BLOCK_HOURS]
+            if not open_days:
+                break
+            day = min(open_days, key=lambda d: load[d])
+            days[day][course["course_name"]] = days[day].get(course["course_name"], 0) + BLOCK_HOURS
+            load[day] += BLOCK_HOURS
+            remaining -= BLOCK_HOURS
+
+    return {
+        DAY_NAMES[d]: [[name, hours] for name, hours in days[d].items()]
+        for d in range(study_days)
+    }
+
+def _week_focus(analysis: Dict[str, Any], week: int, weeks: int) -> str:
+    if week == weeks:
+        return "past papers and timed practice"
+    if week == weeks - 1 and weeks >= 3:
+        return "active recall and mixed practice"
+    if week == 1 and analysis.get("issues"):
+        return "fix: " + "; ".join(analysis["issues"])
+    return "weak topics" if analysis.get("risk_level") in ("high", "medium") else "review and consolidate"
+
+def build_study_plan(analyses: List[Dict[str, Any]], hours_per_day: float, weeks: int,
+                     study_days: int = 6) -> Dict[str, Any]:
+    """Weekly allocation, daily template and week-by-week focus for the given analyses"""
+    # Whole blocks only, so the daily template can hold the full allocation
+    hours_per_day = int(hours_per_day / BLOCK_HOURS) * BLOCK_HOURS
+    weekly_hours = hours_per_day * study_days
+    allocation = allocate_hours(analyses, weekly_hours)
+    by_name = {a["course_name"]: a for a in analyses}
+
+    return {
+        "hours_per_day": hours_per_day,
+        "study_days_per_week": study_days,
+        "weeks": weeks,
+        "allocation": allocation["courses"],
+        "buffer_hours_per_week": allocation["buffer_hours"],
+        "daily_template": daily_template(allocation["courses"], hours_per_day, study_days),
+        "weekly_focus": [
+            {
+                "week": week,
+                "focus": {
+                    c["course_name"]: _week_focus(by_name[c["course_name"]], week, weeks)
+                    for c in allocation["courses"]
+                    if c["weekly_hours"] > 0
+                }
+            }
+            for week in range(1, weeks + 1)
+        ],
+    }
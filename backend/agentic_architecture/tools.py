@@ -1,82 +1,239 @@
 # backend/agents/tools.py
 
+import os
 from agents import function_tool
-from typing import Dict, Any, Optional
-import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.database.async_db import run_read
+from .compact import ALL_COURSES_SCHEMA, COURSE_DATA_SCHEMA, compact_all_courses, compact_course_data
+from .context import set_context, reset_context, get_context
+from .course_index import get_course_index
+from .final_model import get_final_models, load_features
+from .grade_targets import grade_names, normalize_grade, required_finals
+from .prediction import predict_final_scores
+from .study_scheduler import build_study_plan
+
+# Set LMS_COMPACT_TOOLS=0 to give the model the full payloads (see compact.py)
+COMPACT_TOOL_OUTPUT = os.environ.get("LMS_COMPACT_TOOLS", "1") != "0"
+
+def _description(summary: str, schema: str) -> Optional[str]:
+    return f"{summary}. {schema}" if COMPACT_TOOL_OUTPUT else None
 
 # ============================================
-# GLOBAL CONTEXT (for tools to access student_id and db_connection)
+# RUN CONTEXT (per run via contextvars - see context.py)
 # ============================================
 
-_current_student_id = None
-_current_db_connection = None
+def set_tool_context(student_id: int, db_path: Optional[str] = None):
+    """Set context for the current run (db_path None = default lms.db); returns a reset token"""
+    return set_context(student_id, db_path)
 
-def set_tool_context(student_id: int, db_connection):
-    """Set global context before running agents"""
-    global _current_student_id, _current_db_connection
-    _current_student_id = student_id
-    _current_db_connection = db_connection
+def reset_tool_context(token):
+    """Undo set_tool_context once the run is finished"""
+    reset_context(token)
 
 def get_tool_context():
     """Get current context for tools"""
-    return _current_student_id, _current_db_connection
+    return get_context()
 
 # ============================================
 # TOOLS WITH SIMPLE SIGNATURES (as OpenAI Agent SDK expects)
 # ============================================
 
-@function_tool
-def get_course_data(course_name: str) -> Dict[str, Any]:
+@function_tool(description_override=_description("Get course data from database", COURSE_DATA_SCHEMA))
+async def get_course_data(course_name: str) -> Dict[str, Any]:
     """Get course data from database"""
-    student_id, db_connection = get_tool_context()
+    student_id, db_path = get_tool_context()
     
-    if not student_id or not db_connection:
+    if not student_id:
         return {"error": "Context not set. Please ask your question again."}
     
-    # Run async function synchronously (tools must be synchronous)
-    return asyncio.run(_get_course_data_async(course_name, student_id, db_connection))
+    # Async tool: the Runner awaits it on its own event loop
+    data = await _get_course_data_async(course_name, student_id, db_path)
+    return compact_course_data(data) if COMPACT_TOOL_OUTPUT else data
 
 @function_tool
-def get_performance_data(course_name: str) -> Dict[str, Any]:
+async def get_performance_data(course_name: str) -> Dict[str, Any]:
     """Get performance data for predictions"""
-    student_id, db_connection = get_tool_context()
+    student_id, db_path = get_tool_context()
     
-    if not student_id or not db_connection:
+    if not student_id:
         return {"error": "Context not set"}
     
-    return asyncio.run(_get_performance_data_async(course_name, student_id, db_connection))
+    return await _get_performance_data_async(course_name, student_id, db_path)
 
 @function_tool
-def get_course_analysis(course_name: Optional[str] = None) -> Dict[str, Any]:
+async def get_course_analysis(course_name: Optional[str] = None) -> Dict[str, Any]:
     """Get course analysis for planning"""
-    student_id, db_connection = get_tool_context()
+    student_id, db_path = get_tool_context()
     
-    if not student_id or not db_connection:
+    if not student_id:
         return {"error": "Context not set"}
     
-    return asyncio.run(_get_course_analysis_async(course_name, student_id, db_connection))
+    return await _get_course_analysis_async(course_name, student_id, db_path)
 
-# ============================================
-# ASYNC IMPLEMENTATIONS (keep your existing code here)
-# ============================================
+@function_tool(description_override=_description(
+    "Get totals and performance for every enrolled course in one call (use for overview questions)", ALL_COURSES_SCHEMA))
+async def get_all_courses_data() -> Dict[str, Any]:
+    """Get totals and performance for every enrolled course in one call (use for overview questions)"""
+    student_id, db_path = get_tool_context()
+    
+    if not student_id:
+        return {"error": "Context not set"}
+    
+    data = await _get_all_courses_data_async(student_id, db_path)
+    return compact_all_courses(data) if COMPACT_TOOL_OUTPUT else data
 
-async def _get_course_data_async(course_name: str, student_id: int, db_connection) -> Dict[str, Any]:
-    """Get course data from database (Tool for LMS Agent)"""
-    cursor = db_connection.cursor()
+@function_tool
+async def get_final_predictions(course_name: Optional[str] = None) -> Dict[str, Any]:
+    """Get optimistic/realistic/pessimistic final exam scores (out of 50) for one course, or all courses if no name is given"""
+    student_id, db_path = get_tool_context()
+    
+    if not student_id:
+        return {"error": "Context not set"}
     
-    # Get course_id
-    cursor.execute("SELECT course_id FROM courses WHERE course_name = ?", (course_name,))
-    course_result = cursor.fetchone()
+    return await _get_final_predictions_async(course_name, student_id, db_path)
+
+@function_tool
+async def get_required_finals(course_name: Optional[str] = None, target_grade: Optional[str] = None) -> Dict[str, Any]:
+    """Get final exam marks (out of 50) needed for each grade (or just target_grade, e.g. "B+"), for one course or all courses if no name is given"""
+    student_id, db_path = get_tool_context()
     
-    if not course_result:
-        return {"error": f"Course '{course_name}' not found"}
+    if not student_id:
+        return {"error": "Context not set"}
     
-    course_id = course_result[0]
+    return await _get_required_finals_async(course_name, target_grade, student_id, db_path)
+
+@function_tool
+async def get_study_plan(hours_per_day: float = 3.5, weeks: int = 5) -> Dict[str, Any]:
+    """Get a study timetable for all courses: weekly hours by risk/priority, a daily template and week-by-week focus"""
+    student_id, db_path = get_tool_context()
     
-    # Get all data
+    if not student_id:
+        return {"error": "Context not set"}
+    
+    return await _get_study_plan_async(hours_per_day, weeks, student_id, db_path)
+
+# ============================================
+# STUDENT/COURSE SNAPSHOT (one round-trip per tool call)
+# ============================================
+
+_SNAPSHOT_QUERY = """
+    SELECT 'quiz' AS kind, quiz_name AS name, marks_obtained AS obtained, max_marks, quiz_id AS row_id
+    FROM quizzes WHERE student_id = :student_id AND course_id = :course_id
+    UNION ALL
+    SELECT 'assignment', assignment_name, marks_obtained, max_marks, assignment_id
+    FROM assignments WHERE student_id = :student_id AND course_id = :course_id
+    UNION ALL
+    SELECT 'attendance', NULL, classes_attended, total_classes, attendance_id
+    FROM attendance WHERE student_id = :student_id AND course_id = :course_id
+    UNION ALL
+    SELECT 'midterm', NULL, midterm, NULL, mark_id
+    FROM marks WHERE student_id = :student_id AND course_id = :course_id
+    ORDER BY kind, name, row_id
+"""
+
+# Same rows for every course the student is enrolled in (rows in marks),
+# plus one 'course' row per course carrying its name.
+_ENROLLED_SNAPSHOTS_QUERY = """
+    WITH enrolled AS (
+        SELECT DISTINCT course_id FROM marks WHERE student_id = :student_id
+    )
+    SELECT course_id, 'course' AS kind, course_name AS name, NULL AS obtained, NULL AS max_marks, 0 AS row_id
+    FROM courses WHERE course_id IN enrolled
+    UNION ALL
+    SELECT course_id, 'quiz', quiz_name, marks_obtained, max_marks, quiz_id
+    FROM quizzes WHERE student_id = :student_id AND course_id IN enrolled
+    UNION ALL
+    SELECT course_id, 'assignment', assignment_name, marks_obtained, max_marks, assignment_id
+    FROM assignments WHERE student_id = :student_id AND course_id IN enrolled
+    UNION ALL
+    SELECT course_id, 'attendance', NULL, classes_attended, total_classes, attendance_id
+    FROM attendance WHERE student_id = :student_id AND course_id IN enrolled
+    UNION ALL
+    SELECT course_id, 'midterm', NULL, midterm, NULL, mark_id
+    FROM marks WHERE student_id = :student_id
+    ORDER BY course_id, kind, name, row_id
+"""
+
+async def _resolve_course(course_name: Optional[str], db_path: Optional[str] = None):
+    """(course_id, canonical name) from the in-memory course index, or None"""
+    return await get_course_index(db_path).resolve_async(course_name)
+
+def _course_not_found(course_name: str, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Error payload listing valid names so the model can fix its call in one go"""
+    return {
+        "error": f"Course '{course_name}' not found",
+        "available_courses": get_course_index(db_path).course_names()
+    }
+
+def _load_course_snapshot(db_connection, course_id: int, student_id: int) -> Dict[str, Any]:
+    """Fetch everything stored for one (student, course) in a single query.
+
+    Attendance and midterm keep the first row found, like the per-table
+    ``fetchone()`` lookups did.
+    """
+    cursor = db_connection.cursor()
+    cursor.execute(_SNAPSHOT_QUERY, {"student_id": student_id, "course_id": course_id})
+
+    snapshot = _empty_snapshot(course_id)
+    for kind, name, obtained, max_marks, _ in cursor.fetchall():
+        _add_snapshot_row(snapshot, kind, name, obtained, max_marks)
+
+    for row in _load_summary_analysis_rows(db_connection, student_id, course_id):
+        snapshot["summary"] = _summary_totals(row)
+
+    return snapshot
+
+def _load_enrolled_snapshots(db_connection, student_id: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """(course_name, snapshot) for every enrolled course, in one query"""
+    cursor = db_connection.cursor()
+    cursor.execute(_ENROLLED_SNAPSHOTS_QUERY, {"student_id": student_id})
+
+    courses = []
+    snapshots = {}
+    for course_id, kind, name, obtained, max_marks, _ in cursor.fetchall():
+        if course_id not in snapshots:
+            snapshots[course_id] = _empty_snapshot(course_id)
+        if kind == "course":
+            courses.append((name, snapshots[course_id]))
+        else:
+            _add_snapshot_row(snapshots[course_id], kind, name, obtained, max_marks)
+
+    for row in _load_summary_analysis_rows(db_connection, student_id):
+        if row[0] in snapshots:
+            snapshots[row[0]]["summary"] = _summary_totals(row)
+
+    return courses
+
+def _empty_snapshot(course_id: int) -> Dict[str, Any]:
+    return {
+        "course_id": course_id,
+        "quizzes": [],
+        "assignments": [],
+        "attendance": None,
+        "midterm": None,
+        "summary": None  # (quiz_total, assignment_total, current_total) from student_course_summary
+    }
+
+def _summary_totals(row) -> Tuple[float, float, float]:
+    """Totals from a _SUMMARY_ANALYSIS_QUERY row (NULL sums are 0)"""
+    return (row[4] or 0.0, row[6] or 0.0, row[9] or 0.0)
+
+def _add_snapshot_row(snapshot: Dict[str, Any], kind: str, name, obtained, max_marks):
+    if kind == "quiz":
+        snapshot["quizzes"].append((name, obtained, max_marks))
+    elif kind == "assignment":
+        snapshot["assignments"].append((name, obtained, max_marks))
+    elif kind == "attendance" and snapshot["attendance"] is None:
+        snapshot["attendance"] = (obtained, max_marks)
+    elif kind == "midterm" and snapshot["midterm"] is None:
+        snapshot["midterm"] = (obtained,)
+
+def _build_course_data(course_name: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a snapshot into the get_course_data payload"""
     data = {
         "course_name": course_name,
-        "course_id": course_id,
+        "course_id": snapshot["course_id"],
         "quizzes": [],
         "assignments": [],
         "attendance": None,
@@ -84,17 +241,10 @@ async def _get_course_data_async(course_name: str, student_id: int, db_connectio
         "totals": {}
     }
     
-    # Get quizzes
-    cursor.execute("""
-        SELECT quiz_name, marks_obtained, max_marks
-        FROM quizzes
-        WHERE student_id = ? AND course_id = ?
-        ORDER BY quiz_name
-    """, (student_id, course_id))
-    
+    # Quizzes
     quizzes = []
     quiz_total = 0
-    for quiz_name, marks_obtained, max_marks in cursor.fetchall():
+    for quiz_name, marks_obtained, max_marks in snapshot["quizzes"]:
         quiz_data = {
             "name": quiz_name,
             "marks_obtained": float(marks_obtained),
@@ -105,21 +255,16 @@ async def _get_course_data_async(course_name: str, student_id: int, db_connectio
         quiz_total += float(marks_obtained)
     
     data["quizzes"] = quizzes
+    if snapshot.get("summary"):
+        quiz_total = snapshot["summary"][0]
     data["totals"]["quiz_total"] = round(quiz_total, 2)
     data["totals"]["quiz_max"] = 10.0
     data["totals"]["quiz_percentage"] = round((quiz_total / 10) * 100, 2) if 10 > 0 else 0
     
-    # Get assignments
-    cursor.execute("""
-        SELECT assignment_name, marks_obtained, max_marks
-        FROM assignments
-        WHERE student_id = ? AND course_id = ?
-        ORDER BY assignment_name
-    """, (student_id, course_id))
-    
+    # Assignments
     assignments = []
     assign_total = 0
-    for assign_name, marks_obtained, max_marks in cursor.fetchall():
+    for assign_name, marks_obtained, max_marks in snapshot["assignments"]:
         assign_data = {
             "name": assign_name,
             "marks_obtained": float(marks_obtained),
@@ -130,18 +275,14 @@ async def _get_course_data_async(course_name: str, student_id: int, db_connectio
         assign_total += float(marks_obtained)
     
     data["assignments"] = assignments
+    if snapshot.get("summary"):
+        assign_total = snapshot["summary"][1]
     data["totals"]["assignment_total"] = round(assign_total, 2)
     data["totals"]["assignment_max"] = 20.0
     data["totals"]["assignment_percentage"] = round((assign_total / 20) * 100, 2) if 20 > 0 else 0
     
-    # Get attendance
-    cursor.execute("""
-        SELECT classes_attended, total_classes
-        FROM attendance
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    attendance = cursor.fetchone()
+    # Attendance
+    attendance = snapshot["attendance"]
     if attendance:
         attended, total = attendance
         data["attendance"] = {
@@ -150,13 +291,8 @@ async def _get_course_data_async(course_name: str, student_id: int, db_connectio
             "percentage": round((attended / total) * 100, 2) if total > 0 else 0
         }
     
-    # Get midterm
-    cursor.execute("""
-        SELECT midterm FROM marks
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    midterm_result = cursor.fetchone()
+    # Midterm
+    midterm_result = snapshot["midterm"]
     if midterm_result and midterm_result[0]:
         midterm = float(midterm_result[0])
         data["midterm"] = {
@@ -170,36 +306,21 @@ async def _get_course_data_async(course_name: str, student_id: int, db_connectio
     
     # Calculate current total
     current_total = quiz_total + assign_total + (midterm if midterm_result and midterm_result[0] else 0)
+    if snapshot.get("summary"):
+        current_total = snapshot["summary"][2]
     data["totals"]["current_total"] = round(current_total, 2)
     data["totals"]["current_max"] = 50.0
     data["totals"]["current_percentage"] = round((current_total / 50) * 100, 2) if 50 > 0 else 0
     
     return data
 
-async def _get_performance_data_async(course_name: str, student_id: int, db_connection) -> Dict[str, Any]:
-    """Get performance data for predictions (Tool for Prediction Agent)"""
-    cursor = db_connection.cursor()
-    
-    # Get course_id
-    cursor.execute("SELECT course_id FROM courses WHERE course_name = ?", (course_name,))
-    course_result = cursor.fetchone()
-    
-    if not course_result:
-        return {"error": f"Course '{course_name}' not found"}
-    
-    course_id = course_result[0]
-    
+def _build_performance_data(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a snapshot into the get_performance_data payload"""
     data = {}
     
-    # Get quizzes
-    cursor.execute("""
-        SELECT marks_obtained, max_marks
-        FROM quizzes
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
+    # Quizzes
     quiz_scores = []
-    for obtained, max_marks in cursor.fetchall():
+    for _, obtained, max_marks in snapshot["quizzes"]:
         if max_marks > 0:
             quiz_scores.append((obtained / max_marks) * 100)
     
@@ -210,15 +331,9 @@ async def _get_performance_data_async(course_name: str, student_id: int, db_conn
         data["quiz_consistency"] = round(max(0, 100 - (variance / 10)), 2)
         data["quiz_count"] = len(quiz_scores)
     
-    # Get assignments
-    cursor.execute("""
-        SELECT marks_obtained, max_marks
-        FROM assignments
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
+    # Assignments
     assign_scores = []
-    for obtained, max_marks in cursor.fetchall():
+    for _, obtained, max_marks in snapshot["assignments"]:
         if max_marks > 0:
             assign_scores.append((obtained / max_marks) * 100)
     
@@ -228,25 +343,14 @@ async def _get_performance_data_async(course_name: str, student_id: int, db_conn
         data["assignment_consistency"] = round(max(0, 100 - (variance / 10)), 2)
         data["assignment_count"] = len(assign_scores)
     
-    # Get midterm
-    cursor.execute("""
-        SELECT midterm FROM marks
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    midterm_result = cursor.fetchone()
+    # Midterm
+    midterm_result = snapshot["midterm"]
     if midterm_result and midterm_result[0]:
         data["midterm_score"] = round((midterm_result[0] / 20) * 100, 2)
         data["midterm_marks"] = round(float(midterm_result[0]), 2)
     
-    # Get attendance
-    cursor.execute("""
-        SELECT classes_attended, total_classes
-        FROM attendance
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    attendance = cursor.fetchone()
+    # Attendance
+    attendance = snapshot["attendance"]
     if attendance:
         attended, total = attendance
         data["attendance_percentage"] = round((attended / total) * 100, 2) if total > 0 else 0
@@ -276,35 +380,180 @@ async def _get_performance_data_async(course_name: str, student_id: int, db_conn
     
     return data
 
-async def _get_course_analysis_async(course_name: Optional[str] = None, student_id: int = None, db_connection = None) -> Dict[str, Any]:
-    """Get course analysis for planning (Tool for Planner Agent)"""
-    cursor = db_connection.cursor()
+# ============================================
+# ASYNC IMPLEMENTATIONS (queries run on the database thread pool)
+# ============================================
+
+async def _get_course_data_async(course_name: str, student_id: int, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Get course data from database (Tool for LMS Agent)"""
+    course = await _resolve_course(course_name, db_path)
+    
+    if not course:
+        return _course_not_found(course_name, db_path)
+    
+    course_id, course_name = course
+    snapshot = await run_read(_load_course_snapshot, course_id, student_id, db_path=db_path)
+    return _build_course_data(course_name, snapshot)
+
+async def _get_performance_data_async(course_name: str, student_id: int, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Get performance data for predictions (Tool for Prediction Agent)"""
+    course = await _resolve_course(course_name, db_path)
+    
+    if not course:
+        return _course_not_found(course_name, db_path)
+    
+    snapshot = await run_read(_load_course_snapshot, course[0], student_id, db_path=db_path)
+    return _build_performance_data(snapshot)
+
+async def _get_all_courses_data_async(student_id: int, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Totals and performance for all enrolled courses (batch tool for LMS/Prediction Agents)"""
+    snapshots = await run_read(_load_enrolled_snapshots, student_id, db_path=db_path)
+    
+    courses = []
+    for course_name, snapshot in snapshots:
+        # Per-quiz/assignment lists are left out; get_course_data has them
+        courses.append({
+            "course_name": course_name,
+            "totals": _build_course_data(course_name, snapshot)["totals"],
+            "performance": _build_performance_data(snapshot)
+        })
+    
+    return {"courses": courses}
+
+async def _get_final_predictions_async(course_name: Optional[str] = None, student_id: int = None, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Final exam prediction ranges (Tool for Prediction Agent); all enrolled courses if course_name is None"""
+    if course_name:
+        course = await _resolve_course(course_name, db_path)
+        if not course:
+            return _course_not_found(course_name, db_path)
+        snapshot = await run_read(_load_course_snapshot, course[0], student_id, db_path=db_path)
+        snapshots = [(course[1], snapshot)]
+    else:
+        snapshots = await run_read(_load_enrolled_snapshots, student_id, db_path=db_path)
+    
+    payloads = [
+        {"course_name": name, **_build_performance_data(snapshot)}
+        for name, snapshot in snapshots
+    ]
+    predictions = predict_final_scores(payloads)
+    
+    # Add the regression trained on past cohorts where one exists (final_model.py)
+    models = get_final_models(db_path)
+    await models.refresh_async()
+    course_ids = [snapshot["course_id"] for _, snapshot in snapshots]
+    if any(models.has_model(course_id) for course_id in course_ids):
+        _, feature_courses, X = await run_read(load_features, student_id, db_path=db_path)
+        scores = dict(zip(feature_courses.tolist(), models.score(feature_courses, X).tolist()))
+        for prediction, course_id in zip(predictions, course_ids):
+            score = scores.get(course_id)
+            if score is not None and score == score:  # skip NaN (no model)
+                prediction["model_prediction"] = {
+                    "final": round(score, 2),
+                    "max_marks": 50,
+                    **models.model_info(course_id)
+                }
+    
+    return {"predictions": predictions}
+
+async def _get_required_finals_async(course_name: Optional[str] = None, target_grade: Optional[str] = None,
+                                     student_id: int = None, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Final marks needed per grade band (Tool for Prediction Agent); all enrolled courses if course_name is None"""
+    grade = None
+    if target_grade:
+        grade = normalize_grade(target_grade)
+        if grade is None:
+            return {"error": f"Unknown grade '{target_grade}'", "valid_grades": grade_names()}
     
+    if course_name:
+        course = await _resolve_course(course_name, db_path)
+        if not course:
+            return _course_not_found(course_name, db_path)
+        rows = await run_read(_load_summary_analysis_rows, student_id, course[0], db_path=db_path)
+        courses = [{"course_name": course[1], "current_total": round(_summary_totals(rows[0])[2], 2) if rows else 0}]
+    else:
+        rows = await run_read(_load_summary_analysis_rows, student_id, db_path=db_path)
+        courses = [
+            {"course_name": row[1], "current_total": round(_summary_totals(row)[2], 2)}
+            for row in rows
+        ]
+    
+    return {"final_max": 50, "courses": required_finals(courses, grade)}
+
+# Per-(student, course) totals are kept current by triggers in
+# student_course_summary (migration 3), so analysis reads are primary-key
+# lookups with no aggregation at query time.
+_SUMMARY_ANALYSIS_QUERY = """
+    SELECT s.course_id, c.course_name,
+           s.classes_attended, s.total_classes,
+           s.quiz_total, s.quiz_max,
+           s.assignment_total, s.assignment_max,
+           s.midterm, s.current_total
+    FROM student_course_summary s
+    JOIN courses c ON c.course_id = s.course_id
+    WHERE s.student_id = :student_id AND {course_filter}
+    ORDER BY s.course_id
+"""
+
+def _load_summary_analysis_rows(db_connection, student_id: int, course_id: Optional[int] = None):
+    """Summary rows for one course, or for every course the student is enrolled in"""
+    cursor = db_connection.cursor()
+    if course_id is None:
+        query = _SUMMARY_ANALYSIS_QUERY.format(course_filter="s.enrolled = 1")
+    else:
+        query = _SUMMARY_ANALYSIS_QUERY.format(course_filter="s.course_id = :course_id")
+    cursor.execute(query, {"student_id": student_id, "course_id": course_id})
+    return cursor.fetchall()
+
+def _analyze_summary_row(row) -> Dict[str, Any]:
+    (_, course_name, attended, total, quiz_total, quiz_max,
+     assign_total, assign_max, midterm, _) = row
+    return _analyze_single_course(
+        course_name,
+        attendance=(attended, total) if total is not None else None,
+        quiz_sums=(quiz_total, quiz_max),
+        assignment_sums=(assign_total, assign_max),
+        midterm=midterm
+    )
+
+async def _get_course_analysis_async(course_name: Optional[str] = None, student_id: int = None, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Get course analysis for planning (Tool for Planner Agent)"""
     if course_name:
         # Single course analysis
-        cursor.execute("SELECT course_id FROM courses WHERE course_name = ?", (course_name,))
-        course_result = cursor.fetchone()
+        course = await _resolve_course(course_name, db_path)
         
-        if not course_result:
-            return {"error": f"Course '{course_name}' not found"}
+        if not course:
+            return _course_not_found(course_name, db_path)
         
-        course_id = course_result[0]
-        return await _analyze_single_course(student_id, course_id, course_name, cursor)
-    else:
-        # All courses analysis
-        cursor.execute("SELECT course_id, course_name FROM courses")
-        courses = cursor.fetchall()
+        course_id, course_name = course
+        rows = await run_read(_load_summary_analysis_rows, student_id, course_id, db_path=db_path)
+        
+        if not rows:
+            # No marks of any kind yet for this course
+            return _analyze_single_course(course_name, None, (None, None), (None, None), None)
         
-        analysis = []
-        for course_id, cname in courses:
-            course_analysis = await _analyze_single_course(student_id, course_id, cname, cursor)
-            if course_analysis:
-                analysis.append(course_analysis)
+        return _analyze_summary_row(rows[0])
+    else:
+        # All enrolled courses in one range scan of the summary table
+        rows = await run_read(_load_summary_analysis_rows, student_id, db_path=db_path)
         
-        return {"courses": analysis}
+        return {"courses": [_analyze_summary_row(row) for row in rows]}
+
+async def _get_study_plan_async(hours_per_day: float = 3.5, weeks: int = 5,
+                                student_id: int = None, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Allocated study timetable for all enrolled courses (Tool for Planner Agent)"""
+    if not 0.5 <= hours_per_day <= 12:
+        return {"error": "hours_per_day must be between 0.5 and 12"}
+    if not 1 <= weeks <= 16:
+        return {"error": "weeks must be between 1 and 16"}
+    
+    analysis = await _get_course_analysis_async(None, student_id, db_path)
+    if not analysis["courses"]:
+        return {"error": "No enrolled courses found"}
+    
+    return build_study_plan(analysis["courses"], hours_per_day, weeks)
 
-async def _analyze_single_course(student_id: int, course_id: int, course_name: str, cursor) -> Dict[str, Any]:
-    """Analyze a single course"""
+def _analyze_single_course(course_name: str, attendance, quiz_sums, assignment_sums, midterm) -> Dict[str, Any]:
+    """Analyze a single course from its aggregated marks"""
     analysis = {
         "course_name": course_name,
         "risk_level": "low",
@@ -315,13 +564,6 @@ async def _analyze_single_course(student_id: int, course_id: int, course_name: s
     }
     
     # Check attendance
-    cursor.execute("""
-        SELECT classes_attended, total_classes
-        FROM attendance
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    attendance = cursor.fetchone()
     if attendance:
         attended, total = attendance
         attendance_pct = round((attended / total) * 100, 2) if total > 0 else 0
@@ -335,35 +577,21 @@ async def _analyze_single_course(student_id: int, course_id: int, course_name: s
             analysis["strengths"].append(f"Good attendance ({attendance_pct}%)")
     
     # Check quizzes
-    cursor.execute("""
-        SELECT SUM(marks_obtained), SUM(max_marks)
-        FROM quizzes
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    quiz_result = cursor.fetchone()
-    if quiz_result and quiz_result[0] is not None and quiz_result[1]:
-        quiz_total, quiz_max = quiz_result
+    quiz_total, quiz_max = quiz_sums
+    if quiz_total is not None and quiz_max:
         quiz_pct = round((quiz_total / quiz_max) * 100, 2) if quiz_max > 0 else 0
         analysis["quiz_percentage"] = quiz_pct
         
         if quiz_pct < 60:
-            analysis["risk_level"] = "high" if analysis["risk_level"] != "high" else "high"
+            analysis["risk_level"] = "high"
             analysis["recommended_hours"] += 2
             analysis["issues"].append(f"Poor quiz performance ({quiz_pct}%)")
         elif quiz_pct >= 80:
             analysis["strengths"].append(f"Strong quiz performance ({quiz_pct}%)")
     
     # Check assignments
-    cursor.execute("""
-        SELECT SUM(marks_obtained), SUM(max_marks)
-        FROM assignments
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    assign_result = cursor.fetchone()
-    if assign_result and assign_result[0] is not None and assign_result[1]:
-        assign_total, assign_max = assign_result
+    assign_total, assign_max = assignment_sums
+    if assign_total is not None and assign_max:
         assign_pct = round((assign_total / assign_max) * 100, 2) if assign_max > 0 else 0
         analysis["assignment_percentage"] = assign_pct
         
@@ -375,14 +603,8 @@ async def _analyze_single_course(student_id: int, course_id: int, course_name: s
             analysis["strengths"].append(f"Strong assignment performance ({assign_pct}%)")
     
     # Check midterm
-    cursor.execute("""
-        SELECT midterm FROM marks
-        WHERE student_id = ? AND course_id = ?
-    """, (student_id, course_id))
-    
-    midterm_result = cursor.fetchone()
-    if midterm_result and midterm_result[0]:
-        midterm_pct = round((midterm_result[0] / 20) * 100, 2)
+    if midterm:
+        midterm_pct = round((midterm / 20) * 100, 2)
         analysis["midterm_percentage"] = midterm_pct
         
         if midterm_pct < 50:
@@ -1,13 +1,14 @@
 # backend/agents/triage_agent.py
 
 from agents import Agent
+from .llm import LLM_MODEL
 from .lms_agent import lms_agent
 from .predictive_agent import predictive_agent
 from .planner_agent import planner_agent
 
 triage_agent = Agent(
     name="Academic AI Companion",
-    model="gemini-1.5-flash",
+    model=LLM_MODEL,
     instructions="""
     You are the Primary Academic AI Companion - the student's main interface.
     
@@ -48,6 +49,7 @@ triage_agent = Agent(
     - "Create a study plan for Programming" → Planner Agent
     - "How did I do in Assignment 3?" → LMS Agent
     - "What grade can I expect in Functional English?" → Prediction Agent
+    - "What do I need on the final to get a B+?" → Prediction Agent
     - "I need a rescue plan for Calculus" → Planner Agent
     
     FALLBACK HANDLING:
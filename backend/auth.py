@@ -1,14 +1,19 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import sqlite3
 import bcrypt
 import os
+import sys
 
 app = Flask(__name__)
 CORS(app)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "database", "lms.db")
 
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import get_read_connection
+
 @app.route("/login", methods=["POST"])
 def login():
     data = request.json
@@ -16,7 +21,8 @@ def login():
     reg = data.get("registration_no")
     password = data.get("password")
     print("Registration No:", reg, "Password entered:", password)  # <-- debug
-    conn = sqlite3.connect(DB_PATH)
+    # Cached per worker thread; never closed here
+    conn = get_read_connection(DB_PATH)
     cur = conn.cursor()
 
     cur.execute("SELECT student_id, password_hash, registration_no FROM students WHERE registration_no = ?", (reg,))
@@ -24,8 +30,6 @@ def login():
 
     print("DB row fetched:", row)  # <-- debug
 
-    conn.close()
-
     if row:
         stored_hash = row[1]
         print("Stored hash type:", type(stored_hash), stored_hash)
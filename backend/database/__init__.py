@@ -0,0 +1,11 @@
+# backend/database/__init__.py
+
+from .connection import (
+    DB_PATH,
+    close_thread_connections,
+    connect,
+    get_connection,
+    get_read_connection,
+)
+from .migrations import MIGRATIONS, apply_migrations, current_version, rebuild_summary
+from .async_db import run_read
@@ -1,11 +1,16 @@
-import sqlite3
 import os
 import random
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "lms.db")
 
-conn = sqlite3.connect(DB_PATH)
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import connect
+
+conn = connect(DB_PATH)
 cur = conn.cursor()
 
 # Fetch all students
@@ -21,8 +26,9 @@ for student_id, reg_no in students:
     for course_id in courses:
         # Add ONLY midterm marks (final is NULL/not yet)
         cur.execute("""
-        INSERT OR REPLACE INTO marks (student_id, course_id, midterm)
+        INSERT INTO marks (student_id, course_id, midterm)
         VALUES (?, ?, ?)
+        ON CONFLICT(student_id, course_id) DO UPDATE SET midterm = excluded.midterm
         """, (
             student_id, course_id, 
             random.uniform(12, 20)  # midterm out of 20
@@ -1,9 +1,15 @@
-import sqlite3, os
+import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "lms.db")
 
-conn = sqlite3.connect(DB_PATH)
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import connect
+
+conn = connect(DB_PATH)
 cur = conn.cursor()
 
 # student_id
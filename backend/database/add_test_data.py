@@ -1,10 +1,15 @@
-import sqlite3
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "lms.db")
 
-conn = sqlite3.connect(DB_PATH)
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import connect
+
+conn = connect(DB_PATH)
 cur = conn.cursor()
 
 # Add courses
@@ -19,8 +24,9 @@ student_id = cur.fetchone()[0]
 # Add ONLY midterm marks for this student (final is NULL/not yet)
 for course_id in range(1, 5):
     cur.execute("""
-    INSERT OR REPLACE INTO marks (student_id, course_id, midterm)
+    INSERT INTO marks (student_id, course_id, midterm)
     VALUES (?, ?, ?)
+    ON CONFLICT(student_id, course_id) DO UPDATE SET midterm = excluded.midterm
     """, (student_id, course_id, 15))  # Only midterm, final is NULL
 
 # Add quiz marks for this student (4 quizzes per course, each out of 2.5)
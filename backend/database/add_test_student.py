@@ -1,13 +1,18 @@
-import sqlite3
 import bcrypt
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "lms.db")
 
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import connect
+
 password = bcrypt.hashpw("1234".encode(), bcrypt.gensalt())
 
-conn = sqlite3.connect(DB_PATH)
+conn = connect(DB_PATH)
 cur = conn.cursor()
 
 cur.execute("""
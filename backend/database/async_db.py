@@ -0,0 +1,35 @@
+# backend/database/async_db.py
+
+"""Non-blocking database access for coroutines.
+
+sqlite3 calls block, so running them inside a coroutine stalls every other
+task on the loop (including LLM HTTP calls). ``run_read`` ships a plain
+function to a bounded thread pool instead; each pool thread uses its own
+cached read-only connection from ``connection.get_read_connection``.
+``submit_read`` queues the same work from synchronous code without
+waiting for it.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from .connection import get_read_connection
+
+DB_WORKERS = int(os.environ.get("LMS_DB_WORKERS", "8"))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="lms-db")
+
+def _call(fn: Callable[..., Any], db_path: Optional[str], args, kwargs):
+    return fn(get_read_connection(db_path), *args, **kwargs)
+
+async def run_read(fn: Callable[..., Any], *args, db_path: Optional[str] = None, **kwargs) -> Any:
+    """Await ``fn(connection, *args, **kwargs)`` on a pool thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(_call, fn, db_path, args, kwargs))
+
+def submit_read(fn: Callable[..., Any], *args, db_path: Optional[str] = None, **kwargs) -> Future:
+    """Queue ``fn(connection, *args, **kwargs)`` on the pool and return its Future without waiting"""
+    return _executor.submit(_call, fn, db_path, args, kwargs)
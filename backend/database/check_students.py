@@ -1,6 +1,12 @@
-import sqlite3
+import os
+import sys
 
-conn = sqlite3.connect("backend/database/lms.db")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import DB_PATH, connect
+
+conn = connect(DB_PATH, readonly=True)
 cur = conn.cursor()
 
 cur.execute("SELECT registration_no, name FROM students")
@@ -0,0 +1,122 @@
+# backend/database/connection.py
+
+"""Shared SQLite connection manager.
+
+Every connection gets the same pragmas (busy timeout, NORMAL sync, page
+cache, mmap) and the database is switched to WAL once per process, so
+readers never block the writer. Pending schema migrations are applied on
+the first connection to each database too, so every entry point (agents,
+Chainlit, scripts) sees the tables the query paths expect, not only the
+ones that ran init_db.py or the dashboard. ``get_connection`` caches one connection
+per thread and mode; sqlite3 connections must not cross threads, so code
+that hops threads should ask for its own instead of passing one along.
+"""
+
+import os
+import sqlite3
+import threading
+import warnings
+from pathlib import Path
+from typing import Optional
+
+from .migrations import apply_migrations
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("LMS_DB_PATH", os.path.join(BASE_DIR, "lms.db"))
+
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KIB = 32 * 1024          # negative cache_size is KiB per connection
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+# Set LMS_AUTO_MIGRATE=0 to leave schema changes to migrations.py / init_db.py
+AUTO_MIGRATE = os.environ.get("LMS_AUTO_MIGRATE", "1") != "0"
+
+_local = threading.local()
+_wal_lock = threading.Lock()
+_wal_ready = set()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+def _ensure_wal(db_path: str):
+    """Switch the database file to WAL (persistent, so done once per process)"""
+    with _wal_lock:
+        if db_path in _wal_ready:
+            return
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError:
+            # Read-only file or locked by a long writer: keep the current mode
+            pass
+        finally:
+            conn.close()
+        _wal_ready.add(db_path)
+
+def _ensure_schema(db_path: str):
+    """Apply pending migrations once per process (safe against concurrent migrators)"""
+    if not AUTO_MIGRATE or db_path in _schema_ready:
+        return
+    with _schema_lock:
+        if db_path in _schema_ready:
+            return
+        try:
+            apply_migrations(db_path)
+        except sqlite3.Error as e:
+            # Read-only file, say: queries that need newer tables will fail loudly
+            warnings.warn(f"Could not apply migrations to {db_path}: {e}")
+        _schema_ready.add(db_path)
+
+def _configure(conn: sqlite3.Connection, readonly: bool):
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+
+# ============================================
+# CONNECTIONS
+# ============================================
+
+def connect(db_path: Optional[str] = None, readonly: bool = False) -> sqlite3.Connection:
+    """Open a new configured connection; the caller owns and closes it"""
+    db_path = os.path.abspath(db_path or DB_PATH)
+    _ensure_wal(db_path)
+    _ensure_schema(db_path)
+
+    if readonly:
+        uri = Path(db_path).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    else:
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+
+    _configure(conn, readonly)
+    return conn
+
+def get_connection(db_path: Optional[str] = None, readonly: bool = False) -> sqlite3.Connection:
+    """Per-thread cached connection. Do not close it; it lives with the thread."""
+    db_path = os.path.abspath(db_path or DB_PATH)
+    cache = getattr(_local, "connections", None)
+    if cache is None:
+        cache = _local.connections = {}
+
+    key = (db_path, readonly)
+    conn = cache.get(key)
+    if conn is None:
+        conn = cache[key] = connect(db_path, readonly=readonly)
+    return conn
+
+def get_read_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """Per-thread cached read-only connection for query paths"""
+    return get_connection(db_path, readonly=True)
+
+def close_thread_connections():
+    """Close every cached connection owned by the calling thread"""
+    cache = getattr(_local, "connections", None) or {}
+    for conn in cache.values():
+        conn.close()
+    cache.clear()
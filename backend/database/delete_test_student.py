@@ -1,6 +1,12 @@
-import sqlite3
+import os
+import sys
 
-conn = sqlite3.connect("backend/database/lms.db")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.connection import DB_PATH, connect
+
+conn = connect(DB_PATH)
 cur = conn.cursor()
 
 cur.execute("DELETE FROM students WHERE registration_no = ?", ("2021-CS-001",))
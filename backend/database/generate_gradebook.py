@@ -0,0 +1,270 @@
+# backend/database/generate_gradebook.py
+
+"""Seeded synthetic gradebook at production scale.
+
+Builds a fresh, fully migrated database with students, departments,
+courses, enrollments (one marks row per student and course), quizzes,
+assignments, attendance, midterms and, for a historic cohort, final
+exam marks. All values are drawn with NumPy in one pass from a small
+latent model, so the data looks like a real cohort rather than
+independent uniforms:
+
+- each student has an ability, each course a difficulty
+- quiz, assignment and midterm percentages follow a logistic of
+  ability minus difficulty, plus per-item noise
+- attendance follows ability, and some students fall below 75%
+- historic finals (out of 50) are a weighted mix of the components
+  plus noise, which gives final_model.py something to learn
+
+Maxima follow the seed scripts: quizzes share 10 marks, assignments 20,
+midterm 20, final 50. Rows go in with executemany inside one
+transaction. The summary and version triggers are dropped for the load,
+then recreated, and student_course_summary is rebuilt once. The same
+seed and arguments always give the same database.
+
+Usage:
+    python backend/database/generate_gradebook.py --db /tmp/lms_big.db \\
+        [--students 20000] [--courses 60] [--courses-per-student 6] [--seed 42] [--overwrite] [--train]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List
+
+import bcrypt
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.database.migrations import (
+    REBUILD_SUMMARY,
+    apply_migrations,
+    drop_summary_trigger_statements,
+    drop_version_trigger_statements,
+    summary_trigger_statements,
+    version_trigger_statements
+)
+
+QUIZ_TOTAL = 10.0
+ASSIGNMENT_TOTAL = 20.0
+MIDTERM_MAX = 20.0
+FINAL_MAX = 50.0
+
+DEPARTMENTS = ["CS", "SE", "EE", "EC", "ME", "CE", "BBA", "MTH", "PHY", "ENG"]
+
+_SUBJECTS = [
+    "Calculus", "Physics", "Programming", "Functional English", "Data Structures",
+    "Operating Systems", "Linear Algebra", "Economics", "Discrete Mathematics", "Databases",
+    "Computer Networks", "Digital Logic", "Statistics", "Software Engineering", "Algorithms",
+    "Circuit Analysis", "Thermodynamics", "Technical Writing", "Artificial Intelligence", "Signals and Systems",
+    "Microprocessors", "Islamic Studies", "Pakistan Studies", "Accounting", "Marketing",
+]
+_LEVELS = ["", " II", " III", " IV"]
+
+_FIRST_NAMES = [
+    "Ayesha", "Ali", "Fatima", "Hamza", "Zainab", "Usman", "Hira", "Bilal", "Maryam", "Saad",
+    "Iqra", "Omar", "Sana", "Hassan", "Amna", "Fahad", "Noor", "Talha", "Mahnoor", "Danish",
+    "Alice", "Bob", "Charlie", "Humna", "Hajra", "Imran", "Kiran", "Rehan", "Laiba", "Yasir",
+]
+_LAST_NAMES = [
+    "Khan", "Ahmed", "Malik", "Hussain", "Raza", "Iqbal", "Sheikh", "Butt", "Chaudhry", "Qureshi",
+    "Siddiqui", "Farooq", "Javed", "Aslam", "Mirza", "Lee", "Imran", "Anwar", "Rashid", "Saleem",
+]
+
+def course_names(n: int) -> List[str]:
+    """n distinct course names ("Calculus", ..., "Calculus II", ...)"""
+    names = [subject + level for level in _LEVELS for subject in _SUBJECTS]
+    while len(names) < n:
+        names.append(f"Elective {len(names) - len(_SUBJECTS) * len(_LEVELS) + 1}")
+    return names[:n]
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+# ============================================
+# GENERATION (NumPy, no per-row Python logic)
+# ============================================
+
+def generate(students: int, courses: int, courses_per_student: int, quizzes: int, assignments: int,
+             historic_fraction: float, seed: int) -> Dict[str, np.ndarray]:
+    """Column arrays for every table (ids start at 1)"""
+    rng = np.random.default_rng(seed)
+    per_student = min(courses_per_student, courses)
+
+    student_ids = np.arange(1, students + 1)
+    ability = rng.normal(0.0, 1.0, students)
+    difficulty = rng.normal(0.0, 0.6, courses)
+    historic = rng.random(students) < historic_fraction
+    semester = np.where(historic, 8, rng.integers(1, 9, students))
+    department = rng.integers(0, len(DEPARTMENTS), students)
+
+    # Enrollments: per_student distinct courses per student
+    choice = np.argsort(rng.random((students, courses)), axis=1)[:, :per_student]
+    choice.sort(axis=1)
+    enroll_student = np.repeat(student_ids, per_student)
+    enroll_course = choice.ravel() + 1
+    n = len(enroll_student)
+    skill = 1.0 + 0.9 * ability[enroll_student - 1] - difficulty[enroll_course - 1]
+
+    quiz_pct = _sigmoid(skill[:, None] + 0.2 + rng.normal(0.0, 0.7, (n, quizzes)))
+    assignment_pct = _sigmoid(skill[:, None] + 0.6 + rng.normal(0.0, 0.5, (n, assignments)))
+    midterm_pct = _sigmoid(skill + rng.normal(0.0, 0.5, n))
+
+    total_classes = rng.integers(28, 33, n)
+    attend_rate = _sigmoid(1.8 + 0.6 * ability[enroll_student - 1] + rng.normal(0.0, 0.6, n))
+    attended = rng.binomial(total_classes, attend_rate)
+
+    final_pct = (0.15 * quiz_pct.mean(axis=1) + 0.2 * assignment_pct.mean(axis=1) + 0.45 * midterm_pct
+                 + 0.2 * attended / total_classes + rng.normal(0.0, 0.06, n))
+    final = np.where(historic[enroll_student - 1], np.clip(final_pct, 0.0, 1.0) * FINAL_MAX, np.nan)
+
+    return {
+        "student_ids": student_ids,
+        "semester": semester,
+        "department": department,
+        "enroll_student": enroll_student,
+        "enroll_course": enroll_course,
+        "quiz_marks": np.round(quiz_pct * (QUIZ_TOTAL / quizzes), 2),
+        "assignment_marks": np.round(assignment_pct * (ASSIGNMENT_TOTAL / assignments), 2),
+        "midterm": np.round(midterm_pct * MIDTERM_MAX, 2),
+        "total_classes": total_classes,
+        "attended": attended,
+        "final": np.round(final, 2),
+        "name_index": rng.integers(0, len(_FIRST_NAMES) * len(_LAST_NAMES), students),
+    }
+
+def _item_rows(enroll_student, enroll_course, marks: np.ndarray, label: str, max_marks: float):
+    """(student_id, course_id, name, marks, max) rows for an enrollments × items matrix"""
+    n, items = marks.shape
+    names = [f"{label} {i}" for i in range(1, items + 1)]
+    return zip(
+        np.repeat(enroll_student, items).tolist(),
+        np.repeat(enroll_course, items).tolist(),
+        names * n,
+        marks.ravel().tolist(),
+        [max_marks] * (n * items),
+    )
+
+# ============================================
+# LOADING
+# ============================================
+
+def load(db_path: str, data: Dict[str, np.ndarray], courses: int, password: str) -> Dict[str, int]:
+    """Insert everything in one transaction; returns row counts"""
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    counts = {}
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in drop_summary_trigger_statements() + drop_version_trigger_statements():
+                conn.execute(statement)
+
+            # One bcrypt hash shared by every generated account (20k hashes would take minutes)
+            password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+            year = 2025 - (data["semester"] - 1) // 2
+            students = [
+                (int(sid), f"{int(y)}-{DEPARTMENTS[d]}-{int(sid):05d}",
+                 f"{_FIRST_NAMES[k // len(_LAST_NAMES)]} {_LAST_NAMES[k % len(_LAST_NAMES)]}",
+                 password_hash, int(sem), DEPARTMENTS[d])
+                for sid, y, d, k, sem in zip(data["student_ids"], year, data["department"],
+                                             data["name_index"], data["semester"])
+            ]
+            conn.executemany(
+                "INSERT INTO students (student_id, registration_no, name, password_hash, semester, department) "
+                "VALUES (?, ?, ?, ?, ?, ?)", students)
+            counts["students"] = len(students)
+
+            conn.executemany("INSERT INTO courses (course_id, course_name) VALUES (?, ?)",
+                             list(enumerate(course_names(courses), start=1)))
+            counts["courses"] = courses
+
+            es, ec = data["enroll_student"], data["enroll_course"]
+            finals = [None if np.isnan(f) else f for f in data["final"].tolist()]
+            conn.executemany("INSERT INTO marks (student_id, course_id, midterm, final) VALUES (?, ?, ?, ?)",
+                             zip(es.tolist(), ec.tolist(), data["midterm"].tolist(), finals))
+            counts["marks"] = len(es)
+            counts["historic_finals"] = int(np.count_nonzero(~np.isnan(data["final"])))
+
+            conn.executemany(
+                "INSERT INTO attendance (student_id, course_id, classes_attended, total_classes) VALUES (?, ?, ?, ?)",
+                zip(es.tolist(), ec.tolist(), data["attended"].tolist(), data["total_classes"].tolist()))
+            counts["attendance"] = len(es)
+
+            quizzes, assignments = data["quiz_marks"], data["assignment_marks"]
+            conn.executemany(
+                "INSERT INTO quizzes (student_id, course_id, quiz_name, marks_obtained, max_marks) VALUES (?, ?, ?, ?, ?)",
+                _item_rows(es, ec, quizzes, "Quiz", QUIZ_TOTAL / quizzes.shape[1]))
+            counts["quizzes"] = quizzes.size
+            conn.executemany(
+                "INSERT INTO assignments (student_id, course_id, assignment_name, marks_obtained, max_marks) "
+                "VALUES (?, ?, ?, ?, ?)",
+                _item_rows(es, ec, assignments, "Assignment", ASSIGNMENT_TOTAL / assignments.shape[1]))
+            counts["assignments"] = assignments.size
+
+            for statement in summary_trigger_statements() + version_trigger_statements():
+                conn.execute(statement)
+            for statement in REBUILD_SUMMARY:
+                conn.execute(statement)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return counts
+
+def _remove_database(db_path: str):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic gradebook database")
+    parser.add_argument("--db", required=True, help="database file to create")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=60)
+    parser.add_argument("--courses-per-student", type=int, default=6)
+    parser.add_argument("--quizzes", type=int, default=4, help="quizzes per course (sharing 10 marks)")
+    parser.add_argument("--assignments", type=int, default=4, help="assignments per course (sharing 20 marks)")
+    parser.add_argument("--historic-fraction", type=float, default=0.3, help="students with final marks (past cohort)")
+    parser.add_argument("--password", default="1234", help="password for every generated account")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--overwrite", action="store_true", help="replace an existing database file")
+    parser.add_argument("--train", action="store_true", help="train the final-exam models afterwards")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        if not args.overwrite:
+            parser.error(f"{args.db} exists (use --overwrite to replace it)")
+        _remove_database(args.db)
+
+    start = time.perf_counter()
+    apply_migrations(args.db)
+    data = generate(args.students, args.courses, args.courses_per_student, args.quizzes, args.assignments,
+                    args.historic_fraction, args.seed)
+    generated = time.perf_counter()
+    counts = load(args.db, data, args.courses, args.password)
+    loaded = time.perf_counter()
+
+    print(f"✅ Generated {args.db} (seed {args.seed})")
+    for table, count in counts.items():
+        print(f"   {table:<16} {count:>10,}")
+    print(f"   generate {generated - start:.2f}s, load + summary rebuild {loaded - generated:.2f}s")
+
+    if args.train:
+        from backend.agentic_architecture.final_model import train
+        models = train(args.db)
+        pooled = models.get(0, {})
+        print(f"✅ Trained {len(models)} final-exam models (pooled RMSE {pooled.get('rmse', float('nan')):.2f})")
+
+if __name__ == "__main__":
+    main()
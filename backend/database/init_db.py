@@ -1,86 +1,18 @@
-import sqlite3
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "lms.db")
 
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
-# Students table
-cur.execute("""
-CREATE TABLE IF NOT EXISTS students (
-    student_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    registration_no TEXT UNIQUE,
-    name TEXT,
-    password_hash BLOB,
-    semester INTEGER,
-    department TEXT
-)
-""")
+from backend.database.connection import DB_PATH  # honours LMS_DB_PATH
+from backend.database.migrations import apply_migrations
 
-# Courses table
-cur.execute("""
-CREATE TABLE IF NOT EXISTS courses (
-    course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    course_name TEXT UNIQUE
-)
-""")
+# Tables, unique keys and indexes are defined as versioned migrations in
+# migrations.py; running them on an existing database is safe.
+applied = apply_migrations(DB_PATH)
 
-# Quizzes table - NEW TABLE for separate quiz marks
-cur.execute("""
-CREATE TABLE IF NOT EXISTS quizzes (
-    quiz_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER,
-    course_id INTEGER,
-    quiz_name TEXT,
-    marks_obtained REAL,
-    max_marks REAL,
-    FOREIGN KEY(student_id) REFERENCES students(student_id),
-    FOREIGN KEY(course_id) REFERENCES courses(course_id)
-)
-""")
-
-# Assignments table - NEW TABLE for separate assignment marks
-cur.execute("""
-CREATE TABLE IF NOT EXISTS assignments (
-    assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER,
-    course_id INTEGER,
-    assignment_name TEXT,
-    marks_obtained REAL,
-    max_marks REAL,
-    FOREIGN KEY(student_id) REFERENCES students(student_id),
-    FOREIGN KEY(course_id) REFERENCES courses(course_id)
-)
-""")
-
-# Marks table - for midterm and final (final will be NULL until predicted)
-cur.execute("""
-CREATE TABLE IF NOT EXISTS marks (
-    mark_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER,
-    course_id INTEGER,
-    midterm REAL,
-    final REAL,
-    FOREIGN KEY(student_id) REFERENCES students(student_id),
-    FOREIGN KEY(course_id) REFERENCES courses(course_id)
-)
-""")
-
-# Attendance table
-cur.execute("""
-CREATE TABLE IF NOT EXISTS attendance (
-    attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER,
-    course_id INTEGER,
-    classes_attended INTEGER,
-    total_classes INTEGER,
-    FOREIGN KEY(student_id) REFERENCES students(student_id),
-    FOREIGN KEY(course_id) REFERENCES courses(course_id)
-)
-""")
-
-conn.commit()
-conn.close()
-print("Database initialized at:", DB_PATH)
\ No newline at end of file
+print("Database initialized at:", DB_PATH)
+if applied:
+    print("Applied migrations:", applied)
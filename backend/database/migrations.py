@@ -0,0 +1,411 @@
+# backend/database/migrations.py
+
+"""Versioned schema migrations for lms.db.
+
+Each migration runs in its own ``BEGIN IMMEDIATE`` transaction together with
+its ``schema_version`` row, so it is safe to apply to a live database: the
+write lock waits out other writers, readers keep working, and a migration
+either lands completely or not at all.
+
+Usage:
+    python backend/database/migrations.py [--db PATH] [--status] [--rebuild-summary]
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import List, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("LMS_DB_PATH", os.path.join(BASE_DIR, "lms.db"))
+
+# ============================================
+# MIGRATIONS (append only - never edit a released entry)
+# ============================================
+
+_BASELINE_SCHEMA = [
+    # Students table
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        registration_no TEXT UNIQUE,
+        name TEXT,
+        password_hash BLOB,
+        semester INTEGER,
+        department TEXT
+    )
+    """,
+    # Courses table
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_name TEXT UNIQUE
+    )
+    """,
+    # Quizzes table
+    """
+    CREATE TABLE IF NOT EXISTS quizzes (
+        quiz_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        course_id INTEGER,
+        quiz_name TEXT,
+        marks_obtained REAL,
+        max_marks REAL,
+        FOREIGN KEY(student_id) REFERENCES students(student_id),
+        FOREIGN KEY(course_id) REFERENCES courses(course_id)
+    )
+    """,
+    # Assignments table
+    """
+    CREATE TABLE IF NOT EXISTS assignments (
+        assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        course_id INTEGER,
+        assignment_name TEXT,
+        marks_obtained REAL,
+        max_marks REAL,
+        FOREIGN KEY(student_id) REFERENCES students(student_id),
+        FOREIGN KEY(course_id) REFERENCES courses(course_id)
+    )
+    """,
+    # Marks table - midterm and final (final stays NULL until known)
+    """
+    CREATE TABLE IF NOT EXISTS marks (
+        mark_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        course_id INTEGER,
+        midterm REAL,
+        final REAL,
+        FOREIGN KEY(student_id) REFERENCES students(student_id),
+        FOREIGN KEY(course_id) REFERENCES courses(course_id)
+    )
+    """,
+    # Attendance table
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        course_id INTEGER,
+        classes_attended INTEGER,
+        total_classes INTEGER,
+        FOREIGN KEY(student_id) REFERENCES students(student_id),
+        FOREIGN KEY(course_id) REFERENCES courses(course_id)
+    )
+    """,
+]
+
+# Without a unique key, the seed scripts' INSERT OR REPLACE appended
+# duplicates. Keep the newest row of each group (what REPLACE meant), then
+# add the keys so later writes really replace.
+_UNIQUE_GRADEBOOK_KEYS = [
+    """
+    DELETE FROM quizzes WHERE quiz_id NOT IN (
+        SELECT MAX(quiz_id) FROM quizzes GROUP BY student_id, course_id, quiz_name
+    )
+    """,
+    """
+    DELETE FROM assignments WHERE assignment_id NOT IN (
+        SELECT MAX(assignment_id) FROM assignments GROUP BY student_id, course_id, assignment_name
+    )
+    """,
+    """
+    DELETE FROM marks WHERE mark_id NOT IN (
+        SELECT MAX(mark_id) FROM marks GROUP BY student_id, course_id
+    )
+    """,
+    """
+    DELETE FROM attendance WHERE attendance_id NOT IN (
+        SELECT MAX(attendance_id) FROM attendance GROUP BY student_id, course_id
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_quizzes_student_course_name ON quizzes (student_id, course_id, quiz_name)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_assignments_student_course_name ON assignments (student_id, course_id, assignment_name)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_marks_student_course ON marks (student_id, course_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_attendance_student_course ON attendance (student_id, course_id)",
+    "ANALYZE",
+]
+
+# One row per (student, course) with every total the read paths need, kept
+# current by triggers on the four gradebook tables. Attendance and midterm
+# come from the first row, like the tools' fetchone() lookups.
+_SUMMARY_COLUMNS = """
+    student_id, course_id, enrolled,
+    quiz_total, quiz_max, quiz_count,
+    assignment_total, assignment_max, assignment_count,
+    midterm, classes_attended, total_classes, current_total
+"""
+
+_SUMMARY_SELECT = """
+    SELECT k.student_id, k.course_id,
+           EXISTS (SELECT 1 FROM marks WHERE student_id = k.student_id AND course_id = k.course_id),
+           q.total, q.max_marks, q.n,
+           a.total, a.max_marks, a.n,
+           m.midterm, att.classes_attended, att.total_classes,
+           COALESCE(q.total, 0) + COALESCE(a.total, 0) + COALESCE(m.midterm, 0)
+    FROM {keys} k
+    LEFT JOIN (
+        SELECT student_id, course_id, SUM(marks_obtained) AS total, SUM(max_marks) AS max_marks, COUNT(*) AS n
+        FROM quizzes {where} GROUP BY student_id, course_id
+    ) q ON q.student_id = k.student_id AND q.course_id = k.course_id
+    LEFT JOIN (
+        SELECT student_id, course_id, SUM(marks_obtained) AS total, SUM(max_marks) AS max_marks, COUNT(*) AS n
+        FROM assignments {where} GROUP BY student_id, course_id
+    ) a ON a.student_id = k.student_id AND a.course_id = k.course_id
+    LEFT JOIN (
+        SELECT student_id, course_id, midterm, MIN(mark_id)
+        FROM marks {where} GROUP BY student_id, course_id
+    ) m ON m.student_id = k.student_id AND m.course_id = k.course_id
+    LEFT JOIN (
+        SELECT student_id, course_id, classes_attended, total_classes, MIN(attendance_id)
+        FROM attendance {where} GROUP BY student_id, course_id
+    ) att ON att.student_id = k.student_id AND att.course_id = k.course_id
+"""
+
+_SUMMARY_ALL_KEYS = """(
+        SELECT student_id, course_id FROM quizzes
+        UNION SELECT student_id, course_id FROM assignments
+        UNION SELECT student_id, course_id FROM marks
+        UNION SELECT student_id, course_id FROM attendance
+    )"""
+
+SUMMARY_TABLES = ("quizzes", "assignments", "marks", "attendance")
+
+def _summary_refresh_sql(row: str) -> str:
+    """Trigger body recomputing the summary row for row.student_id/row.course_id"""
+    keys = f"(SELECT {row}.student_id AS student_id, {row}.course_id AS course_id)"
+    where = f"WHERE student_id = {row}.student_id AND course_id = {row}.course_id"
+    return f"""
+        DELETE FROM student_course_summary
+        WHERE student_id = {row}.student_id AND course_id = {row}.course_id;
+        INSERT INTO student_course_summary ({_SUMMARY_COLUMNS})
+        {_SUMMARY_SELECT.format(keys=keys, where=where)}
+        WHERE q.n IS NOT NULL OR a.n IS NOT NULL OR m.course_id IS NOT NULL OR att.course_id IS NOT NULL;
+    """
+
+def summary_trigger_statements() -> List[str]:
+    """CREATE TRIGGER statements keeping student_course_summary current"""
+    statements = []
+    for table in SUMMARY_TABLES:
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_insert AFTER INSERT ON {table}
+            BEGIN {_summary_refresh_sql("NEW")} END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_delete AFTER DELETE ON {table}
+            BEGIN {_summary_refresh_sql("OLD")} END
+        """)
+        # Refresh the old key too in case student_id/course_id changed
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_update AFTER UPDATE ON {table}
+            BEGIN {_summary_refresh_sql("OLD")} {_summary_refresh_sql("NEW")} END
+        """)
+    return statements
+
+def drop_summary_trigger_statements() -> List[str]:
+    """DROP TRIGGER statements (bulk loads drop, load, recreate and rebuild)"""
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{table}_summary_{event}"
+        for table in SUMMARY_TABLES
+        for event in ("insert", "delete", "update")
+    ]
+
+REBUILD_SUMMARY = [
+    "DELETE FROM student_course_summary",
+    f"""
+    INSERT INTO student_course_summary ({_SUMMARY_COLUMNS})
+    {_SUMMARY_SELECT.format(keys=_SUMMARY_ALL_KEYS, where="")}
+    """,
+]
+
+_STUDENT_COURSE_SUMMARY = [
+    """
+    CREATE TABLE IF NOT EXISTS student_course_summary (
+        student_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL,
+        enrolled INTEGER NOT NULL DEFAULT 0,
+        quiz_total REAL,
+        quiz_max REAL,
+        quiz_count INTEGER,
+        assignment_total REAL,
+        assignment_max REAL,
+        assignment_count INTEGER,
+        midterm REAL,
+        classes_attended INTEGER,
+        total_classes INTEGER,
+        current_total REAL,
+        PRIMARY KEY (student_id, course_id)
+    ) WITHOUT ROWID
+    """,
+    *summary_trigger_statements(),
+    *REBUILD_SUMMARY,
+]
+
+# Coefficients written by the offline final-exam training job
+# (backend/agentic_architecture/final_model.py); course_id 0 is the model
+# pooled over all courses, used for courses without enough history.
+_FINAL_EXAM_MODELS = [
+    """
+    CREATE TABLE IF NOT EXISTS final_exam_models (
+        course_id INTEGER PRIMARY KEY,
+        features TEXT NOT NULL,
+        coefficients TEXT NOT NULL,
+        feature_means TEXT NOT NULL,
+        n_samples INTEGER NOT NULL,
+        rmse REAL,
+        trained_at TEXT NOT NULL
+    )
+    """,
+]
+
+# Per-student counter bumped on any gradebook change, so caches keyed on it
+# (agentic_architecture/response_cache.py) never serve answers from old data.
+def version_trigger_statements() -> List[str]:
+    """CREATE TRIGGER statements bumping student_data_version"""
+    bump = """
+        INSERT INTO student_data_version (student_id, version) VALUES ({row}.student_id, 1)
+        ON CONFLICT (student_id) DO UPDATE SET version = version + 1;
+    """
+    statements = []
+    for table in SUMMARY_TABLES:
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_insert AFTER INSERT ON {table}
+            BEGIN {bump.format(row="NEW")} END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_delete AFTER DELETE ON {table}
+            BEGIN {bump.format(row="OLD")} END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_update AFTER UPDATE ON {table}
+            BEGIN {bump.format(row="OLD")} {bump.format(row="NEW")} END
+        """)
+    return statements
+
+def drop_version_trigger_statements() -> List[str]:
+    """DROP TRIGGER statements for the version counters (bulk loads, like the summary ones)"""
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{table}_version_{event}"
+        for table in SUMMARY_TABLES
+        for event in ("insert", "delete", "update")
+    ]
+
+_STUDENT_DATA_VERSION = [
+    """
+    CREATE TABLE IF NOT EXISTS student_data_version (
+        student_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    *version_trigger_statements(),
+]
+
+MIGRATIONS = [
+    (1, "baseline schema", _BASELINE_SCHEMA),
+    (2, "dedup gradebook rows, unique (student_id, course_id, ...) keys", _UNIQUE_GRADEBOOK_KEYS),
+    (3, "student_course_summary table maintained by triggers", _STUDENT_COURSE_SUMMARY),
+    (4, "final_exam_models coefficients table", _FINAL_EXAM_MODELS),
+    (5, "student_data_version counters maintained by triggers", _STUDENT_DATA_VERSION),
+]
+
+# ============================================
+# RUNNER
+# ============================================
+
+def _ensure_version_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    """)
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a fresh database)"""
+    _ensure_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def apply_migrations(db_path: str = DB_PATH, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to ``target`` and return the versions applied"""
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    applied = []
+
+    try:
+        for version, description, statements in MIGRATIONS:
+            if target is not None and version > target:
+                break
+
+            # Cheap check first, then re-check under the write lock in case
+            # another process migrated in the meantime.
+            if version <= current_version(conn):
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if version <= current_version(conn):
+                    conn.execute("ROLLBACK")
+                    continue
+
+                for statement in statements:
+                    conn.execute(statement)
+
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now(timezone.utc).isoformat())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            applied.append(version)
+    finally:
+        conn.close()
+
+    return applied
+
+def rebuild_summary(db_path: str = DB_PATH):
+    """Recompute every student_course_summary row from the gradebook tables"""
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in REBUILD_SUMMARY:
+                conn.execute(statement)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply lms.db schema migrations")
+    parser.add_argument("--db", default=DB_PATH, help="path to the SQLite database")
+    parser.add_argument("--status", action="store_true", help="show the current version and exit")
+    parser.add_argument("--rebuild-summary", action="store_true", help="recompute student_course_summary after migrating")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        conn = sqlite3.connect(args.db)
+        try:
+            version = current_version(conn)
+        finally:
+            conn.close()
+        print(f"Schema version {version} (latest {MIGRATIONS[-1][0]}):", args.db)
+        return
+
+    applied = apply_migrations(args.db)
+    if applied:
+        print(f"✅ Applied migrations {applied} to:", args.db)
+    else:
+        print("Schema already up to date:", args.db)
+
+    if args.rebuild_summary:
+        rebuild_summary(args.db)
+        print("✅ Rebuilt student_course_summary")
+
+if __name__ == "__main__":
+    main()
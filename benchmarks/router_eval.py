@@ -0,0 +1,139 @@
+# benchmarks/router_eval.py
+
+"""Offline accuracy and latency of the local intent router.
+
+HELD_OUT is written separately from the router's EXAMPLE_QUERIES. For
+each query it records whether the router routed it (coverage), whether
+a routed query went to the right agent (precision) and how long the
+decision took. Queries labelled "triage" should fall back. A triage
+LLM hop costs roughly 0.5-2 s, which is the time saved per routed query.
+
+    python benchmarks/router_eval.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.agentic_architecture.intent_router import (
+    CONFIDENCE_THRESHOLD,
+    EXAMPLE_QUERIES,
+    IntentRouter,
+    LMS,
+    PLANNER,
+    PREDICTION,
+    TRIAGE
+)
+
+HELD_OUT = [
+    ("what's my quiz average in physics", LMS),
+    ("show assignment 2 marks for programming", LMS),
+    ("how many lectures did i attend in calculus", LMS),
+    ("my attendance?", LMS),
+    ("list my scores in english", LMS),
+    ("what was my mid term result in calculus", LMS),
+    ("do i have any missing assignments", LMS),
+    ("total marks in all subjects", LMS),
+    ("how am I doing overall", LMS),
+    ("marks of quiz 3", LMS),
+    ("what score will I get in the physics final", PREDICTION),
+    ("predict calculus", PREDICTION),
+    ("can i get an A- in english", PREDICTION),
+    ("am I going to pass programming?", PREDICTION),
+    ("final exam prediction for all courses", PREDICTION),
+    ("what do i need in the final for an A", PREDICTION),
+    ("likely grade in physics", PREDICTION),
+    ("estimate how I'll do on finals", PREDICTION),
+    ("what grade will I end up with in calculus", PREDICTION),
+    ("is an A still possible in programming", PREDICTION),
+    ("plan my week", PLANNER),
+    ("i need a study schedule for 3 weeks", PLANNER),
+    ("how to improve in calculus", PLANNER),
+    ("rescue plan for english please", PLANNER),
+    ("what should i focus on before finals", PLANNER),
+    ("give me study tips", PLANNER),
+    ("build a revision timetable with 3 hours per day", PLANNER),
+    ("help me get better at programming", PLANNER),
+    ("how should I divide my study hours", PLANNER),
+    ("I'm behind in physics, how do I catch up", PLANNER),
+    ("hey", TRIAGE),
+    ("thank you so much", TRIAGE),
+    ("what are you able to help with", TRIAGE),
+    ("hmm", TRIAGE),
+    ("who made you", TRIAGE),
+    ("what's the weather like", TRIAGE),
+]
+
+def evaluate(router: IntentRouter, dataset):
+    latencies, routed, correct, correct_fallback, expected_fallback = [], 0, 0, 0, 0
+    errors = []
+    for query, label in dataset:
+        start = time.perf_counter()
+        decision = router.route(query)
+        latencies.append(time.perf_counter() - start)
+
+        if label == TRIAGE:
+            expected_fallback += 1
+            correct_fallback += decision is None
+            if decision is not None:
+                errors.append((query, label, decision))
+            continue
+        if decision is not None:
+            routed += 1
+            correct += decision.agent == label
+            if decision.agent != label:
+                errors.append((query, label, decision))
+
+    specialist = len(dataset) - expected_fallback
+    latencies.sort()
+    return {
+        "coverage": routed / specialist if specialist else 0.0,
+        "precision": correct / routed if routed else 0.0,
+        "end_to_end_accuracy": correct / specialist if specialist else 0.0,
+        "fallback_recall": correct_fallback / expected_fallback if expected_fallback else 0.0,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p95_us": latencies[int(len(latencies) * 0.95) - 1] * 1e6,
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "errors": errors,
+    }
+
+def cross_validate(folds: int, threshold: float):
+    """k-fold accuracy of the whole router on EXAMPLE_QUERIES"""
+    scores = []
+    for k in range(folds):
+        train = [ex for i, ex in enumerate(EXAMPLE_QUERIES) if i % folds != k]
+        test = [ex for i, ex in enumerate(EXAMPLE_QUERIES) if i % folds == k]
+        scores.append(evaluate(IntentRouter(train, threshold), test)["end_to_end_accuracy"])
+    return statistics.fmean(scores)
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent router accuracy/latency")
+    parser.add_argument("--threshold", type=float, default=CONFIDENCE_THRESHOLD)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+
+    router = IntentRouter(threshold=args.threshold)
+    start = time.perf_counter()
+    router.model
+    print(f"training: {(time.perf_counter() - start) * 1000:.0f} ms on {len(EXAMPLE_QUERIES)} examples")
+
+    router.route("warm up")
+    result = evaluate(router, HELD_OUT)
+    print(f"held-out ({len(HELD_OUT)} queries, threshold {args.threshold}):")
+    print(f"  coverage (routed without triage): {result['coverage']:.0%}")
+    print(f"  precision of routed queries:      {result['precision']:.0%}")
+    print(f"  end-to-end accuracy:              {result['end_to_end_accuracy']:.0%}")
+    print(f"  greetings/unclear sent to triage: {result['fallback_recall']:.0%}")
+    print(f"  latency: mean {result['mean_us']:.0f} µs, p50 {result['p50_us']:.0f} µs, p95 {result['p95_us']:.0f} µs")
+    print(f"{args.folds}-fold CV end-to-end accuracy on examples: {cross_validate(args.folds, args.threshold):.0%}")
+
+    for query, label, decision in result["errors"]:
+        print(f"  ✗ {query!r}: expected {label}, got {decision}")
+
+if __name__ == "__main__":
+    main()
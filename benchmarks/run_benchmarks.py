@@ -0,0 +1,512 @@
+# benchmarks/run_benchmarks.py
+
+"""End-to-end latency and throughput: tools, dashboard pages, login and agent turns.
+
+Four sections, each reporting p50/p95/p99, mean, max and throughput:
+
+- tools: every data tool in tools.py, awaited on one event loop with
+  --tool-concurrency calls in flight, for sampled students and their
+  enrolled courses
+- dashboard: the query set each dashboard page runs on a rerun (student
+  row, enrolled courses, then the page's per-course queries for every
+  course, as with "Select All Courses"), on --page-concurrency threads
+  with per-thread read connections like Streamlit's script threads
+- login: POST /login through the Flask test client (bcrypt dominates),
+  with backend.auth.DB_PATH pointed at --db
+- agent: full run_agent_query turns at each --concurrency level, one
+  session per simulated user, against the offline stub model from
+  stub_llm_server.py (or --llm-base-url). Response caches are off unless
+  --agent-cache, so every turn does the real work.
+
+Run it against a generated database so the numbers mean something:
+
+    python backend/database/generate_gradebook.py --db /tmp/big.db --train
+    python benchmarks/run_benchmarks.py --db /tmp/big.db --output bench.json
+    python benchmarks/run_benchmarks.py --db /tmp/big.db --compare bench.json
+
+Results are written as JSON (metadata, row counts, per-benchmark stats,
+stub model counters). --compare prints p50/p95 changes against an
+earlier file and flags anything slower than --threshold.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.database.connection import DB_PATH, get_read_connection
+from backend.database.migrations import MIGRATIONS, current_version
+
+# backend.agentic_architecture reads LLM_* and LMS_* settings at import
+# time, so it is only imported after main() has set them (see _configure_agents)
+
+SECTIONS = ("tools", "dashboard", "login", "agent")
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+def _summary(samples, wall: float, failures: int = 0):
+    ms = np.asarray(samples) * 1e3
+    return {
+        "n": len(samples),
+        "failures": failures,
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+        "throughput_per_s": round(len(samples) / wall, 2),
+    }
+
+async def _measure_async(make_calls, concurrency: int, ok=None):
+    """Await every call with at most ``concurrency`` in flight; ok(result) marks success"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, failures = [], 0
+
+    async def timed(make_call):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            result = await make_call()
+            samples.append(time.perf_counter() - start)
+            if ok is not None and not ok(result):
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(make_call) for make_call in make_calls))
+    return _summary(samples, time.perf_counter() - start, failures)
+
+def _measure_threads(calls, concurrency: int, ok=None):
+    """Run every call on a pool of ``concurrency`` threads; ok(result) marks success"""
+    samples, failures = [], 0
+    lock = threading.Lock()
+
+    def timed(call):
+        nonlocal failures
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.append(elapsed)
+            if ok is not None and not ok(result):
+                failures += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, calls))
+    return _summary(samples, time.perf_counter() - start, failures)
+
+def _print_stats(name: str, stats):
+    print(f"  {name:<28} {stats['n']:>6} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+          f"{stats['p99_ms']:>10.2f} {stats['throughput_per_s']:>10.1f}"
+          + (f"  ({stats['failures']} failed)" if stats["failures"] else ""))
+
+def _print_header(title: str):
+    print(f"\n{title}")
+    print(f"  {'benchmark':<28} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>10}")
+
+# ============================================
+# SAMPLE DATA
+# ============================================
+
+def _sample_enrolments(db_path: str, students: int, seed: int):
+    """[(student_id, registration_no, [(course_id, course_name), ...])] for random enrolled students"""
+    conn = sqlite3.connect(db_path)
+    try:
+        ids = [row[0] for row in conn.execute("SELECT DISTINCT student_id FROM marks")]
+        chosen = random.Random(seed).sample(ids, min(students, len(ids)))
+        sample = []
+        for student_id in chosen:
+            registration_no = conn.execute(
+                "SELECT registration_no FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()[0]
+            courses = conn.execute("""
+                SELECT DISTINCT c.course_id, c.course_name
+                FROM courses c
+                JOIN marks m ON m.course_id = c.course_id
+                WHERE m.student_id = ?
+            """, (student_id,)).fetchall()
+            sample.append((student_id, registration_no, courses))
+        return sample
+    finally:
+        conn.close()
+
+def _row_counts(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("students", "courses", "marks", "quizzes", "assignments", "attendance")
+        }
+    finally:
+        conn.close()
+
+# ============================================
+# TOOLS
+# ============================================
+
+def _tool_calls(db_path: str):
+    from backend.agentic_architecture import tools
+
+    return {
+        "get_course_data": lambda s, c: tools._get_course_data_async(c, s, db_path),
+        "get_performance_data": lambda s, c: tools._get_performance_data_async(c, s, db_path),
+        "get_course_analysis": lambda s, c: tools._get_course_analysis_async(c, s, db_path),
+        "get_course_analysis(all)": lambda s, c: tools._get_course_analysis_async(None, s, db_path),
+        "get_all_courses_data": lambda s, c: tools._get_all_courses_data_async(s, db_path),
+        "get_final_predictions": lambda s, c: tools._get_final_predictions_async(c, s, db_path),
+        "get_required_finals": lambda s, c: tools._get_required_finals_async(c, "A", s, db_path),
+        "get_study_plan": lambda s, c: tools._get_study_plan_async(3.5, 5, s, db_path),
+    }
+
+async def bench_tools(args, sample):
+    rng = random.Random(args.seed)
+    results = {}
+    for name, call in _tool_calls(args.db).items():
+        picks = [rng.choice(sample) for _ in range(args.iterations)]
+        calls = [
+            (lambda s=student_id, c=rng.choice(courses)[1]: call(s, c))
+            for student_id, _, courses in picks
+        ]
+        await _measure_async(calls[:10], args.tool_concurrency)  # warm pool threads and connections
+        results[name] = await _measure_async(
+            calls, args.tool_concurrency, ok=lambda r: isinstance(r, dict) and "error" not in r
+        )
+        _print_stats(name, results[name])
+    return results
+
+# ============================================
+# DASHBOARD
+# ============================================
+
+# Mirrors dashboard/dashboard.py: every rerun runs the common queries, then the page's
+# per-course queries (a tuple when the page runs several)
+PAGE_COMMON = [
+    "SELECT name, registration_no, semester FROM students WHERE student_id = ?",
+    """
+    SELECT DISTINCT c.course_id, c.course_name
+    FROM courses c
+    JOIN marks m ON m.course_id = c.course_id
+    WHERE m.student_id = ?
+    """,
+]
+
+PAGE_COURSE_QUERIES = {
+    "dashboard": """
+        SELECT classes_attended, total_classes, quiz_total, assignment_total, midterm
+        FROM student_course_summary
+        WHERE student_id = ? AND course_id = ?
+    """,
+    "personal_info": None,
+    "quizzes": ("""
+        SELECT quiz_name, marks_obtained, max_marks
+        FROM quizzes
+        WHERE student_id = ? AND course_id = ?
+        ORDER BY quiz_name
+    """, """
+        SELECT quiz_total
+        FROM student_course_summary
+        WHERE student_id = ? AND course_id = ?
+    """),
+    "assignments": ("""
+        SELECT assignment_name, marks_obtained, max_marks
+        FROM assignments
+        WHERE student_id = ? AND course_id = ?
+        ORDER BY assignment_name
+    """, """
+        SELECT assignment_total
+        FROM student_course_summary
+        WHERE student_id = ? AND course_id = ?
+    """),
+    "attendance": """
+        SELECT classes_attended, total_classes
+        FROM student_course_summary
+        WHERE student_id = ? AND course_id = ? AND total_classes IS NOT NULL
+    """,
+}
+
+def render_page(db_path: str, page: str, student_id: int) -> bool:
+    """One page rerun's queries; False if the student was not found"""
+    cur = get_read_connection(db_path).cursor()
+    if cur.execute(PAGE_COMMON[0], (student_id,)).fetchone() is None:
+        return False
+    courses = cur.execute(PAGE_COMMON[1], (student_id,)).fetchall()
+    queries = PAGE_COURSE_QUERIES[page] or ()
+    if isinstance(queries, str):
+        queries = (queries,)
+    for course_id, _ in courses:
+        for query in queries:
+            cur.execute(query, (student_id, course_id)).fetchall()
+    return True
+
+def bench_dashboard(args, sample):
+    rng = random.Random(args.seed)
+    results = {}
+    for page in PAGE_COURSE_QUERIES:
+        calls = [
+            (lambda s=rng.choice(sample)[0]: render_page(args.db, page, s))
+            for _ in range(args.iterations)
+        ]
+        _measure_threads(calls[:10], args.page_concurrency)
+        results[page] = _measure_threads(calls, args.page_concurrency, ok=bool)
+        _print_stats(page, results[page])
+    return results
+
+# ============================================
+# LOGIN
+# ============================================
+
+def bench_login(args, sample):
+    from backend import auth
+
+    auth.DB_PATH = args.db  # login() reads the module global per request
+    rng = random.Random(args.seed)
+
+    def login(registration_no: str, password: str) -> int:
+        response = auth.app.test_client().post(
+            "/login", json={"registration_no": registration_no, "password": password}
+        )
+        return response.status_code
+
+    cases = {
+        "login": (lambda: login(rng.choice(sample)[1], args.password), lambda status: status == 200),
+        "login(unknown user)": (lambda: login(f"unknown-{uuid.uuid4().hex[:8]}", args.password),
+                                lambda status: status == 401),
+    }
+    results = {}
+    # /login prints debug lines for every attempt; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, (call, ok) in cases.items():
+            calls = [call] * args.login_iterations
+            _measure_threads(calls[:2], args.login_concurrency)
+            results[name] = _measure_threads(calls, args.login_concurrency, ok=ok)
+    for name, stats in results.items():
+        _print_stats(name, stats)
+    if results["login"]["failures"] == results["login"]["n"]:
+        print(f"  every login failed: is --password ({args.password}) right for this database?")
+    return results
+
+# ============================================
+# AGENT TURNS
+# ============================================
+
+AGENT_QUESTIONS = [
+    "How am I doing in {course}?",
+    "Show my quiz and assignment marks in {course}",
+    "What is my attendance in {course}?",
+    "Predict my final exam marks in {course}",
+    "What do I need in the {course} final to get an A?",
+    "Make me a study plan for the next 4 weeks",
+    "Give me an overview of all my courses",
+    "Which course should I focus on the most?",
+    "Hi! What can you help me with?",
+]
+
+def _configure_agents(args, courses):
+    """Point llm.py at the stub (or --llm-base-url) and set cache switches; returns the stub or None"""
+    server = None
+    if args.llm_base_url:
+        os.environ["LLM_BASE_URL"] = args.llm_base_url
+    else:
+        from stub_llm_server import start_stub_server
+        server = start_stub_server(courses=courses, latency=args.stub_latency, token_delay=0.0, seed=args.seed)
+        os.environ["LLM_BASE_URL"] = server.base_url
+    os.environ.setdefault("LLM_API_KEY", "stub")
+    if not args.agent_cache:
+        os.environ["LMS_RESPONSE_CACHE_SIZE"] = "0"
+        os.environ["LMS_SEMANTIC_CACHE_SIZE"] = "0"
+    return server
+
+async def _agent_level(args, sample, concurrency: int, rng: random.Random):
+    from backend.agentic_architecture import ERROR_MESSAGE, run_agent_query
+
+    # One simulated user per concurrency slot, asking its turns back to back in one session
+    users = [rng.choice(sample) for _ in range(concurrency)]
+    turns_per_user = max(1, -(-args.agent_turns // concurrency))
+    samples, failures = [], 0
+
+    async def user(student_id, courses):
+        nonlocal failures
+        session_id = uuid.uuid4().hex
+        for _ in range(turns_per_user):
+            question = rng.choice(AGENT_QUESTIONS).format(course=rng.choice(courses)[1])
+            start = time.perf_counter()
+            answer = await run_agent_query(question, student_id, args.db, session_id=session_id)
+            samples.append(time.perf_counter() - start)
+            if not answer or answer == ERROR_MESSAGE:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(student_id, courses) for student_id, _, courses in users))
+    return _summary(samples, time.perf_counter() - start, failures)
+
+async def bench_agent(args, sample, server):
+    from backend.agentic_architecture import intent_router
+    from backend.agentic_architecture.llm import limiter_stats
+
+    await asyncio.to_thread(intent_router.warm_up)
+    rng = random.Random(args.seed)
+    await _agent_level(args, sample, 1, rng)  # warm the client, pool threads and connections
+
+    results = {}
+    for concurrency in args.concurrency:
+        if server:
+            server.reset_stats()
+        stats = await _agent_level(args, sample, concurrency, rng)
+        if server:
+            counters = server.stats()
+            stats["llm_requests_per_turn"] = round(counters["requests"] / stats["n"], 2)
+            stats["llm_injected_errors"] = counters["errors"]
+            stats["llm_peak_in_flight"] = counters["peak_in_flight"]
+        stats["limiter"] = limiter_stats()
+        results[f"concurrency={concurrency}"] = stats
+        _print_stats(f"concurrency={concurrency}", stats)
+    return results
+
+# ============================================
+# REPORT
+# ============================================
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous, results, threshold: float):
+    """Print p50/p95 change per benchmark against earlier results; returns the regressions"""
+    print(f"\nCompared with {previous['meta']['timestamp']} (regression: p95 more than {threshold:.0%} slower)")
+    print(f"  {'benchmark':<40} {'p50':>9} {'p95':>9}")
+    regressions = []
+    for section, benchmarks in results.items():
+        for name, stats in benchmarks.items():
+            old = previous["results"].get(section, {}).get(name)
+            if not old:
+                continue
+            p50 = stats["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+            p95 = stats["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+            flag = ""
+            if p95 > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{section}/{name}")
+            print(f"  {section + '/' + name:<40} {p50:>+9.1%} {p95:>+9.1%}{flag}")
+    return regressions
+
+def _int_list(text: str):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DB_PATH, help="migrated database, ideally from generate_gradebook.py")
+    parser.add_argument("--only", default=",".join(SECTIONS), help="sections to run, comma-separated")
+    parser.add_argument("--students", type=int, default=500, help="students sampled for the calls")
+    parser.add_argument("--iterations", type=int, default=1000, help="calls per tool and per dashboard page")
+    parser.add_argument("--tool-concurrency", type=int, default=8)
+    parser.add_argument("--page-concurrency", type=int, default=4)
+    parser.add_argument("--login-iterations", type=int, default=50)
+    parser.add_argument("--login-concurrency", type=int, default=4)
+    parser.add_argument("--password", default="1234", help="password of the sampled accounts")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 16, 64], help="agent levels, e.g. 1,4,16")
+    parser.add_argument("--agent-turns", type=int, default=64, help="turns per concurrency level")
+    parser.add_argument("--agent-cache", action="store_true", help="keep the response caches on")
+    parser.add_argument("--stub-latency", default="fixed:0.05", help="stub model latency per request")
+    parser.add_argument("--llm-base-url", help="use this endpoint instead of an in-process stub")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="results JSON (default: print only)")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    sections = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    conn = sqlite3.connect(args.db)
+    version = current_version(conn)
+    conn.close()
+    if version < MIGRATIONS[-1][0]:
+        sys.exit(f"{args.db} is at schema version {version}; run backend/database/migrations.py first")
+
+    previous = None
+    if args.compare:  # read first: --output may overwrite the same file
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    sample = _sample_enrolments(args.db, args.students, args.seed)
+    if not sample:
+        sys.exit(f"No enrolled students in {args.db}")
+    courses = sorted({name for _, _, enrolled in sample for _, name in enrolled})
+
+    server = _configure_agents(args, courses) if "agent" in sections else None
+    counts = _row_counts(args.db)
+    print(f"{args.db}: " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+    print(f"{len(sample)} sampled students")
+
+    results = {}
+    try:
+        if "tools" in sections:
+            _print_header(f"Tools ({args.tool_concurrency} in flight)")
+            results["tools"] = asyncio.run(bench_tools(args, sample))
+        if "dashboard" in sections:
+            _print_header(f"Dashboard pages, all enrolled courses ({args.page_concurrency} threads)")
+            results["dashboard"] = bench_dashboard(args, sample)
+        if "login" in sections:
+            _print_header(f"POST /login ({args.login_concurrency} threads)")
+            results["login"] = bench_login(args, sample)
+        if "agent" in sections:
+            target = args.llm_base_url or f"stub model, latency {args.stub_latency}"
+            _print_header(f"run_agent_query turns ({args.agent_turns} per level, {target})")
+            results["agent"] = asyncio.run(bench_agent(args, sample, server))
+    finally:
+        if server:
+            server.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+            "row_counts": counts,
+            "sampled_students": len(sample),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if previous is not None:
+        regressions = compare(previous, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+# benchmarks/stub_llm_server.py
+
+"""Offline OpenAI-compatible chat-completions server for tests and load runs.
+
+Point the agents at it through the shared client config (llm.py):
+
+    python benchmarks/stub_llm_server.py --port 8900 --latency lognormal:-1.6,0.4
+    LLM_BASE_URL=http://127.0.0.1:8900/v1 LLM_API_KEY=stub streamlit run dashboard/dashboard.py
+
+Replies walk the agent graph the way a real model would, so handoffs,
+tool calls and final answers all exercise the pipeline:
+
+1. triage (offered transfer_to_* tools): hand off by keyword
+   (predict/final/grade → prediction, plan/study → planner, data words
+   or a course name → LMS); anything else is answered directly
+2. a specialist that has not called a data tool yet this turn calls one,
+   with arguments built from the tool's JSON schema (course and grade
+   taken from the question)
+3. otherwise a final text answer quoting the start of the last tool result
+
+A --script JSON file of rules ({"match": regex, "reply": text} or
+{"match": regex, "tool": name, "arguments": {...}}) is tried first, in
+order. Latency (--latency, plus --token-delay between streamed chunks)
+and errors (--error-rate, --error-status, --hang-rate) are drawn from a
+seeded RNG. GET /stats returns request counts and peak concurrency.
+Standard library only.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_COURSES = ["Calculus", "Functional English", "Physics", "Programming"]
+
+# ============================================
+# LATENCY
+# ============================================
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Sampler for "fixed:S", "uniform:A,B", "normal:MEAN,SD", "lognormal:MU,SIGMA" or "exp:MEAN" (seconds)"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    try:
+        if kind == "fixed":
+            return lambda rng: values[0]
+        if kind == "uniform":
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "normal":
+            return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+        if kind == "lognormal":
+            return lambda rng: rng.lognormvariate(values[0], values[1])
+        if kind == "exp":
+            return lambda rng: rng.expovariate(1 / values[0])
+    except IndexError:
+        pass
+    raise ValueError(f"Bad latency spec {spec!r}")
+
+# ============================================
+# REPLY POLICY
+# ============================================
+
+_ROUTES = [
+    ("predict", re.compile(r"predict|forecast|expect|final|grade|pass|fail|chance", re.I)),
+    ("plan", re.compile(r"plan|schedul|timetable|study|revis|prepar|improve", re.I)),
+    ("lms", re.compile(r"quiz|assignment|attendance|marks?|midterm|score|result|course|total", re.I)),
+]
+
+_TOOL_PREFERENCES = [
+    (re.compile(r"\b[A-D][+-]?(?=\s|$|[?.!])|need", re.I), "get_required_finals"),
+    (re.compile(r"predict|forecast|expect|final|pass|fail|chance", re.I), "get_final_predictions"),
+    (re.compile(r"plan|schedul|timetable|study|hours", re.I), "get_study_plan"),
+]
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+class ReplyPolicy:
+    """Scripted rules first, then the rule-based agent walk described above"""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, courses: List[str] = DEFAULT_COURSES,
+                 reply_words: int = 40):
+        self.rules = [dict(rule, pattern=re.compile(rule.get("match", ".*"), re.I)) for rule in rules or []]
+        self.courses = courses
+        self.reply_words = reply_words
+
+    def reply(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """{"content": text} or {"tool_call": {"name", "arguments"}}"""
+        messages = body.get("messages", [])
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        question = _text(messages[last_user]["content"]) if last_user >= 0 else ""
+        turn = messages[last_user + 1:]
+        called = [call["function"]["name"] for m in turn for call in m.get("tool_calls") or []]
+        tool_outputs = [_text(m.get("content")) for m in turn if m.get("role") == "tool"]
+        tools = {t["function"]["name"]: t["function"] for t in body.get("tools") or [] if t.get("type") == "function"}
+
+        for rule in self.rules:
+            if not rule["pattern"].search(question):
+                continue
+            if "tool" in rule:
+                if rule["tool"] in tools and rule["tool"] not in called:
+                    return {"tool_call": {"name": rule["tool"], "arguments": rule.get("arguments", {})}}
+            elif "reply" in rule:
+                return {"content": rule["reply"]}
+
+        handoffs = [name for name in tools if name.startswith("transfer_to_")]
+        data_tools = [name for name in tools if not name.startswith("transfer_to_")]
+        if handoffs and not any(name in handoffs for name in called):
+            target = self._handoff(question, handoffs)
+            if target is not None:
+                return {"tool_call": {"name": target, "arguments": {}}}
+        if data_tools and not any(name in data_tools for name in called):
+            name = self._data_tool(question, data_tools)
+            return {"tool_call": {"name": name, "arguments": self._arguments(question, tools[name])}}
+        return {"content": self._answer(question, tool_outputs)}
+
+    def _course(self, question: str) -> Optional[str]:
+        for course in self.courses:
+            if course.lower() in question.lower():
+                return course
+        return None
+
+    def _handoff(self, question: str, handoffs: List[str]) -> Optional[str]:
+        for route, pattern in _ROUTES:
+            if pattern.search(question) or (route == "lms" and self._course(question)):
+                for name in handoffs:
+                    if route in name:
+                        return name
+        return None
+
+    def _data_tool(self, question: str, data_tools: List[str]) -> str:
+        for pattern, name in _TOOL_PREFERENCES:
+            if name in data_tools and pattern.search(question):
+                return name
+        if self._course(question) and "get_course_data" in data_tools:
+            return "get_course_data"
+        if "get_all_courses_data" in data_tools:
+            return "get_all_courses_data"
+        return data_tools[0]
+
+    def _arguments(self, question: str, tool: Dict[str, Any]) -> Dict[str, Any]:
+        """A value for every property (strict schemas require them all)"""
+        arguments = {}
+        grade = re.search(r"\b([A-D][+-]?)(?=\s|$|[?.!])", question)
+        for name, schema in tool.get("parameters", {}).get("properties", {}).items():
+            types = {option.get("type") for option in schema.get("anyOf", [schema])}
+            if name == "course_name":
+                arguments[name] = self._course(question) or (None if "null" in types else self.courses[0])
+            elif name == "target_grade":
+                arguments[name] = grade.group(1) if grade else None
+            elif "default" in schema:
+                arguments[name] = schema["default"]
+            elif "null" in types:
+                arguments[name] = None
+            elif types & {"number", "integer"}:
+                arguments[name] = 1
+            elif "boolean" in types:
+                arguments[name] = False
+            else:
+                arguments[name] = ""
+        return arguments
+
+    def _answer(self, question: str, tool_outputs: List[str]) -> str:
+        words = (f"Stub answer to: {question}. " + (f"Data: {tool_outputs[-1][:200]}" if tool_outputs else "")).split()
+        filler = ["Keep", "up", "the", "steady", "work", "and", "review", "weak", "topics", "weekly."]
+        while len(words) < self.reply_words:
+            words.append(filler[len(words) % len(filler)])
+        return " ".join(words)
+
+# ============================================
+# SERVER
+# ============================================
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the policy, fault/latency settings and counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, policy: ReplyPolicy, latency: str = "fixed:0", token_delay: float = 0.0,
+                 error_rate: float = 0.0, error_statuses=(429, 500, 503), retry_after: Optional[float] = None,
+                 hang_rate: float = 0.0, hang_seconds: float = 120.0, chunk_words: int = 3, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.policy = policy
+        self.latency = parse_latency(latency)
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.retry_after = retry_after
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.chunk_words = chunk_words
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "streamed": 0, "errors": 0, "hangs": 0, "tool_calls": 0,
+                         "handoffs": 0, "answers": 0, "disconnects": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def draw(self):
+        """(latency seconds, fault) for one request; fault is None, "hang" or an HTTP status"""
+        with self._lock:
+            latency = self.latency(self._rng)
+            roll = self._rng.random()
+            if roll < self.hang_rate:
+                return latency, "hang"
+            if roll < self.hang_rate + self.error_rate:
+                return latency, self._rng.choice(self.error_statuses)
+            return latency, None
+
+    def count(self, key: str, delta: int = 1):
+        with self._lock:
+            self.counters[key] += delta
+            if key == "in_flight":
+                self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.counters["in_flight"])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.counters:
+                if key != "in_flight":
+                    self.counters[key] = 0
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is exercised
+    server: StubServer
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._json(200, self.server.stats())
+        elif self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]})
+        else:
+            self._json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": "only /chat/completions is implemented"}})
+            return
+
+        server = self.server
+        server.count("requests")
+        server.count("in_flight")
+        try:
+            latency, fault = server.draw()
+            if fault == "hang":
+                server.count("hangs")
+                time.sleep(server.hang_seconds)
+                fault = 504
+            if fault is not None:
+                server.count("errors")
+                time.sleep(latency)
+                headers = {"retry-after": str(server.retry_after)} if server.retry_after is not None else None
+                self._json(fault, {"error": {"message": f"injected {fault}", "type": "stub_error", "code": fault}}, headers)
+                return
+
+            reply = server.policy.reply(body)
+            if "tool_call" in reply:
+                server.count("handoffs" if reply["tool_call"]["name"].startswith("transfer_to_") else "tool_calls")
+            else:
+                server.count("answers")
+            time.sleep(latency)
+            if body.get("stream"):
+                server.count("streamed")
+                self._stream(body, reply)
+            else:
+                self._json(200, self._completion(body, reply))
+        except (BrokenPipeError, ConnectionResetError):
+            server.count("disconnects")  # client gave up (timeout or cancelled stream)
+            self.close_connection = True
+        finally:
+            server.count("in_flight", -1)
+
+    def _completion(self, body: Dict[str, Any], reply: Dict[str, Any]) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": reply.get("content")}
+        finish = "stop"
+        if "tool_call" in reply:
+            message["tool_calls"] = [_tool_call(reply["tool_call"])]
+            finish = "tool_calls"
+        prompt_tokens = _estimate_tokens(json.dumps(body.get("messages", [])))
+        completion_tokens = _estimate_tokens(reply.get("content") or json.dumps(reply.get("tool_call")))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _stream(self, body: Dict[str, Any], reply: Dict[str, Any]):
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("cache-control", "no-cache")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": body.get("model", "stub")}
+
+        def send(data: str):
+            payload = f"data: {data}\n\n".encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None):
+            send(json.dumps({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}))
+
+        if "tool_call" in reply:
+            call = _tool_call(reply["tool_call"])
+            arguments = call["function"]["arguments"]
+            call["function"]["arguments"] = ""
+            chunk({"role": "assistant", "tool_calls": [dict(call, index=0)]})
+            chunk({"tool_calls": [{"index": 0, "function": {"arguments": arguments}}]})
+            chunk({}, "tool_calls")
+        else:
+            words = reply["content"].split(" ")
+            size = max(1, self.server.chunk_words)
+            for i in range(0, len(words), size):
+                if i:
+                    time.sleep(self.server.token_delay)
+                piece = " ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+                chunk({"role": "assistant", "content": piece} if i == 0 else {"content": piece})
+            chunk({}, "stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            tokens = _estimate_tokens(json.dumps(body.get("messages", [])))
+            send(json.dumps({**base, "choices": [], "usage": {"prompt_tokens": tokens, "completion_tokens": 0,
+                                                             "total_tokens": tokens}}))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+def _tool_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+            "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])}}
+
+def _estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, rules=None, courses=DEFAULT_COURSES,
+                      reply_words: int = 40, **options) -> StubServer:
+    """Start a StubServer on a background thread (port 0 = any free port); call .shutdown() to stop"""
+    server = StubServer((host, port), ReplyPolicy(rules, courses, reply_words), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="fixed:0", help="time to first byte, e.g. uniform:0.2,0.6")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--chunk-words", type=int, default=3, help="words per streamed chunk")
+    parser.add_argument("--reply-words", type=int, default=40, help="minimum words in a final answer")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", default="429,500,503", help="statuses to inject, comma-separated")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After header on injected errors")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="requests that stall --hang-seconds, then 504")
+    parser.add_argument("--hang-seconds", type=float, default=120.0)
+    parser.add_argument("--script", help="JSON list of rules tried before the default policy")
+    parser.add_argument("--courses", default=",".join(DEFAULT_COURSES), help="course names to recognise")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rules = None
+    if args.script:
+        with open(args.script) as f:
+            rules = json.load(f)
+    server = StubServer(
+        (args.host, args.port),
+        ReplyPolicy(rules, [c.strip() for c in args.courses.split(",") if c.strip()], args.reply_words),
+        latency=args.latency,
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        error_statuses=[int(s) for s in args.error_status.split(",")],
+        retry_after=args.retry_after,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        chunk_words=args.chunk_words,
+        seed=args.seed,
+    )
+    print(f"Stub LLM server on {server.base_url} (set LLM_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
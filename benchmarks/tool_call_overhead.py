@@ -0,0 +1,109 @@
+# benchmarks/tool_call_overhead.py
+
+"""Per-tool-call overhead: asyncio.run() wrappers vs native async tools.
+
+The old sync tools wrapped each call in ``asyncio.run(...)`` (or
+``loop.run_until_complete``). Called directly inside the Runner's event
+loop that raises "cannot be called from a running event loop", so that
+case is only reported, and is expected to fail. The modes timed are:
+
+- legacy: a fresh event loop per call from a plain thread (the wrapper's
+  best case, with no loop running)
+- thread: from inside a running loop, the wrapper handed to a worker
+  thread (``asyncio.to_thread(asyncio.run, ...)``), the cheapest way the
+  legacy path can work under the Runner
+- native: the same coroutine awaited on the running loop, which is what
+  the Runner does for async function tools
+
+    python benchmarks/tool_call_overhead.py --db backend/database/lms.db
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.agentic_architecture.tools import (
+    _get_course_data_async,
+    _get_performance_data_async,
+    _get_course_analysis_async
+)
+from backend.database.connection import DB_PATH
+
+TOOL_CALLS = {
+    "get_course_data": lambda args: _get_course_data_async(args.course, args.student_id, args.db),
+    "get_performance_data": lambda args: _get_performance_data_async(args.course, args.student_id, args.db),
+    "get_course_analysis": lambda args: _get_course_analysis_async(None, args.student_id, args.db),
+}
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95) - 1] * 1e6,
+    }
+
+def bench_legacy(make_call, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        asyncio.run(make_call())
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+async def bench_native(make_call, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await make_call()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+async def bench_legacy_in_thread(make_call, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await asyncio.to_thread(asyncio.run, make_call())
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+async def legacy_inside_loop(make_call):
+    """What the old wrappers did when the Runner called them (expected to fail)"""
+    coro = make_call()
+    try:
+        asyncio.run(coro)
+    except RuntimeError as e:
+        coro.close()
+        return f"RuntimeError: {e}"
+    return "ok"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--student-id", type=int, default=1)
+    parser.add_argument("--course", default="Calculus")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'tool':<22} {'mode':<8} {'mean µs':>10} {'p50 µs':>10} {'p95 µs':>10}")
+    for name, call in TOOL_CALLS.items():
+        make_call = lambda: call(args)
+        asyncio.run(bench_native(make_call, 10))  # warm pool threads and connections
+
+        legacy = bench_legacy(make_call, args.iterations)
+        thread = asyncio.run(bench_legacy_in_thread(make_call, args.iterations))
+        native = asyncio.run(bench_native(make_call, args.iterations))
+        for mode, stats in (("legacy", legacy), ("thread", thread), ("native", native)):
+            print(f"{name:<22} {mode:<8} {stats['mean_us']:>10.1f} {stats['p50_us']:>10.1f} {stats['p95_us']:>10.1f}")
+
+    print("\nlegacy wrapper called directly inside a running loop (expected to fail):",
+          asyncio.run(legacy_inside_loop(lambda: TOOL_CALLS["get_course_data"](args))))
+
+if __name__ == "__main__":
+    main()
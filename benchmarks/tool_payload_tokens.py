@@ -0,0 +1,103 @@
+# benchmarks/tool_payload_tokens.py
+
+"""Prompt tokens per tool result: full payloads vs compact encoding.
+
+The Agents SDK sends a dict tool result to the model as ``str(result)``.
+For every enrolled course of every sampled student this script counts
+the tokens of get_course_data in both shapes, plus one
+get_all_courses_data call per student. The compact schema text added to
+the tool descriptions is reported separately: it is sent once per model
+call, whatever the number of tool calls.
+
+Tokens come from tiktoken (o200k_base) when it is installed, otherwise
+from a rough BPE-like estimate (digit triples, words, punctuation,
+whitespace runs). The ratio matters more than the absolute count.
+
+    python benchmarks/tool_payload_tokens.py --db backend/database/lms.db
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sqlite3
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.agentic_architecture.compact import (
+    ALL_COURSES_SCHEMA,
+    COURSE_DATA_SCHEMA,
+    compact_all_courses,
+    compact_course_data
+)
+from backend.agentic_architecture.tools import _get_all_courses_data_async, _get_course_data_async
+from backend.database.connection import DB_PATH
+
+_PIECES = re.compile(r"\d{1,3}|[A-Za-z]+|[^\sA-Za-z\d]|\s+")
+
+def token_counter():
+    """(name, count function)"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "tiktoken o200k_base", lambda text: len(encoding.encode(text))
+    except ImportError:
+        return "estimate", lambda text: len(_PIECES.findall(text))
+
+def _students(db_path: str, limit: int):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT DISTINCT student_id FROM marks ORDER BY student_id LIMIT ?", (limit,)).fetchall()
+        courses = conn.execute("SELECT course_name FROM courses ORDER BY course_id").fetchall()
+    return [r[0] for r in rows], [r[0] for r in courses]
+
+async def collect(db_path: str, students: int):
+    student_ids, course_names = _students(db_path, students)
+    course_pairs, overview_pairs = [], []
+    for student_id in student_ids:
+        for course_name in course_names:
+            data = await _get_course_data_async(course_name, student_id, db_path)
+            if "error" not in data:
+                course_pairs.append((str(data), str(compact_course_data(data))))
+        overview = await _get_all_courses_data_async(student_id, db_path)
+        overview_pairs.append((str(overview), str(compact_all_courses(overview))))
+    return len(student_ids), course_pairs, overview_pairs
+
+def _row(name: str, pairs, count):
+    full = [count(f) for f, _ in pairs]
+    compact = [count(c) for _, c in pairs]
+    saved = 1 - sum(compact) / sum(full)
+    print(f"{name:<22} {len(pairs):>6} {statistics.fmean(full):>10.1f} {statistics.fmean(compact):>10.1f} {saved:>8.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--show", action="store_true", help="print one example of each shape")
+    args = parser.parse_args()
+
+    counter_name, count = token_counter()
+    n_students, course_pairs, overview_pairs = asyncio.run(collect(args.db, args.students))
+    if not course_pairs:
+        print("No enrolled course data found.")
+        return
+
+    print(f"{n_students} students, token counter: {counter_name}\n")
+    print(f"{'tool':<22} {'calls':>6} {'full':>10} {'compact':>10} {'saved':>8}")
+    _row("get_course_data", course_pairs, count)
+    _row("get_all_courses_data", overview_pairs, count)
+
+    print(f"\nschema text in tool descriptions (per model call): "
+          f"get_course_data +{count(COURSE_DATA_SCHEMA)}, get_all_courses_data +{count(ALL_COURSES_SCHEMA)}")
+    per_call = statistics.fmean(count(f) - count(c) for f, c in course_pairs)
+    print(f"break-even: the get_course_data schema pays for itself after "
+          f"{count(COURSE_DATA_SCHEMA) / per_call:.2f} calls per model call")
+
+    if args.show:
+        print("\nfull:   ", course_pairs[0][0])
+        print("compact:", course_pairs[0][1])
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,21 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import contextlib
 import chainlit as cl
-from backend.agents.triage_agent import triage
+from backend.agentic_architecture import stream_agent_query
 
 @cl.on_message
 async def main(message):
     student_id = 1  # demo
-    response = triage(message.content, student_id)
-    await cl.Message(content=response).send()
+    response = cl.Message(content="")
+    # aclosing: a cancelled message still stops the model call here, in this context
+    stream = stream_agent_query(message.content, student_id, session_id=cl.context.session.id)
+    async with contextlib.aclosing(stream):
+        async for event in stream:
+            if event["type"] == "text":
+                await response.stream_token(event["delta"])
+            elif event["type"] == "tool_call":
+                async with cl.Step(name=event["name"], type="tool"):
+                    pass
+    await response.send()
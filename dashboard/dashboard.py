@@ -1,10 +1,10 @@
 # dashboard/dashboard.py
 import streamlit as st
-import sqlite3
 import pandas as pd
 import sys
 import os
 import asyncio
+import uuid
 
 
 # --------------------------------------------------
@@ -15,6 +15,7 @@ sys.path.insert(0, PROJECT_ROOT)
 
 
 from backend.agentic_architecture.triage_agent import triage_agent
+from backend.database.connection import get_read_connection
 
 # --------------------------------------------------
 # PAGE CONFIG
@@ -271,6 +272,9 @@ def fmt(x):
 # --------------------------------------------------
 DB_PATH = os.path.join(PROJECT_ROOT, "backend", "database", "lms.db")
 
+# Chat transcript shown on the AI Assistant page (older messages are dropped)
+MAX_CHAT_MESSAGES = 100
+
 # --------------------------------------------------
 # AUTH CHECK
 # --------------------------------------------------
@@ -282,9 +286,9 @@ if not student_id:
     st.stop()
 
 # --------------------------------------------------
-# CONNECT TO DATABASE
+# CONNECT TO DATABASE (read-only, cached for this script thread)
 # --------------------------------------------------
-conn = sqlite3.connect(DB_PATH)
+conn = get_read_connection(DB_PATH)
 cur = conn.cursor()
 
 # --------------------------------------------------
@@ -389,42 +393,24 @@ if page == "🏠 Dashboard":
             </div>
             """, unsafe_allow_html=True)
 
+            # One primary-key lookup: totals are maintained by triggers
             cur.execute("""
-                SELECT classes_attended, total_classes
-                FROM attendance
+                SELECT classes_attended, total_classes, quiz_total, assignment_total, midterm
+                FROM student_course_summary
                 WHERE student_id = ? AND course_id = ?
             """, (student_id, course_id))
-            att = cur.fetchone()
-            attendance_pct = round((att[0] / att[1]) * 100, 2) if att else 0
+            summary = cur.fetchone() or (None, None, None, None, None)
+            attended, total_classes, quiz_sum, assign_sum, midterm_marks = summary
+            attendance_pct = round((attended / total_classes) * 100, 2) if total_classes else 0
 
-            # Fetch quiz total from new quizzes table
-            cur.execute("""
-                SELECT SUM(marks_obtained)
-                FROM quizzes
-                WHERE student_id = ? AND course_id = ?
-            """, (student_id, course_id))
-            quiz_result = cur.fetchone()
-            quiz_total = round(quiz_result[0], 2) if quiz_result[0] else 0
+            quiz_total = round(quiz_sum, 2) if quiz_sum else 0
             quiz_percentage = round((quiz_total / 10) * 100, 2)  # Out of 10
 
-            # Fetch assignment total from new assignments table
-            cur.execute("""
-                SELECT SUM(marks_obtained)
-                FROM assignments
-                WHERE student_id = ? AND course_id = ?
-            """, (student_id, course_id))
-            assign_result = cur.fetchone()
-            assignment_total = round(assign_result[0], 2) if assign_result[0] else 0
+            assignment_total = round(assign_sum, 2) if assign_sum else 0
             assign_percentage = round((assignment_total / 20) * 100, 2)  # Out of 20
 
-            # Fetch ONLY midterm from marks table (final is NULL)
-            cur.execute("""
-                SELECT midterm
-                FROM marks
-                WHERE student_id = ? AND course_id = ?
-            """, (student_id, course_id))
-            marks_result = cur.fetchone()
-            midterm = round(marks_result[0], 2) if marks_result else 0
+            # Midterm only (final is NULL)
+            midterm = round(midterm_marks, 2) if midterm_marks else 0
             midterm_percentage = round((midterm / 20) * 100, 2)  # Out of 20
 
             # Calculate current total (without final)
@@ -556,10 +542,16 @@ elif page == "📝 Quizzes":
             quizzes = cur.fetchall()
 
             if quizzes:
+                # Total from the trigger-maintained summary row; the rows are only listed
+                cur.execute("""
+                    SELECT quiz_total
+                    FROM student_course_summary
+                    WHERE student_id = ? AND course_id = ?
+                """, (student_id, course_id))
+                total_obtained = cur.fetchone()[0] or 0
+
                 # Convert to DataFrame
                 quiz_data = []
-                total_obtained = 0
-                total_max = 0
                 
                 for quiz_name, marks_obtained, max_marks in quizzes:
                     quiz_data.append({
@@ -568,8 +560,6 @@ elif page == "📝 Quizzes":
                         "Max Marks": fmt(max_marks),
                         "Percentage": fmt((marks_obtained / max_marks) * 100) + "%"
                     })
-                    total_obtained += marks_obtained
-                    total_max += max_marks
                 
                 df = pd.DataFrame(quiz_data)
                 
@@ -615,10 +605,16 @@ elif page == "📂 Assignments":
             assignments = cur.fetchall()
 
             if assignments:
+                # Total from the trigger-maintained summary row; the rows are only listed
+                cur.execute("""
+                    SELECT assignment_total
+                    FROM student_course_summary
+                    WHERE student_id = ? AND course_id = ?
+                """, (student_id, course_id))
+                total_obtained = cur.fetchone()[0] or 0
+
                 # Convert to DataFrame
                 assign_data = []
-                total_obtained = 0
-                total_max = 0
                 
                 for assign_name, marks_obtained, max_marks in assignments:
                     assign_data.append({
@@ -627,8 +623,6 @@ elif page == "📂 Assignments":
                         "Max Marks": fmt(max_marks),
                         "Percentage": fmt((marks_obtained / max_marks) * 100) + "%"
                     })
-                    total_obtained += marks_obtained
-                    total_max += max_marks
                 
                 df = pd.DataFrame(assign_data)
                 
@@ -666,8 +660,8 @@ elif page == "📅 Attendance":
 
             cur.execute("""
                 SELECT classes_attended, total_classes
-                FROM attendance
-                WHERE student_id = ? AND course_id = ?
+                FROM student_course_summary
+                WHERE student_id = ? AND course_id = ? AND total_classes IS NOT NULL
             """, (student_id, course_id))
             att = cur.fetchone()
 
@@ -706,6 +700,10 @@ elif page == "🤖 AI Assistant":
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
+    # Conversation memory for follow-up questions lives server-side, per chat session
+    if "chat_session_id" not in st.session_state:
+        st.session_state.chat_session_id = uuid.uuid4().hex
+
     if "welcome_shown" not in st.session_state:
         welcome_msg = (
             f"👋 **Hello {student_name.split()[0]}!** I'm your Academic AI Companion.\n\n"
@@ -742,59 +740,71 @@ elif page == "🤖 AI Assistant":
             st.markdown(prompt)
 
         # ----------------------------------
-        # AI response using OpenAI Agent SDK
+        # AI response using OpenAI Agent SDK (streamed token by token)
         # ----------------------------------
-        try:
-            # Import the agent runner function
-            from backend.agentic_architecture import run_agent_query
-            
-            with st.spinner("🤔 Analyzing with AI Agents..."):
-                # Use the new agent system - Note: using asyncio.run() to handle async
-                import asyncio
-                bot_reply = asyncio.run(
-                    run_agent_query(
+        with st.chat_message("assistant"):
+            try:
+                # Import the streaming agent runner
+                from backend.agentic_architecture import stream_agent_query_sync
+
+                progress = st.empty()
+                progress.caption("🤔 Analyzing with AI Agents...")
+
+                def reply_chunks():
+                    streaming = False
+                    for event in stream_agent_query_sync(
                         user_query=prompt,
                         student_id=student_id,
-                        db_connection=conn
-                    )
+                        db_path=DB_PATH,
+                        session_id=st.session_state.chat_session_id
+                    ):
+                        if event["type"] == "text":
+                            if not streaming:
+                                progress.empty()
+                                streaming = True
+                            yield event["delta"]
+                        elif not streaming and event["type"] == "agent":
+                            progress.caption(f"🤖 {event['name']} is on it...")
+                        elif not streaming and event["type"] == "tool_call":
+                            progress.caption(f"🔍 Checking {event['name'].replace('_', ' ')}...")
+
+                bot_reply = st.write_stream(reply_chunks()) or ""
+                progress.empty()
+
+            except ImportError as e:
+                # Fallback if agent system is not available
+                st.error(f"Agent system not available: {str(e)}")
+                bot_reply = (
+                    f"⚠️ **Agent System Error**\n\n"
+                    f"The AI agent system is currently unavailable. Please try again later.\n\n"
+                    f"Error: `{str(e)}`"
+                )
+                st.markdown(bot_reply)
+
+            except Exception as e:
+                # General error handling
+                import traceback
+                error_details = traceback.format_exc()
+                print(f"Agent Error in Dashboard: {str(e)}")
+                print(error_details)
+
+                bot_reply = (
+                    f"⚠️ **System Error**\n\n"
+                    f"I encountered an issue while processing your request: `{str(e)}`\n\n"
+                    f"Hi {student_name}! 👋 Please try:\n"
+                    f"1. Rephrasing your question\n"
+                    f"2. Specifying the course name clearly\n"
+                    f"3. Asking about a different aspect\n\n"
+                    f"Examples:\n"
+                    f"• \"What are my quiz marks in Calculus?\"\n"
+                    f"• \"Predict my final score in Physics\"\n"
+                    f"• \"Create a study plan for Programming\""
                 )
+                st.markdown(bot_reply)
 
-        except ImportError as e:
-            # Fallback if agent system is not available
-            st.error(f"Agent system not available: {str(e)}")
-            bot_reply = (
-                f"⚠️ **Agent System Error**\n\n"
-                f"The AI agent system is currently unavailable. Please try again later.\n\n"
-                f"Error: `{str(e)}`"
-            )
-            
-        except Exception as e:
-            # General error handling
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"Agent Error in Dashboard: {str(e)}")
-            print(error_details)
-            
-            bot_reply = (
-                f"⚠️ **System Error**\n\n"
-                f"I encountered an issue while processing your request: `{str(e)}`\n\n"
-                f"Hi {student_name}! 👋 Please try:\n"
-                f"1. Rephrasing your question\n"
-                f"2. Specifying the course name clearly\n"
-                f"3. Asking about a different aspect\n\n"
-                f"Examples:\n"
-                f"• \"What are my quiz marks in Calculus?\"\n"
-                f"• \"Predict my final score in Physics\"\n"
-                f"• \"Create a study plan for Programming\""
-            )
-
-        # Store and display assistant reply
+        # Store assistant reply (the agent gets its context from conversation
+        # memory, so only the visible transcript is kept here, capped)
         st.session_state.messages.append(
             {"role": "assistant", "content": bot_reply}
         )
-        with st.chat_message("assistant"):
-            st.markdown(bot_reply)
-# --------------------------------------------------
-# CLOSE DB
-# --------------------------------------------------
-conn.close()
\ No newline at end of file
+        del st.session_state.messages[:-MAX_CHAT_MESSAGES]
\ No newline at end of file
@@ -0,0 +1,19 @@
+# tests/conftest.py
+
+import os
+import shutil
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+SAMPLE_DB = os.path.join(PROJECT_ROOT, "backend", "database", "lms.db")
+
+@pytest.fixture
+def lms_db(tmp_path):
+    """Private copy of the sample database (migrated on first connection)"""
+    path = tmp_path / "lms.db"
+    shutil.copy(SAMPLE_DB, path)
+    return str(path)
@@ -0,0 +1,109 @@
+# tests/test_concurrency_isolation.py
+
+"""Concurrent run_agent_query calls never see another student's data.
+
+Many turns for different students run at once through the real agents,
+function tools and Runner, against the offline stub model. The stub
+records the tool result it receives at the end of each turn; every one
+must equal what the tool returns for the student who asked.
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from stub_llm_server import ReplyPolicy, StubServer
+from backend.agentic_architecture import ERROR_MESSAGE, llm, run_agent_query
+from backend.agentic_architecture.compact import compact_all_courses, compact_course_data
+from backend.agentic_architecture.tools import (
+    COMPACT_TOOL_OUTPUT,
+    _get_all_courses_data_async,
+    _get_course_data_async
+)
+
+RUNS = 48
+
+class RecordingPolicy(ReplyPolicy):
+    """Default stub walk, remembering the last tool result each question was answered from"""
+
+    def __init__(self, courses):
+        super().__init__(courses=courses)
+        self.answered = {}
+        self._lock = threading.Lock()
+
+    def _answer(self, question, tool_outputs):
+        with self._lock:
+            self.answered[question] = tool_outputs[-1] if tool_outputs else None
+        return super()._answer(question, tool_outputs)
+
+@pytest.fixture
+def stub_model(lms_db, monkeypatch):
+    conn = sqlite3.connect(lms_db)
+    courses = [row[0] for row in conn.execute("SELECT course_name FROM courses")]
+    conn.close()
+
+    server = StubServer(("127.0.0.1", 0), RecordingPolicy(courses), latency="uniform:0,0.02")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(llm, "LLM_BASE_URL", server.base_url)
+    monkeypatch.setenv("LLM_API_KEY", "stub")
+    yield server.policy
+    server.shutdown()
+
+def _enrolments(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT DISTINCT m.student_id, c.course_name
+            FROM marks m JOIN courses c ON c.course_id = m.course_id
+        """).fetchall()
+    finally:
+        conn.close()
+    enrolled = {}
+    for student_id, course_name in rows:
+        enrolled.setdefault(student_id, []).append(course_name)
+    return enrolled
+
+async def _expected(student_id, course_name, db_path):
+    """What the function tool returns, as the SDK sends it to the model"""
+    if course_name is None:
+        data = await _get_all_courses_data_async(student_id, db_path)
+        return str(compact_all_courses(data) if COMPACT_TOOL_OUTPUT else data)
+    data = await _get_course_data_async(course_name, student_id, db_path)
+    return str(compact_course_data(data) if COMPACT_TOOL_OUTPUT else data)
+
+def test_concurrent_runs_only_see_their_own_student(lms_db, stub_model):
+    enrolled = _enrolments(lms_db)
+    assert len(enrolled) > 1, "need several students to detect leaks"
+    rng = random.Random(7)
+
+    runs = []
+    for run in range(RUNS):
+        student_id = rng.choice(sorted(enrolled))
+        course_name = rng.choice(enrolled[student_id] + [None])
+        if course_name is None:
+            question = f"How am I doing overall across all my courses? (run {run})"
+        else:
+            question = f"How am I doing in {course_name}? (run {run})"
+        runs.append((question, student_id, course_name))
+
+    async def main():
+        answers = await asyncio.gather(*(
+            run_agent_query(question, student_id, lms_db) for question, student_id, _ in runs
+        ))
+        expected = [await _expected(student_id, course, lms_db) for _, student_id, course in runs]
+        return answers, expected
+
+    answers, expected = asyncio.run(main())
+
+    assert ERROR_MESSAGE not in answers
+    # The check only means something if students' results differ
+    assert len({e for e, (_, _, course) in zip(expected, runs) if course is None}) > 1
+    for (question, student_id, _), want in zip(runs, expected):
+        assert stub_model.answered.get(question) == want, f"student {student_id} got other data for {question!r}"
@@ -0,0 +1,50 @@
+# tests/test_conversation_routing.py
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import backend.agentic_architecture as agents_pkg
+from backend.agentic_architecture import run_agent_query, select_agent
+from backend.agentic_architecture.predictive_agent import predictive_agent
+from backend.agentic_architecture.triage_agent import triage_agent
+
+FOLLOW_UPS = ["and for calculus?", "what about physics?"]
+
+class _RecordingRunner:
+    """Stands in for Runner: records the starting agent and its input"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, agent, agent_input, run_config=None):
+        self.calls.append((agent, agent_input))
+        return SimpleNamespace(final_output=f"answer from {agent.name}")
+
+def test_first_turn_uses_router():
+    assert select_agent("Predict my final exam marks in Physics") is predictive_agent
+
+def test_follow_up_starts_at_triage():
+    history = [
+        {"role": "user", "content": "Predict my final exam marks in Physics"},
+        {"role": "assistant", "content": "About 38/50."},
+    ]
+    for question in FOLLOW_UPS:
+        assert select_agent(question, history) is triage_agent
+
+def test_follow_up_turn_in_session(lms_db, monkeypatch):
+    runner = _RecordingRunner()
+    monkeypatch.setattr(agents_pkg, "Runner", runner)
+    session_id = uuid.uuid4().hex
+
+    async def conversation():
+        await run_agent_query("Predict my final exam marks in Physics", 1, lms_db, session_id=session_id)
+        await run_agent_query("and for calculus?", 1, lms_db, session_id=session_id)
+
+    asyncio.run(conversation())
+
+    (first_agent, _), (second_agent, second_input) = runner.calls
+    assert first_agent is predictive_agent
+    assert second_agent is triage_agent
+    assert [item["role"] for item in second_input] == ["user", "assistant", "user"]
+    assert second_input[-1]["content"] == "and for calculus?"
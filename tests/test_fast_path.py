@@ -0,0 +1,35 @@
+# tests/test_fast_path.py
+
+import re
+
+from backend.agentic_architecture.fast_path import render
+
+def _attendance_answer(attended, total):
+    data = {
+        "course_name": "Physics",
+        "attendance": {
+            "classes_attended": attended,
+            "total_classes": total,
+            "percentage": round(attended / total * 100, 2),
+        },
+    }
+    return render({"kind": "attendance", "number": None}, data)
+
+def _classes_needed(answer):
+    match = re.search(r"Attend the next (\d+) classes", answer)
+    return int(match.group(1)) if match else None
+
+def test_classes_needed_example():
+    # (10 + 20) / (20 + 20) = 75%
+    assert _classes_needed(_attendance_answer(10, 20)) == 20
+
+def test_classes_needed_is_the_smallest_streak_back_to_75_percent():
+    for total in range(1, 61):
+        for attended in range(total + 1):
+            answer = _attendance_answer(attended, total)
+            needed = _classes_needed(answer)
+            if attended / total >= 0.75:
+                assert needed is None, (attended, total)
+                continue
+            assert (attended + needed) / (total + needed) >= 0.75, (attended, total)
+            assert (attended + needed - 1) / (total + needed - 1) < 0.75, (attended, total)
@@ -0,0 +1,34 @@
+# tests/test_final_model.py
+
+import sqlite3
+
+import numpy as np
+
+from backend.agentic_architecture.final_model import POOLED_COURSE_ID, _design, _fit, _solve, train
+
+def test_rmse_is_measured_on_held_out_students():
+    rng = np.random.default_rng(1)
+    X = rng.uniform(40, 100, size=(12, 4))
+    y = X @ np.array([0.1, 0.1, 0.2, 0.05]) + rng.normal(0, 3, size=12)
+
+    coefficients, means, rmse = _fit(X, y)
+    in_sample = float(np.sqrt(np.mean((_design(X, means) @ coefficients - y) ** 2)))
+    # A small cohort fits its own noise, so the in-sample error is optimistic
+    assert rmse > in_sample
+    np.testing.assert_allclose(coefficients, _solve(X, y)[0])
+
+def test_train_migrates_through_connection(lms_db):
+    # The sample database is unmigrated: no summary or model tables yet
+    conn = sqlite3.connect(lms_db)
+    conn.execute("UPDATE marks SET final = 20 + midterm")
+    conn.commit()
+    conn.close()
+
+    stats = train(lms_db)
+
+    assert POOLED_COURSE_ID in stats
+    conn = sqlite3.connect(lms_db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM final_exam_models").fetchone()[0] == len(stats)
+    finally:
+        conn.close()
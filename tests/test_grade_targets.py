@@ -0,0 +1,36 @@
+# tests/test_grade_targets.py
+
+from backend.agentic_architecture.grade_targets import normalize_grade, required_finals
+
+def _one(current_total, target_grade=None):
+    (result,) = required_finals([{"course_name": "Physics", "current_total": current_total}], target_grade)
+    return result
+
+def test_required_final_is_threshold_minus_coursework():
+    result = _one(36.5)
+    assert result["required_final"]["A"] == 48.5     # 85 - 36.5
+    assert result["required_final"]["B"] == 34.5     # 71 - 36.5
+    assert result["required_final"]["D"] == 13.5     # 50 - 36.5
+    assert result["secured"] == []
+    assert result["impossible"] == []
+    assert result["best_possible_grade"] == "A"
+
+def test_out_of_reach_and_secured_bands():
+    result = _one(30)
+    assert result["impossible"] == ["A"]              # 55 > 50
+    assert result["required_final"]["A-"] == 50.0     # exactly a full final
+    assert result["best_possible_grade"] == "A-"
+
+    assert _one(50)["secured"] == ["D"]                # 50 - 50 = 0
+    assert _one(2)["best_possible_grade"] == "D"
+    assert _one(-0.5)["best_possible_grade"] == "F"
+
+def test_target_grade_filters_bands():
+    result = _one(40, "B+")
+    assert result["required_final"] == {"B+": 35.0}
+    assert result["best_possible_grade"] == "A"
+
+def test_normalize_grade():
+    assert normalize_grade(" b plus ") == "B+"
+    assert normalize_grade("a-") == "A-"
+    assert normalize_grade("E") is None
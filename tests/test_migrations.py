@@ -0,0 +1,253 @@
+# tests/test_migrations.py
+
+"""Gradebook migrations: the dedup in migration 2 and the
+student_course_summary triggers and rebuild from migration 3.
+
+The summary is checked against aggregates computed here in Python from
+the raw rows, so a trigger and REBUILD_SUMMARY that agree on a wrong
+value still fail.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from backend.database.migrations import apply_migrations, rebuild_summary
+
+GRADEBOOK_KEYS = {
+    "quizzes": "student_id, course_id, quiz_name",
+    "assignments": "student_id, course_id, assignment_name",
+    "marks": "student_id, course_id",
+    "attendance": "student_id, course_id",
+}
+
+def _open(db_path):
+    return sqlite3.connect(db_path, isolation_level=None)
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def _distinct_keys(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM (SELECT DISTINCT {GRADEBOOK_KEYS[table]} FROM {table})").fetchone()[0]
+
+def _raw_summary(conn):
+    """(student_id, course_id) -> summary columns, aggregated in Python"""
+    rows = {}
+
+    def row(student_id, course_id):
+        return rows.setdefault((student_id, course_id), {
+            "enrolled": 0,
+            "quiz": [], "assignment": [],
+            "midterm": None, "attendance": None,
+        })
+
+    for kind, table in (("quiz", "quizzes"), ("assignment", "assignments")):
+        for student_id, course_id, obtained, max_marks in conn.execute(
+            f"SELECT student_id, course_id, marks_obtained, max_marks FROM {table}"
+        ):
+            row(student_id, course_id)[kind].append((obtained, max_marks))
+    # Midterm and attendance come from the first row of each key
+    for student_id, course_id, midterm in conn.execute(
+        "SELECT student_id, course_id, midterm FROM marks ORDER BY mark_id DESC"
+    ):
+        entry = row(student_id, course_id)
+        entry["enrolled"] = 1
+        entry["midterm"] = midterm
+    for student_id, course_id, attended, total in conn.execute(
+        "SELECT student_id, course_id, classes_attended, total_classes FROM attendance ORDER BY attendance_id DESC"
+    ):
+        row(student_id, course_id)["attendance"] = (attended, total)
+
+    summary = {}
+    for key, entry in rows.items():
+        quiz_total = sum(o for o, _ in entry["quiz"]) if entry["quiz"] else None
+        assign_total = sum(o for o, _ in entry["assignment"]) if entry["assignment"] else None
+        attended, total = entry["attendance"] or (None, None)
+        summary[key] = (
+            entry["enrolled"],
+            quiz_total,
+            sum(m for _, m in entry["quiz"]) if entry["quiz"] else None,
+            len(entry["quiz"]) or None,
+            assign_total,
+            sum(m for _, m in entry["assignment"]) if entry["assignment"] else None,
+            len(entry["assignment"]) or None,
+            entry["midterm"],
+            attended,
+            total,
+            (quiz_total or 0) + (assign_total or 0) + (entry["midterm"] or 0),
+        )
+    return summary
+
+def _table_summary(conn):
+    return {
+        (row[0], row[1]): tuple(row[2:])
+        for row in conn.execute("""
+            SELECT student_id, course_id, enrolled,
+                   quiz_total, quiz_max, quiz_count,
+                   assignment_total, assignment_max, assignment_count,
+                   midterm, classes_attended, total_classes, current_total
+            FROM student_course_summary
+        """)
+    }
+
+def _assert_summary_matches_raw(conn):
+    expected = _raw_summary(conn)
+    actual = _table_summary(conn)
+    assert actual.keys() == expected.keys()
+    for key, want in expected.items():
+        assert actual[key] == pytest.approx(want), f"summary row {key}"
+
+def _random_writes(conn, rng, count):
+    """Inserts, upserts, updates and deletes across the four gradebook tables"""
+    students = [r[0] for r in conn.execute("SELECT student_id FROM students")]
+    courses = [r[0] for r in conn.execute("SELECT course_id FROM courses")]
+    for _ in range(count):
+        student_id, course_id = rng.choice(students), rng.choice(courses)
+        action = rng.randrange(6)
+        if action == 0:
+            conn.execute("""
+                INSERT INTO quizzes (student_id, course_id, quiz_name, marks_obtained, max_marks)
+                VALUES (?, ?, ?, ?, 2.5)
+                ON CONFLICT(student_id, course_id, quiz_name) DO UPDATE SET marks_obtained = excluded.marks_obtained
+            """, (student_id, course_id, f"Quiz {rng.randint(1, 6)}", round(rng.uniform(0, 2.5), 2)))
+        elif action == 1:
+            conn.execute("""
+                INSERT INTO assignments (student_id, course_id, assignment_name, marks_obtained, max_marks)
+                VALUES (?, ?, ?, ?, 5)
+                ON CONFLICT(student_id, course_id, assignment_name) DO UPDATE SET marks_obtained = excluded.marks_obtained
+            """, (student_id, course_id, f"Assignment {rng.randint(1, 6)}", round(rng.uniform(0, 5), 2)))
+        elif action == 2:
+            conn.execute("""
+                INSERT INTO marks (student_id, course_id, midterm) VALUES (?, ?, ?)
+                ON CONFLICT(student_id, course_id) DO UPDATE SET midterm = excluded.midterm
+            """, (student_id, course_id, round(rng.uniform(0, 20), 2)))
+        elif action == 3:
+            attended = rng.randint(0, 30)
+            conn.execute("""
+                INSERT INTO attendance (student_id, course_id, classes_attended, total_classes) VALUES (?, ?, ?, 30)
+                ON CONFLICT(student_id, course_id) DO UPDATE SET classes_attended = excluded.classes_attended
+            """, (student_id, course_id, attended))
+        elif action == 4:
+            table = rng.choice(list(GRADEBOOK_KEYS))
+            conn.execute(f"""
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE student_id = ? AND course_id = ? LIMIT 1
+                )
+            """, (student_id, course_id))
+        else:
+            # Move a quiz to another course: both the old and the new key change
+            conn.execute("""
+                UPDATE OR IGNORE quizzes SET course_id = ? WHERE rowid IN (
+                    SELECT rowid FROM quizzes WHERE student_id = ? LIMIT 1
+                )
+            """, (course_id, student_id))
+
+def test_dedup_keeps_newest_row_per_key(lms_db):
+    apply_migrations(lms_db, target=1)
+    conn = _open(lms_db)
+    try:
+        student_id, course_id, quiz_name = conn.execute(
+            "SELECT student_id, course_id, quiz_name FROM quizzes LIMIT 1"
+        ).fetchone()
+        # What the old INSERT OR REPLACE seed scripts appended without a unique key
+        for obtained in (1.0, 2.0):
+            conn.execute(
+                "INSERT INTO quizzes (student_id, course_id, quiz_name, marks_obtained, max_marks) VALUES (?, ?, ?, ?, 2.5)",
+                (student_id, course_id, quiz_name, obtained)
+            )
+        for attended in (10, 20):
+            conn.execute(
+                "INSERT INTO attendance (student_id, course_id, classes_attended, total_classes) VALUES (?, ?, ?, 30)",
+                (student_id, course_id, attended)
+            )
+        conn.execute("INSERT INTO marks (student_id, course_id, midterm) VALUES (?, ?, 11)", (student_id, course_id))
+        conn.execute(
+            "INSERT INTO assignments (student_id, course_id, assignment_name, marks_obtained, max_marks) "
+            "SELECT student_id, course_id, assignment_name, 0, max_marks FROM assignments LIMIT 1"
+        )
+
+        keys = {table: _distinct_keys(conn, table) for table in GRADEBOOK_KEYS}
+        for table in GRADEBOOK_KEYS:
+            assert _count(conn, table) > keys[table], f"no duplicates planted in {table}"
+
+        assert apply_migrations(lms_db, target=2) == [2]
+
+        for table in GRADEBOOK_KEYS:
+            assert _count(conn, table) == keys[table], table
+        assert conn.execute(
+            "SELECT marks_obtained FROM quizzes WHERE student_id = ? AND course_id = ? AND quiz_name = ?",
+            (student_id, course_id, quiz_name)
+        ).fetchall() == [(2.0,)]
+        assert conn.execute(
+            "SELECT classes_attended FROM attendance WHERE student_id = ? AND course_id = ?",
+            (student_id, course_id)
+        ).fetchall() == [(20,)]
+        assert conn.execute(
+            "SELECT midterm FROM marks WHERE student_id = ? AND course_id = ?",
+            (student_id, course_id)
+        ).fetchall() == [(11,)]
+
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO marks (student_id, course_id, midterm) VALUES (?, ?, 12)", (student_id, course_id))
+    finally:
+        conn.close()
+
+def test_midterm_upsert_keeps_final(lms_db):
+    apply_migrations(lms_db)
+    conn = _open(lms_db)
+    try:
+        student_id, course_id = conn.execute("SELECT student_id, course_id FROM marks LIMIT 1").fetchone()
+        conn.execute("UPDATE marks SET final = 41 WHERE student_id = ? AND course_id = ?", (student_id, course_id))
+        # The statement the seed scripts use to (re)write midterms
+        conn.execute("""
+            INSERT INTO marks (student_id, course_id, midterm)
+            VALUES (?, ?, ?)
+            ON CONFLICT(student_id, course_id) DO UPDATE SET midterm = excluded.midterm
+        """, (student_id, course_id, 17))
+        assert conn.execute(
+            "SELECT midterm, final FROM marks WHERE student_id = ? AND course_id = ?", (student_id, course_id)
+        ).fetchall() == [(17, 41)]
+    finally:
+        conn.close()
+
+def test_summary_after_migration_matches_raw_rows(lms_db):
+    apply_migrations(lms_db)
+    conn = _open(lms_db)
+    try:
+        assert _table_summary(conn)
+        _assert_summary_matches_raw(conn)
+    finally:
+        conn.close()
+
+def test_triggers_keep_summary_current(lms_db):
+    apply_migrations(lms_db)
+    conn = _open(lms_db)
+    rng = random.Random(3)
+    try:
+        for _ in range(20):
+            _random_writes(conn, rng, 10)
+            _assert_summary_matches_raw(conn)
+    finally:
+        conn.close()
+
+def test_rebuild_matches_triggers(lms_db):
+    apply_migrations(lms_db)
+    conn = _open(lms_db)
+    try:
+        _random_writes(conn, random.Random(11), 300)
+        maintained = _table_summary(conn)
+    finally:
+        conn.close()
+
+    rebuild_summary(lms_db)
+
+    conn = _open(lms_db)
+    try:
+        rebuilt = _table_summary(conn)
+        assert rebuilt.keys() == maintained.keys()
+        for key, want in maintained.items():
+            assert rebuilt[key] == pytest.approx(want), f"summary row {key}"
+        _assert_summary_matches_raw(conn)
+    finally:
+        conn.close()
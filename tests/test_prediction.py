@@ -0,0 +1,60 @@
+# tests/test_prediction.py
+
+import pytest
+
+from backend.agentic_architecture.prediction import predict_final_scores
+
+def _performance(**overrides):
+    performance = {
+        "course_name": "Physics",
+        "quiz_average": 80.0,
+        "assignment_average": 70.0,
+        "midterm_score": 60.0,
+        "quiz_consistency": 100.0,
+        "assignment_consistency": 100.0,
+        "attendance_percentage": 90.0,
+    }
+    performance.update(overrides)
+    return {key: value for key, value in performance.items() if value is not None}
+
+def test_weighted_average_and_ranges():
+    # 0.2 * 80 + 0.3 * 70 + 0.5 * 60 = 67% of the 50-mark final = 33.5
+    (prediction,) = predict_final_scores([_performance()])
+    assert prediction["weighted_average"] == 67.0
+    assert prediction["consistency_factor"] == 1.0
+    assert prediction["attendance_factor"] == 1.0
+    assert prediction["final_prediction"]["optimistic"] == pytest.approx(33.5 * 1.15, abs=0.01)
+    assert prediction["final_prediction"]["realistic"] == 33.5
+    assert prediction["final_prediction"]["pessimistic"] == pytest.approx(33.5 * 0.85, abs=0.01)
+    assert prediction["confidence"] == "high"
+
+def test_attendance_below_requirement_scales_realistic_and_pessimistic():
+    full, short, boundary = predict_final_scores([
+        _performance(),
+        _performance(attendance_percentage=74.9),
+        _performance(attendance_percentage=75.0),
+    ])
+    assert short["attendance_factor"] == 0.95
+    assert boundary["attendance_factor"] == 1.0
+    assert boundary["final_prediction"] == full["final_prediction"]
+    # Optimistic ignores attendance
+    assert short["final_prediction"]["optimistic"] == full["final_prediction"]["optimistic"]
+    assert short["final_prediction"]["realistic"] == pytest.approx(33.5 * 0.95, abs=0.01)
+    assert short["final_prediction"]["pessimistic"] == pytest.approx(33.5 * 0.85 * 0.95, abs=0.01)
+
+def test_missing_components_renormalize_weights():
+    # No midterm: (0.2 * 80 + 0.3 * 70) / 0.5 = 74%
+    (prediction,) = predict_final_scores([_performance(midterm_score=None)])
+    assert prediction["weighted_average"] == 74.0
+    assert prediction["confidence"] == "medium"
+
+def test_consistency_maps_onto_pessimistic_factor():
+    (prediction,) = predict_final_scores([_performance(quiz_consistency=40.0, assignment_consistency=60.0)])
+    assert prediction["consistency_factor"] == pytest.approx(0.85 + 0.15 * 0.5)
+    assert prediction["final_prediction"]["realistic"] == pytest.approx(33.5 * 0.925, abs=0.01)
+
+def test_no_marks_is_an_error():
+    (prediction,) = predict_final_scores([
+        _performance(quiz_average=None, assignment_average=None, midterm_score=None)
+    ])
+    assert "error" in prediction
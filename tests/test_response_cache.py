@@ -0,0 +1,80 @@
+# tests/test_response_cache.py
+
+"""Gradebook writes bump student_data_version (migration 5), so cached
+answers from before the write are never served after it."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import backend.agentic_architecture as agents_pkg
+from backend.agentic_architecture import run_agent_query
+from backend.agentic_architecture.response_cache import ResponseCache, load_data_version
+from backend.agentic_architecture.semantic_cache import SemanticCache
+from backend.database.connection import connect
+
+QUESTION = "Predict my final exam marks in Physics"
+
+class _CountingRunner:
+    """Stands in for Runner: a new answer on every call"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self, agent, agent_input, run_config=None):
+        self.calls += 1
+        return SimpleNamespace(final_output=f"answer {self.calls}")
+
+@pytest.fixture
+def runner(monkeypatch):
+    runner = _CountingRunner()
+    response_cache, semantic_cache = ResponseCache(), SemanticCache()
+    monkeypatch.setattr(agents_pkg, "Runner", runner)
+    monkeypatch.setattr(agents_pkg, "get_response_cache", lambda: response_cache)
+    monkeypatch.setattr(agents_pkg, "get_semantic_cache", lambda: semantic_cache)
+    return runner
+
+def _write_midterm(db_path, student_id, midterm):
+    conn = connect(db_path)
+    try:
+        conn.execute(
+            "UPDATE marks SET midterm = ? WHERE student_id = ? AND course_id = (SELECT MIN(course_id) FROM marks WHERE student_id = ?)",
+            (midterm, student_id, student_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def _versions(db_path, *student_ids):
+    conn = connect(db_path)
+    try:
+        return [load_data_version(conn, student_id) for student_id in student_ids]
+    finally:
+        conn.close()
+
+def test_mark_write_bumps_only_that_students_version(lms_db):
+    before = _versions(lms_db, 1, 2)
+    assert None not in before
+
+    _write_midterm(lms_db, 1, 13.5)
+
+    after = _versions(lms_db, 1, 2)
+    assert after[0] > before[0]
+    assert after[1] == before[1]
+
+def test_cached_answer_not_served_after_mark_write(lms_db, runner):
+    async def ask():
+        return await run_agent_query(QUESTION, 1, lms_db)
+
+    assert asyncio.run(ask()) == "answer 1"
+    assert asyncio.run(ask()) == "answer 1"
+    assert runner.calls == 1
+
+    _write_midterm(lms_db, 1, 13.5)
+
+    assert asyncio.run(ask()) == "answer 2"
+    assert runner.calls == 2
+    # The new answer is cached under the new version
+    assert asyncio.run(ask()) == "answer 2"
+    assert runner.calls == 2
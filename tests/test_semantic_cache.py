@@ -0,0 +1,55 @@
+# tests/test_semantic_cache.py
+
+import pytest
+
+from backend.agentic_architecture.semantic_cache import SemanticCache, query_entities
+
+STUDENT_ID = 1
+VERSION = 1
+
+# (cached question, new question): different answers, must never be served from each other
+WRONG_MATCHES = [
+    ("What are my quiz marks in Calculus?", "What are my assignment marks in Calculus?"),
+    ("What is my attendance in Physics?", "What is my midterm in Physics?"),
+    ("Which course has my lowest quiz average?", "Which course has my highest quiz average?"),
+    ("Which course has my highest quiz average?", "Which course has my lowest quiz average?"),
+    ("Will I pass Calculus?", "Will I fail Calculus?"),
+    ("Which is my best course?", "Which is my worst course?"),
+    ("predict my final in physics", "predict my midterm in physics"),
+    ("Am I passing Calculus?", "Am I not passing Calculus?"),
+]
+
+PARAPHRASES = [
+    ("Predict my final exam marks in Physics", "predict my physics final exam marks"),
+    ("Make me a study plan for Programming", "create a study plan for programming"),
+    ("What are my quiz marks in Calculus?", "show me my calculus quiz marks"),
+    ("How is my attendance in Physics?", "what's my attendance in physics"),
+]
+
+def _cache_with(db_path, question):
+    cache = SemanticCache(max_entries=16)
+    cache.add(db_path, STUDENT_ID, VERSION, question, f"answer to: {question}")
+    return cache
+
+@pytest.mark.parametrize("cached, asked", WRONG_MATCHES)
+def test_different_questions_miss(lms_db, cached, asked):
+    cache = _cache_with(lms_db, cached)
+    assert cache.lookup(lms_db, STUDENT_ID, VERSION, asked) is None
+
+@pytest.mark.parametrize("cached, asked", PARAPHRASES)
+def test_paraphrases_hit(lms_db, cached, asked):
+    cache = _cache_with(lms_db, cached)
+    hit = cache.lookup(lms_db, STUDENT_ID, VERSION, asked)
+    assert hit is not None and hit["matched_query"] == cached
+
+def test_other_student_or_version_misses(lms_db):
+    question = "What are my quiz marks in Calculus?"
+    cache = _cache_with(lms_db, question)
+    assert cache.lookup(lms_db, STUDENT_ID + 1, VERSION, question) is None
+    assert cache.lookup(lms_db, STUDENT_ID, VERSION + 1, question) is None
+
+def test_entities_include_assessment_and_polarity(lms_db):
+    entities = query_entities("Will I fail the Calculus midterm?", lms_db)
+    assert ("assessment", "midterm") in entities
+    assert ("polarity", "fail") in entities
+    assert any(kind == "course" for kind, _ in entities)
@@ -0,0 +1,48 @@
+# tests/test_study_scheduler.py
+
+from backend.agentic_architecture.study_scheduler import allocate_hours, build_study_plan
+
+ANALYSES = [
+    {"course_name": "Physics", "priority": "high", "recommended_hours": 4, "issues": []},
+    {"course_name": "English", "priority": "low", "recommended_hours": 2, "issues": []},
+]
+
+def _hours(allocation):
+    return {c["course_name"]: c["weekly_hours"] for c in allocation["courses"]}
+
+def test_every_course_gets_a_block_then_greedy_by_weight():
+    # 6 blocks: one each, then Physics (3 * 0.85^k) beats English (0.85) for the other 4
+    allocation = allocate_hours(ANALYSES, 3.0)
+    assert _hours(allocation) == {"Physics": 2.5, "English": 0.5}
+    assert [c["shortfall_hours"] for c in allocation["courses"]] == [1.5, 1.5]
+    assert allocation["buffer_hours"] == 0
+
+def test_decay_hands_blocks_to_lower_priority():
+    # Physics' marginal value (3 * 0.85^k) stays above English's 0.85 up to
+    # its cap of 8 blocks; the rest goes to English
+    allocation = allocate_hours(ANALYSES, 5.0)
+    assert _hours(allocation) == {"Physics": 4.0, "English": 1.0}
+
+    medium = [dict(ANALYSES[0]), dict(ANALYSES[1], priority="medium")]
+    # 3 * 0.85^k vs 2 * 0.85^m: Physics leads by about 2.5 blocks
+    assert _hours(allocate_hours(medium, 3.0)) == {"Physics": 2.0, "English": 1.0}
+
+def test_leftover_hours_are_buffer():
+    allocation = allocate_hours(ANALYSES, 10.0)
+    assert _hours(allocation) == {"Physics": 4.0, "English": 2.0}
+    assert allocation["buffer_hours"] == 4.0
+    assert all("shortfall_hours" not in c for c in allocation["courses"])
+
+def test_tiny_budget_goes_to_highest_priority():
+    assert _hours(allocate_hours(ANALYSES, 0.5)) == {"Physics": 0.5, "English": 0.0}
+
+def test_daily_template_holds_the_allocation():
+    plan = build_study_plan(ANALYSES, hours_per_day=1.25, weeks=4, study_days=5)
+    assert plan["hours_per_day"] == 1.0
+    scheduled = {}
+    for sessions in plan["daily_template"].values():
+        assert sum(hours for _, hours in sessions) <= plan["hours_per_day"]
+        for name, hours in sessions:
+            scheduled[name] = scheduled.get(name, 0) + hours
+    assert scheduled == {c["course_name"]: c["weekly_hours"] for c in plan["allocation"]}
+    assert plan["weekly_focus"][-1]["focus"]["Physics"] == "past papers and timed practice"